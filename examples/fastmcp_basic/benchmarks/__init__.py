@@ -0,0 +1 @@
+# Benchmarks package for FastMCP Basic Example
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Admission Control Load Test
+
+Floods the server with heavy count_words calls from many client sessions
+while one session probes a cheap tool (add) at a steady rate, and reports
+the probe's p50/p99 latency idle and under the flood, the heavy calls
+completed and shed, and the peak memory of the server process. It runs
+once with admission control turned off and once with config.json's
+settings, each in a fresh process using the in-memory transport. Heavy
+clients honor the retry-after hint of rejected calls.
+
+Usage:
+    python benchmarks/admission_load.py [--heavy-clients 32] [--size-kb 2048]
+        [--duration 10] [--probe-interval-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+RETRY_AFTER = re.compile(r"retry after ([0-9.]+)s")
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(len(ordered) * pct / 100)) - 1))]
+
+
+async def probe(client: Any, seconds: float, interval: float) -> List[float]:
+    """Call the cheap tool every `interval` seconds; returns sorted latencies in ms"""
+    latencies: List[float] = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.call_tool("add", {"a": 1, "b": 2})
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+    return sorted(latencies)
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    """One measurement in this process, with admission control on or off"""
+    from fastmcp import Client
+    import server
+
+    server.admission.enabled = args.child == "on"
+    # Keep per-call logging out of the measurement
+    logging.getLogger().setLevel(logging.ERROR)
+
+    text = ("lorem ipsum dolor sit amet " * (args.size_kb * 1024 // 27 + 1))[:args.size_kb * 1024]
+    counts = {"completed": 0, "shed": 0, "failed": 0}
+    stop = asyncio.Event()
+
+    async def heavy_client() -> None:
+        async with Client(server.server, timeout=300) as client:
+            while not stop.is_set():
+                try:
+                    await client.call_tool("count_words", {"text": text, "compact": True})
+                    counts["completed"] += 1
+                except Exception as e:
+                    match = RETRY_AFTER.search(str(e))
+                    if match is None:
+                        counts["failed"] += 1
+                        continue
+                    counts["shed"] += 1
+                    await asyncio.sleep(float(match.group(1)))
+
+    interval = args.probe_interval_ms / 1000
+    async with Client(server.server) as prober:
+        idle = await probe(prober, 2.0, interval)
+        heavy = [asyncio.create_task(heavy_client()) for _ in range(args.heavy_clients)]
+        loaded = await probe(prober, args.duration, interval)
+        stop.set()
+        await asyncio.gather(*heavy)
+
+    return {
+        "idle_p50": percentile(idle, 50),
+        "idle_p99": percentile(idle, 99),
+        "loaded_p50": percentile(loaded, 50),
+        "loaded_p99": percentile(loaded, 99),
+        **counts,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--heavy-clients", type=int, default=32, help="Sessions flooding count_words")
+    parser.add_argument("--size-kb", type=int, default=2048, help="Text size of each heavy call")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of flood per mode")
+    parser.add_argument("--probe-interval-ms", type=float, default=20.0, help="Delay between cheap calls")
+    parser.add_argument("--child", choices=["on", "off"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(run_load(args))))
+        return 0
+
+    print(f"{args.heavy_clients} sessions flooding count_words ({args.size_kb} KB) for {args.duration:g}s, "
+          f"add probed every {args.probe_interval_ms:g} ms")
+    print(f"{'admission':>9} {'idle p50':>9} {'idle p99':>9} {'load p50':>9} {'load p99':>9} "
+          f"{'heavy ok':>9} {'shed':>6} {'failed':>6} {'peak MB':>8}")
+    for mode in ("off", "on"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode,
+             "--heavy-clients", str(args.heavy_clients), "--size-kb", str(args.size_kb),
+             "--duration", str(args.duration), "--probe-interval-ms", str(args.probe_interval_ms)],
+            cwd=str(BASE_DIR), capture_output=True, text=True, check=True
+        ).stdout
+        row = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:>9} {row['idle_p50']:>9.2f} {row['idle_p99']:>9.2f} {row['loaded_p50']:>9.2f} "
+              f"{row['loaded_p99']:>9.2f} {row['completed']:>9} {row['shed']:>6} {row['failed']:>6} "
+              f"{row['peak_rss_mb']:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
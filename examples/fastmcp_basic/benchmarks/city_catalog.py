@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+City Catalog Benchmark
+
+Writes a synthetic catalog of made-up city names (gzipped, in the
+data/cities.tsv format), loads it into CityCatalog and reports the load
+time, the catalog's memory, the memory the same cities take as one dict
+each (like the old WEATHER_DATA table), and p50/p99 latency of exact,
+prefix, misspelled and unknown lookups.
+
+Usage:
+    python benchmarks/city_catalog.py [--cities 150000] [--lookups 2000]
+"""
+
+import argparse
+import gzip
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.city_catalog import CityCatalog, climate, normalize
+
+SYLLABLES = [
+    "ka", "lo", "ran", "se", "ul", "to", "ky", "mar", "bel", "do", "ri", "an", "po", "lis",
+    "ber", "gen", "ham", "burg", "vil", "le", "san", "ta", "mon", "tre", "al", "os", "chi", "na"
+]
+
+
+def make_name(rng: random.Random) -> str:
+    name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    if rng.random() < 0.2:
+        name += " " + "".join(rng.choice(SYLLABLES) for _ in range(2))
+    return name.title()
+
+
+def misspell(rng: random.Random, name: str) -> str:
+    """Swap two adjacent letters past the first three"""
+    if len(name) < 6:
+        return name + "x"
+    i = rng.randint(3, len(name) - 2)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def write_catalog(path: Path, count: int, rng: random.Random) -> List[str]:
+    names = []
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(count):
+            name = make_name(rng)
+            names.append(name)
+            code = f"C{i % 200:03d}"
+            population = int(1000 * rng.paretovariate(1.2))
+            f.write(f"{name}\t{code}\tCountry {code}\t{rng.uniform(-60, 70):.4f}\t"
+                    f"{rng.uniform(-180, 180):.4f}\t{population}\t\n")
+    return names
+
+
+def latencies_us(lookup: Callable[[str], object], queries: List[str]) -> List[float]:
+    result = []
+    for query in queries:
+        started = time.perf_counter()
+        lookup(query)
+        result.append((time.perf_counter() - started) * 1e6)
+    return sorted(result)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cities", type=int, default=150000, help="Cities in the synthetic catalog")
+    parser.add_argument("--lookups", type=int, default=2000, help="Lookups per kind")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "cities.tsv.gz"
+        names = write_catalog(path, args.cities, rng)
+        print(f"catalog: {args.cities} cities, {path.stat().st_size / 1e6:.1f} MB gzipped")
+
+        catalog = CityCatalog(path)
+        catalog.load()
+        stats = catalog.stats()
+        print(f"load: {stats['load_seconds']:.2f}s")
+        print(f"catalog memory: {stats['memory_bytes'] / 1e6:.1f} MB ({stats['bytes_per_city']:.0f} bytes/city, "
+              f"{stats['keys']} keys)")
+
+        tracemalloc.start()
+        table = {
+            normalize(name): {"city": name, "country": "Country", "conditions": climate(0.0)[0],
+                              "temp_range": (0, 30), "latitude": 0.0, "longitude": 0.0, "population": 0}
+            for name in names
+        }
+        table_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del table
+        print(f"same cities as one dict each: {table_bytes / 1e6:.1f} MB")
+
+        sample = rng.sample(names, min(args.lookups, len(names)))
+        kinds = {
+            "exact": sample,
+            "prefix": [name[:max(4, len(name) - 3)] for name in sample],
+            "misspelled": [misspell(rng, name) for name in sample],
+            "unknown": ["Qqzz" + name for name in sample]
+        }
+        print(f"\n{'lookup':>12} {'p50 µs':>9} {'p99 µs':>9} {'found':>7}")
+        for kind, queries in kinds.items():
+            found = sum(1 for query in queries if catalog.resolve(query) is not None)
+            ordered = latencies_us(catalog.resolve, queries)
+            print(f"{kind:>12} {percentile(ordered, 50):>9.1f} {percentile(ordered, 99):>9.1f} "
+                  f"{found / len(queries):>7.0%}")
+        ordered = latencies_us(lambda query: catalog.search(query, 10), [name[:3] for name in sample])
+        print(f"{'search(3)':>12} {percentile(ordered, 50):>9.1f} {percentile(ordered, 99):>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness
+
+Drives every tool and resource of the server through a FastMCP client,
+either in-process (in-memory transport) or against a `server.py`
+subprocess (stdio transport), and reports p50/p95/p99 latency and
+throughput per scenario, concurrency level and payload size.
+
+Results are written as JSON. Passing a previous result file as --baseline
+compares against it and exits with status 1 when a scenario's p95 latency
+or throughput regressed by more than --threshold.
+
+Usage:
+    python benchmarks/harness.py [--transport memory,stdio] [--concurrency 1,8]
+        [--sizes 1KB,100KB,1MB,10MB] [--requests 50] [--filter count_words]
+        [--output bench.json] [--baseline baseline.json] [--threshold 0.2]
+
+or, from the repository root after `pip install -e .`:
+    letslearnmcp bench [same options]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent.parent
+SERVER_PATH = BASE_DIR / "server.py"
+
+sys.path.insert(0, str(BASE_DIR))
+
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB"
+
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 * 1024}
+
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog while MCP serves 42 tools.\n"
+
+
+class Scenario:
+    """
+    One tool call or resource read to benchmark.
+
+    `build(size, data_dir)` returns the tool arguments (or the resource URI
+    for resources). Scenarios without a payload size run once per
+    concurrency level with size None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        target: str,
+        build: Callable[[Optional[int], Path], Any],
+        sized: bool = False
+    ):
+        self.name = name
+        self.kind = kind
+        self.target = target
+        self.build = build
+        self.sized = sized
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r"\s*(\d+)\s*(B|KB|MB)\s*", text.upper())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}', use e.g. 1KB or 10MB")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2)]
+
+
+def format_size(size: Optional[int]) -> str:
+    if size is None:
+        return "-"
+    for unit in ("MB", "KB"):
+        if size >= _SIZE_UNITS[unit] and size % _SIZE_UNITS[unit] == 0:
+            return f"{size // _SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def text_of_size(size: int) -> str:
+    return (SAMPLE_LINE * (size // len(SAMPLE_LINE) + 1))[:size]
+
+
+def data_file(data_dir: Path, size: int) -> str:
+    """Create (once) a text file of the given size for read_file"""
+    path = data_dir / f"lines_{size}.txt"
+    if not path.exists():
+        path.write_text(text_of_size(size), encoding="utf-8")
+    return str(path)
+
+
+def scenarios() -> List[Scenario]:
+    """Every tool and resource the server registers"""
+    numbers = lambda size: [float(i) for i in range(max(1, (size or 8) // 8))]
+    return [
+        Scenario("add", "tool", "add", lambda size, data: {"a": 1.5, "b": 2.5}),
+        Scenario("subtract", "tool", "subtract", lambda size, data: {"a": 1.5, "b": 2.5}),
+        Scenario("multiply", "tool", "multiply", lambda size, data: {"a": 1.5, "b": 2.5}),
+        Scenario("divide", "tool", "divide", lambda size, data: {"a": 1.5, "b": 2.5}),
+        Scenario("batch_calculate", "tool", "batch_calculate",
+                 lambda size, data: {"operation": "multiply", "a": numbers(size), "b": 2.0}, sized=True),
+        Scenario("reduce_values", "tool", "reduce_values",
+                 lambda size, data: {"operation": "mean", "values": numbers(size)}, sized=True),
+        Scenario("dot_product", "tool", "dot_product",
+                 lambda size, data: {"a": numbers(size), "b": numbers(size)}, sized=True),
+        Scenario("evaluate", "tool", "evaluate",
+                 lambda size, data: {"expression": "(a + b) * 2 / sqrt(a + 1)", "variables": {"a": 3, "b": 4}}),
+        Scenario("get_expression_cache_stats", "tool", "get_expression_cache_stats", lambda size, data: {}),
+        Scenario("get_weather", "tool", "get_weather", lambda size, data: {"city": "seoul"}),
+        Scenario("get_weather_many", "tool", "get_weather_many",
+                 lambda size, data: {"cities": ["seoul", "Tokio", "New York City", "London, CA", "san fran"]}),
+        Scenario("search_cities", "tool", "search_cities", lambda size, data: {"query": "san", "limit": 10}),
+        Scenario("get_weather_cache_stats", "tool", "get_weather_cache_stats", lambda size, data: {}),
+        Scenario("get_city_catalog_stats", "tool", "get_city_catalog_stats", lambda size, data: {}),
+        Scenario("list_files", "tool", "list_files",
+                 lambda size, data: {"directory_path": str(BASE_DIR), "recursive": True}),
+        Scenario("read_file", "tool", "read_file",
+                 lambda size, data: {"file_path": data_file(data, size), "start_line": size // len(SAMPLE_LINE) // 2},
+                 sized=True),
+        Scenario("read_bytes", "tool", "read_bytes",
+                 lambda size, data: {"file_path": data_file(data, size), "offset": size // 2, "length": 64 * 1024},
+                 sized=True),
+        Scenario("get_file_index_stats", "tool", "get_file_index_stats", lambda size, data: {}),
+        Scenario("get_file_content_cache_stats", "tool", "get_file_content_cache_stats", lambda size, data: {}),
+        Scenario("get_file_metadata_stats", "tool", "get_file_metadata_stats", lambda size, data: {}),
+        Scenario("search_files", "tool", "search_files",
+                 lambda size, data: {"query": "cursor pagin*", "path": str(BASE_DIR)}),
+        Scenario("get_search_index_stats", "tool", "get_search_index_stats", lambda size, data: {}),
+        Scenario("count_words", "tool", "count_words",
+                 lambda size, data: {"text": text_of_size(size), "include_text": False,
+                                     "include_words": False, "top_k": 10}, sized=True),
+        Scenario("process_texts", "tool", "process_texts",
+                 lambda size, data: {"texts": [SAMPLE_LINE] * max(1, size // len(SAMPLE_LINE)),
+                                     "operations": ["uppercase", "count"]}, sized=True),
+        Scenario("reverse_text", "tool", "reverse_text", lambda size, data: {"text": text_of_size(size)}, sized=True),
+        Scenario("to_uppercase", "tool", "to_uppercase", lambda size, data: {"text": text_of_size(size)}, sized=True),
+        Scenario("to_lowercase", "tool", "to_lowercase", lambda size, data: {"text": text_of_size(size)}, sized=True),
+        Scenario("config", "resource", "config://server", lambda size, data: "config://server"),
+        Scenario("help", "resource", "help://tools/all", lambda size, data: "help://tools/all"),
+        Scenario("tool_help", "resource", "help://tools/calculator", lambda size, data: "help://tools/calculator"),
+        Scenario("logs", "resource", "logs://server/all", lambda size, data: "logs://server/all"),
+        Scenario("metrics", "resource", "metrics://server", lambda size, data: "metrics://server"),
+    ]
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sample"""
+    return ordered[min(len(ordered) - 1, max(0, int(round(len(ordered) * pct / 100)) - 1))]
+
+
+def is_error(result: Any) -> bool:
+    """Tools report most failures as an "error" key rather than raising"""
+    data = getattr(result, "data", None)
+    if data is None:
+        data = getattr(result, "structured_content", None)
+    return isinstance(data, dict) and "error" in data
+
+
+async def call(client: Client, scenario: Scenario, payload: Any) -> bool:
+    """Run one request; returns False if it failed"""
+    try:
+        if scenario.kind == "tool":
+            return not is_error(await client.call_tool(scenario.target, payload))
+        await client.read_resource(payload)
+        return True
+    except Exception:
+        return False
+
+
+async def measure(
+    client: Client,
+    scenario: Scenario,
+    payload: Any,
+    concurrency: int,
+    requests: int,
+    warmup: int
+) -> Dict[str, Any]:
+    """Issue `requests` calls from `concurrency` concurrent workers"""
+    for _ in range(warmup):
+        await call(client, scenario, payload)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            ok = await call(client, scenario, payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0
+    }
+
+
+def make_client(transport: str) -> Client:
+    """
+    Client for a transport. Server console logs are dropped so they do not
+    interleave with the report; the log file is still written, as in production.
+    """
+    if transport == "memory":
+        import server
+        server.log_listener.handlers = tuple(
+            handler for handler in server.log_listener.handlers
+            if type(handler) is not logging.StreamHandler
+        )
+        # Measure the handlers, not the rate limits of a single client
+        server.admission.enabled = False
+        return Client(server.server)
+    if transport == "stdio":
+        # Same interpreter and environment as the harness, so the server sees the same packages
+        return Client(PythonStdioTransport(
+            SERVER_PATH, args=["--no-admission"], env=dict(os.environ), cwd=str(BASE_DIR),
+            log_file=Path(os.devnull)
+        ))
+    raise ValueError(f"Unknown transport '{transport}'")
+
+
+async def run_transport(
+    transport: str,
+    selected: List[Scenario],
+    concurrencies: List[int],
+    sizes: List[int],
+    requests: int,
+    warmup: int,
+    data_dir: Path
+) -> List[Dict[str, Any]]:
+    results = []
+    async with make_client(transport) as client:
+        for scenario in selected:
+            for size in (sizes if scenario.sized else [None]):
+                payload = scenario.build(size, data_dir)
+                for concurrency in concurrencies:
+                    stats = await measure(client, scenario, payload, concurrency, requests, warmup)
+                    row = {
+                        "scenario": scenario.name,
+                        "transport": transport,
+                        "concurrency": concurrency,
+                        "size": format_size(size),
+                        **stats
+                    }
+                    results.append(row)
+                    print(
+                        f"{transport:>6} {scenario.name:<26} {row['size']:>6} {concurrency:>4} "
+                        f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} "
+                        f"{row['throughput_rps']:>9.1f} {row['errors']:>6}",
+                        flush=True
+                    )
+    return results
+
+
+def result_key(row: Dict[str, Any]) -> Tuple[str, str, int, str]:
+    return (row["scenario"], row["transport"], row["concurrency"], row["size"])
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    threshold: float
+) -> List[str]:
+    """Describe every result whose p95 or throughput is worse than the baseline by more than threshold"""
+    previous = {result_key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get(result_key(row))
+        if before is None:
+            continue
+        label = "/".join(str(part) for part in result_key(row))
+        if before["p95_ms"] > 0 and row["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{label}: p95 {before['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms")
+        if before["throughput_rps"] > 0 and row["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{label}: throughput {before['throughput_rps']:.1f} -> {row['throughput_rps']:.1f} req/s"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every tool and resource of the FastMCP server")
+    parser.add_argument("--transport", default="memory",
+                        help="Comma-separated transports: memory, stdio (default: memory)")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated payload sizes for sized scenarios (default: {DEFAULT_SIZES})")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per combination")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests before each combination")
+    parser.add_argument("--filter", default=None, help="Regex selecting scenario names")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", default=None, help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative regression before failing (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    transports = [name.strip() for name in args.transport.split(",")]
+    concurrencies = [int(n) for n in args.concurrency.split(",")]
+    sizes = [parse_size(text) for text in args.sizes.split(",")]
+    selected = [
+        scenario for scenario in scenarios()
+        if args.filter is None or re.search(args.filter, scenario.name)
+    ]
+    if not selected:
+        parser.error(f"No scenario matches '{args.filter}'")
+
+    print(f"{'trans':>6} {'scenario':<26} {'size':>6} {'conc':>4} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>6}")
+    # Test files live under the server directory so read_file allows them
+    data_dir = Path(tempfile.mkdtemp(prefix=".bench-data-", dir=BASE_DIR / "benchmarks"))
+    try:
+        results = []
+        for transport in transports:
+            results += asyncio.run(run_transport(
+                transport, selected, concurrencies, sizes, args.requests, args.warmup, data_dir
+            ))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "requests": args.requests,
+        "results": results
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
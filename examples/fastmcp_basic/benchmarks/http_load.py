@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test
+
+Starts server.py with the HTTP transport on localhost for each worker
+count, drives it with many concurrent MCP client sessions spread over
+several client processes, and reports throughput and p50/p95/p99 latency
+per worker count. Each server is then stopped with SIGTERM, and the time
+it takes to drain is reported too. Admission control is turned off, so
+the numbers show raw capacity rather than the per-client rate limits.
+
+Usage:
+    python benchmarks/http_load.py [--workers 1,2,4] [--clients 32] [--requests 20]
+        [--tool count_words] [--size-kb 10] [--client-processes 4] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+SERVER_PATH = BASE_DIR / "server.py"
+
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog while MCP serves 42 tools.\n"
+
+
+def tool_arguments(tool: str, size_kb: int) -> Dict[str, Any]:
+    text = (SAMPLE_LINE * (size_kb * 1024 // len(SAMPLE_LINE) + 1))[:size_kb * 1024]
+    if tool == "count_words":
+        return {"text": text, "include_text": False, "include_words": False, "top_k": 10}
+    if tool in ("reverse_text", "to_uppercase", "to_lowercase"):
+        return {"text": text}
+    if tool == "add":
+        return {"a": 1.5, "b": 2.5}
+    if tool == "get_weather":
+        return {"city": "seoul"}
+    raise SystemExit(f"No load arguments defined for tool '{tool}'")
+
+
+async def run_sessions(url: str, sessions: int, requests: int, tool: str, arguments: Dict[str, Any]) -> Tuple[List[float], int]:
+    """Run `sessions` client sessions, each making `requests` sequential calls"""
+    from fastmcp import Client
+
+    latencies: List[float] = []
+    errors = 0
+
+    async def session() -> None:
+        nonlocal errors
+        async with Client(url, timeout=120) as client:
+            for _ in range(requests):
+                started = time.perf_counter()
+                try:
+                    result = await client.call_tool(tool, arguments)
+                    if isinstance(result.data, dict) and "error" in result.data:
+                        errors += 1
+                except Exception:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return latencies, errors
+
+
+def client_process(args: Tuple[str, int, int, str, Dict[str, Any], Any]) -> Tuple[List[float], int, float, float]:
+    """One load-generating process; waits at the barrier so all processes start together"""
+    url, sessions, requests, tool, arguments, barrier = args
+    barrier.wait()
+    started = time.time()
+    latencies, errors = asyncio.run(run_sessions(url, sessions, requests, tool, arguments))
+    return latencies, errors, started, time.time()
+
+
+def wait_healthy(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout}s")
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, int(round(len(ordered) * pct / 100)) - 1))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated server worker counts")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent client sessions")
+    parser.add_argument("--requests", type=int, default=20, help="Calls per client session")
+    parser.add_argument("--tool", default="count_words", help="Tool to call")
+    parser.add_argument("--size-kb", type=int, default=10, help="Text size for text tools")
+    parser.add_argument("--client-processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Processes generating load, so the client is not the bottleneck")
+    parser.add_argument("--port", type=int, default=8765, help="Local port for the server")
+    args = parser.parse_args()
+
+    base_url = f"http://localhost:{args.port}"
+    arguments = tool_arguments(args.tool, args.size_kb)
+    processes = max(1, min(args.client_processes, args.clients))
+    sessions = [args.clients // processes + (i < args.clients % processes) for i in range(processes)]
+
+    print(f"{args.clients} sessions x {args.requests} calls of {args.tool} from {processes} client processes")
+    print(f"{'workers':>7} {'calls':>7} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'speedup':>8} {'drain s':>8}")
+    baseline = None
+    context = multiprocessing.get_context("spawn")
+    for workers in (int(n) for n in args.workers.split(",")):
+        server = subprocess.Popen(
+            [sys.executable, str(SERVER_PATH), "--transport", "http",
+             "--host", "localhost", "--port", str(args.port), "--workers", str(workers),
+             "--no-admission"],
+            cwd=str(BASE_DIR),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_healthy(base_url)
+            manager = context.Manager()
+            barrier = manager.Barrier(processes)
+            with context.Pool(processes) as pool:
+                results = pool.map(client_process, [
+                    (f"{base_url}/mcp", count, args.requests, args.tool, arguments, barrier)
+                    for count in sessions
+                ])
+            manager.shutdown()
+        finally:
+            stop_started = time.perf_counter()
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+            drain_seconds = time.perf_counter() - stop_started
+
+        latencies = sorted(latency for result in results for latency in result[0])
+        errors = sum(result[1] for result in results)
+        elapsed = max(result[3] for result in results) - min(result[2] for result in results)
+        throughput = len(latencies) / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:>7} {len(latencies):>7} {errors:>6} {throughput:>8.1f} "
+              f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 95):>8.2f} "
+              f"{percentile(latencies, 99):>8.2f} {throughput / baseline:>7.2f}x {drain_seconds:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Logging Overhead Benchmark
+
+Measures the per-call cost that logging adds to a tool call, comparing a
+synchronous FileHandler (the previous basicConfig setup) with the queued
+pipeline from utils.log_setup.
+
+Usage:
+    python benchmarks/logging_overhead.py [--calls N] [--disk-latency-us US]
+
+--disk-latency-us adds a sleep to every log flush to simulate slow or
+network storage, which the synchronous setup pays on every call.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.calculator import CalculatorTool
+from utils.log_setup import setup_logging, shutdown_logging, DEFAULT_FORMAT
+
+
+def reset_root() -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def time_calls(calculator: CalculatorTool, calls: int) -> float:
+    """Return the mean wall time per call in microseconds"""
+    start = time.perf_counter()
+    for i in range(calls):
+        calculator.add(i, 1)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def slow_flush(latency: float):
+    """Wrap StreamHandler.flush so every write pays a fixed storage latency"""
+    flush = logging.StreamHandler.flush
+    
+    def flush_with_latency(self: logging.StreamHandler) -> None:
+        flush(self)
+        time.sleep(latency)
+    return flush_with_latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Logging overhead per tool call")
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--disk-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+    
+    if args.disk_latency_us:
+        logging.StreamHandler.flush = slow_flush(args.disk_latency_us / 1e6)
+    
+    calculator = CalculatorTool()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        reset_root()
+        logging.getLogger().setLevel(logging.CRITICAL)
+        results["no logging"] = time_calls(calculator, args.calls)
+        
+        reset_root()
+        logging.basicConfig(
+            level=logging.INFO,
+            format=DEFAULT_FORMAT,
+            filename=str(Path(tmp) / "sync.log")
+        )
+        results["sync FileHandler"] = time_calls(calculator, args.calls)
+        
+        for name, sampling in [
+            ("queued pipeline", {}),
+            ("queued + 1% sampling", {"tools.calculator": 0.01}),
+        ]:
+            reset_root()
+            listener = setup_logging({
+                "file": str(Path(tmp) / "queued.log"),
+                "console": False,
+                "queue_size": args.calls * 2,
+                "sampling": sampling
+            })
+            results[name] = time_calls(calculator, args.calls)
+            shutdown_logging(listener)
+        reset_root()
+    
+    baseline = results["no logging"]
+    print(f"{'setup':<24}{'us/call':>10}{'overhead':>12}")
+    for name, per_call in results.items():
+        print(f"{name:<24}{per_call:>10.2f}{per_call - baseline:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
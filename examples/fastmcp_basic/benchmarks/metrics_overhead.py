@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+
+Measures what request metrics add to every tool call: the histogram
+update alone, the payload size estimates for typical arguments and
+results (taken on one call in SIZE_SAMPLE_INTERVAL), and a call through
+the server's handler wrapper compared with the previous wrapper, which
+only checked that the group was enabled.
+Calls run from several threads at once to include the per-thread shards.
+
+Usage:
+    python benchmarks/metrics_overhead.py [--calls 100000] [--repeat 5] [--threads 1,4] [--budget-us 2]
+"""
+
+import argparse
+import functools
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def legacy_guarded(settings: Any, section: str, group: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """The _guarded wrapper from before request metrics"""
+    def check() -> None:
+        if not settings.current.is_enabled(section, group):
+            raise RuntimeError(f"'{func.__name__}' is disabled in config.json ({section}.{group})")
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        check()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def per_call_ns(func: Callable[[], object], calls: int, threads: int) -> float:
+    """Wall time per call with `threads` threads each making `calls` calls"""
+    def loop() -> None:
+        for _ in range(calls):
+            func()
+
+    workers = [threading.Thread(target=loop) for _ in range(threads)]
+    started = time.perf_counter_ns()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter_ns() - started) / (calls * threads)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=100000, help="Calls per thread")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the fastest is kept")
+    parser.add_argument("--threads", default="1,4", help="Comma-separated thread counts")
+    parser.add_argument("--budget-us", type=float, default=2.0, help="Allowed metrics overhead per call")
+    args = parser.parse_args()
+
+    import server
+    from utils.metrics import RequestMetrics, payload_size
+
+    metrics = RequestMetrics()
+    key = ("tool", "add")
+    arguments = {"a": 1.5, "b": 2.5}
+    result = {"file_path": "README.md", "lines": ["line"] * 100, "has_more": True, "next_cursor": "abc"}
+
+    def add(a: float, b: float) -> float:
+        return a + b
+
+    legacy = legacy_guarded(server.settings, "tools", "calculator", add)
+    wrapped = server._guarded("tools", "calculator", "bench_add", add)
+    measurements = [
+        ("record()", lambda: metrics.record(key, 1234, False)),
+        ("payload_size(args)", lambda: payload_size(arguments)),
+        ("payload_size(result)", lambda: payload_size(result)),
+        ("previous wrapper", lambda: legacy(a=1.5, b=2.5)),
+        ("metrics wrapper", lambda: wrapped(a=1.5, b=2.5)),
+    ]
+
+    worst_overhead = 0.0
+    print(f"{'threads':>7} {'measurement':<22} {'ns/call':>9}")
+    for threads in (int(n) for n in args.threads.split(",")):
+        # Interleave the runs so drift in CPU speed affects every measurement alike
+        timings = {label: float("inf") for label, _ in measurements}
+        for _ in range(args.repeat):
+            for label, func in measurements:
+                timings[label] = min(timings[label], per_call_ns(func, args.calls, threads))
+        for label, _ in measurements:
+            print(f"{threads:>7} {label:<22} {timings[label]:>9.0f}")
+        overhead = timings["metrics wrapper"] - timings["previous wrapper"]
+        worst_overhead = max(worst_overhead, overhead)
+        print(f"{threads:>7} {'metrics overhead':<22} {overhead:>9.0f}")
+
+    within = worst_overhead / 1000 <= args.budget_us
+    print(f"\nWorst metrics overhead {worst_overhead / 1000:.2f} us per call "
+          f"({'within' if within else 'over'} the {args.budget_us} us budget)")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
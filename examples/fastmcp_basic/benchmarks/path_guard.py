@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Path Authorization Benchmark
+
+Compares the previous _is_path_allowed (resolve every allowed root on every
+call) with AllowedRoots (roots resolved once into a component trie) for a
+growing number of roots and path depths. The trie is measured both with
+fresh paths and with repeated paths served from its decision cache.
+
+Usage:
+    python benchmarks/path_guard.py [--roots 1,10,100] [--depths 2,8,32] [--calls 2000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.path_guard import AllowedRoots
+
+
+def legacy_is_allowed(allowed_dirs: List[Path], file_path: str) -> bool:
+    """The _is_path_allowed implementation this benchmark replaces"""
+    try:
+        abs_path = Path(file_path).resolve()
+        return any(
+            abs_path.is_relative_to(allowed_dir.resolve())
+            for allowed_dir in allowed_dirs
+        )
+    except Exception:
+        return False
+
+
+def per_call_us(check: Callable[[str], bool], paths: List[str]) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        check(path)
+    return (time.perf_counter() - started) / len(paths) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roots", default="1,10,100", help="Comma-separated root counts")
+    parser.add_argument("--depths", default="2,8,32", help="Comma-separated path depths")
+    parser.add_argument("--calls", type=int, default=2000, help="Checks per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        print(f"{'roots':>6} {'depth':>6} {'legacy us':>10} {'trie us':>8} {'cached us':>10}")
+        for root_count in (int(n) for n in args.roots.split(",")):
+            # The matching root is configured last, the worst case for a linear scan
+            roots = [base / f"root{i}" for i in range(root_count)]
+            for root in roots:
+                root.mkdir(exist_ok=True)
+            guard = AllowedRoots(roots, cache_size=args.calls)
+            for depth in (int(n) for n in args.depths.split(",")):
+                nested = roots[-1].joinpath(*[f"d{i}" for i in range(depth)])
+                fresh = [str(nested / f"file{i}.txt") for i in range(args.calls)]
+                assert all(guard.is_allowed(path) for path in fresh[:10])
+
+                legacy = per_call_us(lambda path: legacy_is_allowed(roots, path), fresh)
+                guard.update(roots)
+                trie = per_call_us(guard.is_allowed, fresh)
+                cached = per_call_us(guard.is_allowed, fresh)
+                print(f"{root_count:>6} {depth:>6} {legacy:>10.1f} {trie:>8.1f} {cached:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Slow I/O Load Test
+
+Measures calculator latency while clients keep slow file reads in flight,
+using the in-memory client transport. read_file is patched to sleep for
+--read-latency-ms to simulate a slow network filesystem.
+
+Two modes are compared:
+  inline   - the slow read blocks the event loop inside the tool handler,
+             as the file handlers did before the executor was added
+  offload  - the server's async read_file tool, which runs the read on
+             the bounded worker pool
+
+Usage:
+    python benchmarks/slow_io_load.py [--slow-readers N] [--calls N]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastmcp import Client
+
+import server
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure(client: Client, slow_tool: str, slow_readers: int, calls: int) -> List[float]:
+    """Time sequential calculator calls while readers keep slow reads in flight"""
+    done = asyncio.Event()
+    
+    async def reader() -> None:
+        while not done.is_set():
+            await client.call_tool(slow_tool, {"file_path": "README.md"})
+    
+    readers = [asyncio.create_task(reader()) for _ in range(slow_readers)]
+    await asyncio.sleep(0.01)
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        await client.call_tool("add", {"a": i, "b": 1})
+        latencies.append((time.perf_counter() - start) * 1000)
+    done.set()
+    await asyncio.gather(*readers)
+    return latencies
+
+
+async def run(slow_readers: int, calls: int, read_latency: float) -> None:
+    read_file = server.file_reader.read_file
+    
+    def slow_read_file(*args, **kwargs):
+        time.sleep(read_latency)
+        return read_file(*args, **kwargs)
+    server.file_reader.read_file = slow_read_file
+    
+    @server.server.tool
+    async def read_file_inline(file_path: str) -> dict:
+        """Slow read executed directly on the event loop"""
+        return server.file_reader.read_file(file_path)
+    
+    async with Client(server.server) as client:
+        await client.call_tool("add", {"a": 0, "b": 0})
+        baseline = await measure(client, "read_file", 0, calls)
+        results = {
+            "no slow reads": baseline,
+            "inline": await measure(client, "read_file_inline", slow_readers, calls),
+            "offload": await measure(client, "read_file", slow_readers, calls),
+        }
+    
+    print(f"{'mode':<16}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode, samples in results.items():
+        print(f"{mode:<16}{statistics.median(samples):>10.2f}"
+              f"{percentile(samples, 99):>10.2f}{max(samples):>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calculator tail latency under slow file reads")
+    parser.add_argument("--slow-readers", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--read-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(args.slow_readers, args.calls, args.read_latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
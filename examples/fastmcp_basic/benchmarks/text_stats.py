@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Text Statistics Benchmark
+
+Compares the previous count_words implementation (split into lines,
+findall over the whole text, replace() copy, echo everything) with the
+single-pass TextProcessorTool.count_words on 1 MB / 10 MB / 100 MB inputs.
+Reports wall time and peak traced memory (input excluded).
+
+Usage:
+    python benchmarks/text_stats.py [--sizes 1,10,100]
+"""
+
+import argparse
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.text_processor import TextProcessorTool
+
+SAMPLE = (
+    "The quick brown fox jumps over the lazy dog.\n"
+    "MCP servers expose tools and resources to agents, 42 times a day.\n"
+)
+
+
+def legacy_count_words(text: str) -> Dict[str, Any]:
+    """The count_words implementation this benchmark replaces"""
+    lines = text.split('\n')
+    words = re.findall(r'\b\w+\b', text)
+    return {
+        "text": text,
+        "word_count": len(words),
+        "character_count": len(text),
+        "character_count_no_spaces": len(text.replace(' ', '')),
+        "line_count": len(lines),
+        "words": words,
+    }
+
+
+def measure(function: Callable[[], Dict[str, Any]]) -> Dict[str, float]:
+    """Time one untraced run, then trace a second run for peak memory"""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 1024 / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="count_words benchmark")
+    parser.add_argument("--sizes", default="1,10,100", help="Input sizes in MB")
+    args = parser.parse_args()
+    
+    processor = TextProcessorTool()
+    variants = {
+        "legacy": legacy_count_words,
+        "single-pass": processor.count_words,
+        "single-pass compact": lambda text: processor.count_words(
+            text, include_text=False, include_words=False
+        ),
+        "compact + top 10": lambda text: processor.count_words(
+            text, include_text=False, include_words=False, top_k=10
+        ),
+    }
+    
+    print(f"{'size':>6}  {'variant':<22}{'seconds':>10}{'peak MB':>10}")
+    for size_mb in (int(size) for size in args.sizes.split(",")):
+        text = (SAMPLE * (size_mb * 1024 * 1024 // len(SAMPLE) + 1))[:size_mb * 1024 * 1024]
+        for name, function in variants.items():
+            stats = measure(lambda: function(text))
+            print(f"{size_mb:>4}MB  {name:<22}{stats['seconds']:>10.3f}{stats['peak_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
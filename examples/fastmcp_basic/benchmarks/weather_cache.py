@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Weather Cache Benchmark
+
+Starts a local stub weather backend with a fixed latency, points
+WeatherTool at it through HttpWeatherProvider, and fires many concurrent
+get_weather calls. Upstream requests should track the number of distinct
+cities, not the number of calls.
+
+Usage:
+    python benchmarks/weather_cache.py [--requests N] [--latency-ms MS]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.weather import WeatherTool
+from tools.weather_providers import HttpWeatherProvider, WeatherCache
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Answers GET /weather?city=... after a fixed delay and counts requests"""
+    
+    latency = 0.05
+    requests = 0
+    lock = threading.Lock()
+    
+    def do_GET(self) -> None:
+        with self.lock:
+            StubWeatherHandler.requests += 1
+        time.sleep(self.latency)
+        query = parse_qs(urlparse(self.path).query)
+        body = json.dumps({
+            "city": query.get("city", ["?"])[0],
+            "temperature": 21,
+            "condition": "Sunny",
+            "humidity": 40
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_stub(latency: float) -> ThreadingHTTPServer:
+    StubWeatherHandler.latency = latency
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    return stub
+
+
+async def run(requests: int, latency: float) -> None:
+    stub = start_stub(latency)
+    provider = HttpWeatherProvider(f"http://127.0.0.1:{stub.server_address[1]}")
+    weather = WeatherTool(provider=provider, cache=WeatherCache(ttl_seconds=60))
+    cities = ["seoul", "tokyo", "new york", "london"]
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        weather.get_weather(cities[i % len(cities)]) for i in range(requests)
+    ))
+    elapsed = time.perf_counter() - start
+    await provider.aclose()
+    stub.shutdown()
+    
+    errors = sum(1 for result in results if "error" in result)
+    print(f"calls: {requests}  distinct cities: {len(cities)}  errors: {errors}")
+    print(f"upstream requests: {StubWeatherHandler.requests}  elapsed: {elapsed:.3f}s")
+    print(json.dumps(weather.get_cache_stats(), indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Weather cache coalescing benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,56 +5,87 @@ Provides server configuration information.
 """
 
 from fastmcp import resource
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Callable, List, Optional
 import logging
+import platform
 from datetime import datetime
+from utils.settings import SettingsStore
+from .versioned import VersionedDocument
 
 logger = logging.getLogger(__name__)
 
+# Live registry: {"tools" | "resources": {group: [registered names]}}
+Registry = Dict[str, Dict[str, List[str]]]
+
+FEATURES = {
+    "calculator": "Calculator tools",
+    "weather": "Weather information",
+    "file_reader": "File reading",
+    "file_search": "File search",
+    "text_processor": "Text processing"
+}
+
 class ConfigResource:
     """Configuration resource for server settings"""
     
-    @resource
-    def get_config(self) -> Dict[str, Any]:
-        """
-        Get server configuration information.
-        
-        Returns:
-            Dictionary containing server configuration
-        """
-        config = {
-            "server_name": "FastMCP Basic Example",
-            "version": "1.0.0",
-            "description": "A basic MCP server implementation using FastMCP framework",
+    def __init__(
+        self,
+        settings: Optional[SettingsStore] = None,
+        registry: Optional[Callable[[], Registry]] = None
+    ):
+        self.settings = settings or SettingsStore()
+        self.registry = registry or (lambda: {"tools": {}, "resources": {}})
+        # Fixed for the life of the process, so it does not change the ETag
+        self.startup_time = datetime.now().isoformat()
+        self.document = VersionedDocument(self._build)
+        self.document.refresh()
+    
+    def _build(self) -> Dict[str, Any]:
+        """Assemble the configuration payload from the live registry and settings"""
+        settings = self.settings.current
+        server = settings.config.get("server", {})
+        registry = self.registry()
+        return {
+            "server_name": server.get("name", "FastMCP Basic Example"),
+            "version": server.get("version", "1.0.0"),
+            "description": server.get("description", "A basic MCP server implementation using FastMCP framework"),
             "features": [
-                "Calculator tools",
-                "Weather information", 
-                "File reading",
-                "Text processing"
+                FEATURES.get(group, group) for group in registry["tools"]
             ],
             "supported_operations": {
-                "tools": [
-                    "add", "subtract", "multiply", "divide",
-                    "get_weather",
-                    "read_file", "list_files", 
-                    "to_uppercase", "to_lowercase", "reverse_text", "count_words"
-                ],
-                "resources": [
-                    "get_config", "get_help", "get_tool_help", "get_logs"
-                ]
+                "tools": [name for names in registry["tools"].values() for name in names],
+                "resources": [uri for uris in registry["resources"].values() for uri in uris]
             },
             "security": {
                 "file_access": "restricted_to_allowed_directories",
+                "max_lines_per_file": settings.max_lines_per_file,
+                "max_read_kb": settings.max_read_bytes // 1024,
+                "max_request_kb": settings.max_request_bytes // 1024,
                 "logging": "enabled",
                 "error_handling": "graceful"
             },
             "runtime_info": {
-                "startup_time": datetime.now().isoformat(),
-                "python_version": "3.8+",
+                "startup_time": self.startup_time,
+                "python_version": platform.python_version(),
                 "framework": "FastMCP"
             }
         }
+    
+    def refresh(self) -> bool:
+        """Regenerate the document; returns True if its content changed"""
+        return self.document.refresh()
+    
+    @resource
+    def get_config(self) -> str:
+        """
+        Get server configuration information.
+        
+        The JSON document is serialized once and only rebuilt by refresh(),
+        when registrations or config.json change.
         
-        logger.info("ConfigResource: Configuration information requested")
-        return config
\ No newline at end of file
+        Returns:
+            JSON text of the server configuration, with "etag" and "resource_version"
+        """
+        logger.info("ConfigResource: Configuration information requested (version %d)",
+                    self.document.version)
+        return self.document.text
@@ -5,109 +5,184 @@ Provides help and documentation for available tools and resources.
 """
 
 from fastmcp import resource
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional
+import json
 import logging
+from .config import Registry
+from .versioned import VersionedDocument
 
 logger = logging.getLogger(__name__)
 
+CATEGORY_DESCRIPTIONS = {
+    "calculator": "Basic mathematical operations",
+    "weather": "Weather information lookup",
+    "file_reader": "Safe file reading operations",
+    "file_search": "Full-text search over allowed directories",
+    "text_processor": "Text manipulation utilities"
+}
+
 class HelpResource:
     """Help resource providing documentation"""
     
-    def __init__(self):
+    def __init__(self, registry: Optional[Callable[[], Registry]] = None):
+        # Without a registry every documented tool counts as registered
+        self.registry = registry or (lambda: {
+            "tools": {category: list(tools) for category, tools in self.tool_help.items()},
+            "resources": {}
+        })
         self.tool_help = {
             "calculator": {
                 "add": "Add two numbers together. Args: a (float), b (float)",
                 "subtract": "Subtract second number from first. Args: a (float), b (float)",
                 "multiply": "Multiply two numbers. Args: a (float), b (float)",
-                "divide": "Divide first number by second. Args: a (float), b (float)"
+                "divide": "Divide first number by second. Args: a (float), b (float)",
+                "batch_calculate": "Apply an operation element-wise in one call; division by zero is masked per element. Args: operation (add|subtract|multiply|divide), a (float or list), b (float or list)",
+                "reduce_values": "Reduce a list of numbers. Args: operation (sum|mean|min|max), values (list of float)",
+                "dot_product": "Dot product of two equal-length lists. Args: a (list of float), b (list of float)",
+                "evaluate": "Evaluate an arithmetic expression, e.g. '(a + b) * 2 / sqrt(c)'. Args: expression (str), variables (dict of float or list of float, optional)",
+                "get_expression_cache_stats": "Get compiled-expression cache hit/miss counters. Args: none"
             },
             "weather": {
-                "get_weather": "Get weather information for a city. Args: city (str) - seoul, tokyo, newyork, london"
+                "get_weather": "Get weather information for a city; aliases, prefixes and one-letter typos match, a trailing country narrows the match. Args: city (str) - e.g. 'seoul', 'New York City', 'London, CA'",
+                "get_weather_many": "Get weather for many cities in one call, fetched concurrently. Args: cities (list of str)",
+                "search_cities": "Find catalog cities by name prefix, most populous first. Args: query (str), limit (int, optional)",
+                "get_weather_cache_stats": "Get weather cache hit/miss/coalesced counters and upstream load. Args: none",
+                "get_city_catalog_stats": "Get city catalog size, memory use and lookup counters. Args: none"
             },
             "file_reader": {
-                "read_file": "Read contents of a text file. Args: file_path (str), max_lines (int, optional)",
-                "list_files": "List files in a directory. Args: directory_path (str, optional)"
+                "read_file": "Read a window of lines from a text file. Args: file_path (str), max_lines (int, optional), start_line (int, optional), byte_offset (int, optional), cursor (str, optional), encoding (str, optional; detected by default), lossy (bool, optional)",
+                "read_bytes": "Read a byte range of any file, text or binary, as base64 with the detected encoding. Args: file_path (str), offset (int, optional), length (int, optional)",
+                "list_files": "List files in a directory a page at a time. Args: directory_path (str, optional), page_size (int, optional), cursor (str, optional), recursive (bool, optional), max_depth (int, optional), pattern (str, optional), extensions (list, optional)",
+                "get_file_index_stats": "Get line-offset index cache hit/miss counters and memory usage. Args: none",
+                "get_file_content_cache_stats": "Get file content cache hit ratio, coalesced reads and bytes served from memory. Args: none",
+                "get_file_metadata_stats": "Get stat/listing cache hit ratios and saved syscall counts. Args: none"
+            },
+            "file_search": {
+                "search_files": "Full-text search of text files in allowed directories, ranked with snippets. Args: query (str) - words, \"quoted phrases\", prefix* terms, path (str, optional), limit (int, optional)",
+                "get_search_index_stats": "Get search index file counts, size and last refresh. Args: none"
             },
             "text_processor": {
                 "to_uppercase": "Convert text to uppercase. Args: text (str)",
                 "to_lowercase": "Convert text to lowercase. Args: text (str)", 
                 "reverse_text": "Reverse text character order. Args: text (str)",
-                "count_words": "Count words, characters, and lines. Args: text (str)"
+                "count_words": "Count words, characters, and lines. Args: text (str), include_text (bool, optional), include_words (bool, optional), top_k (int, optional)",
+                "process_texts": "Apply an ordered chain of operations to many texts in one call, without echoing originals. Args: texts (list of str), operations (list of uppercase|lowercase|reverse|count; count must be last)"
             }
         }
+        self._general = VersionedDocument(self._build_help)
+        self._categories = VersionedDocument(lambda: {
+            "available_categories": list(self._registered_help()),
+            "usage": "Specify a category to get detailed help",
+            "example": "get_tool_help('calculator')"
+        })
+        self._tool_documents: Dict[str, VersionedDocument] = {}
+        self.refresh()
     
-    @resource
-    def get_help(self) -> Dict[str, Any]:
-        """
-        Get general help information about the server.
-        
-        Returns:
-            Dictionary containing help information
-        """
-        help_info = {
+    def _registered_help(self) -> Dict[str, Dict[str, str]]:
+        """tool_help restricted to the tools currently registered and enabled"""
+        registered = self.registry()["tools"]
+        return {
+            category: {
+                name: text for name, text in tools.items()
+                if name in registered.get(category, ())
+            }
+            for category, tools in self.tool_help.items()
+            if category in registered
+        }
+    
+    def _build_help(self) -> Dict[str, Any]:
+        """Assemble the general help payload"""
+        return {
             "server_name": "FastMCP Basic Example Server",
             "description": "A demonstration MCP server showcasing basic tools and resources",
             "getting_started": {
                 "1": "Use tools to perform operations like calculations, weather queries, etc.",
                 "2": "Use resources to get configuration, help, and logs",
                 "3": "All file operations are restricted to safe directories",
-                "4": "Check logs for detailed operation history"
+                "4": "Check logs for detailed operation history",
+                "5": "Tools returning objects accept fields (e.g. ['files.name']) and compact=true to trim responses"
             },
             "available_categories": {
-                "calculator": "Basic mathematical operations",
-                "weather": "Weather information lookup",
-                "file_reader": "Safe file reading operations", 
-                "text_processor": "Text manipulation utilities"
+                category: CATEGORY_DESCRIPTIONS.get(category, "")
+                for category in self._registered_help()
             },
             "examples": {
                 "calculation": "Use add(10, 5) to add numbers",
-                "weather": "Use get_weather('seoul') for Seoul weather",
+                "weather": "Use get_weather('seoul') for Seoul weather, get_weather_many(['seoul', 'tokyo']) for several cities",
                 "file_reading": "Use read_file('README.md') to read files",
                 "text_processing": "Use to_uppercase('hello') to convert text"
             },
             "support": {
                 "documentation": "Use get_tool_help(category) for specific tool help",
-                "logs": "Use get_logs() to view server activity",
-                "configuration": "Use get_config() for server settings"
+                "logs": "Read logs://server/error?since=10m&max_lines=20 to view recent server activity",
+                "configuration": "Use get_config() for server settings",
+                "metrics": "Read metrics://server for per-tool call counts and latency",
+                "overload": "Calls rejected with 'retry after Ns' should be retried after that delay"
             }
         }
+    
+    def _build_category(self, category: str) -> Dict[str, Any]:
+        """Assemble the help payload of one tool category"""
+        tools = self._registered_help().get(category, {})
+        return {
+            "category": category,
+            "tools": tools,
+            "total_tools": len(tools)
+        }
+    
+    def refresh(self) -> List[str]:
+        """
+        Regenerate every help document from the live registry.
         
+        Returns:
+            Names of the documents whose content changed ("all" for general help)
+        """
+        changed = ["all"] if self._general.refresh() else []
+        self._categories.refresh()
+        for category in self._registered_help():
+            if category not in self._tool_documents:
+                self._tool_documents[category] = VersionedDocument(
+                    lambda category=category: self._build_category(category)
+                )
+        for category, document in self._tool_documents.items():
+            if document.refresh():
+                changed.append(category)
+        return changed
+    
+    @resource
+    def get_help(self) -> str:
+        """
+        Get general help information about the server.
+        
+        Returns:
+            JSON text of the general help, with "etag" and "resource_version"
+        """
         logger.info("HelpResource: General help information requested")
-        return help_info
+        return self._general.text
     
     @resource
-    def get_tool_help(self, category: Optional[str] = None) -> Dict[str, Any]:
+    def get_tool_help(self, category: Optional[str] = None) -> str:
         """
         Get detailed help for specific tool categories.
         
         Args:
-            category: Tool category (calculator, weather, file_reader, text_processor)
-            
+            category: Tool category (calculator, weather, file_reader, file_search, text_processor)
+        
         Returns:
-            Dictionary containing tool-specific help
+            JSON text of the tool-specific help, with "etag" and "resource_version"
         """
         if category is None:
-            result = {
-                "available_categories": list(self.tool_help.keys()),
-                "usage": "Specify a category to get detailed help",
-                "example": "get_tool_help('calculator')"
-            }
             logger.info("HelpResource: Tool categories list requested")
-            return result
+            return self._categories.text
         
-        if category not in self.tool_help:
+        document = self._tool_documents.get(category)
+        if document is None or category not in self.registry()["tools"]:
             result = {
                 "error": f"Category '{category}' not found",
-                "available_categories": list(self.tool_help.keys())
+                "available_categories": list(self._registered_help())
             }
-            logger.warning(f"HelpResource: Unknown category '{category}' requested")
-            return result
-        
-        result = {
-            "category": category,
-            "tools": self.tool_help[category],
-            "total_tools": len(self.tool_help[category])
-        }
+            logger.warning("HelpResource: Unknown category '%s' requested", category)
+            return json.dumps(result, indent=2)
         
-        logger.info(f"HelpResource: Help for category '{category}' requested")
-        return result
\ No newline at end of file
+        logger.info("HelpResource: Help for category '%s' requested", category)
+        return document.text
@@ -0,0 +1,281 @@
+"""
+Log Index
+
+Incrementally maintained columnar index over the server log, used by
+LogsResource for level and time-range queries.
+"""
+
+from typing import Dict, Any, BinaryIO, List, Optional, Set, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import lru_cache
+import os
+import re
+import logging
+import threading
+
+from utils.log_setup import DEFAULT_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# Level codes stored in the index; 0 marks lines that are not log records
+LEVELS = ["UNKNOWN", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+LEVEL_CODES = {name: code for code, name in enumerate(LEVELS)}
+
+# %-style fields of a logging format string, and literal "%%"
+_FORMAT_FIELD = re.compile(r"%\((\w+)\)([-#0 +]*\d*(?:\.\d+)?)[diouxXeEfFgGcrsa]|%%")
+
+# Header fields the index needs; asctime uses logging's default datefmt
+_HEADER_FIELDS = {
+    "asctime": rb"(?P<stamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(?P<millis>\d{3})",
+    "levelname": rb"(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL)"
+}
+
+# Bytes read per step when extending the index
+_READ_SIZE = 4 * 1024 * 1024
+
+# Lines of the level column scanned per step when collecting recent matches
+_SCAN_LINES = 64 * 1024
+
+# translate() tables turning a column of level codes into a '1'/'0' string per level
+_BIT_TABLES = [
+    bytes(0x31 if value == code else 0x30 for value in range(256))
+    for code in range(len(LEVELS))
+]
+
+
+@lru_cache(maxsize=8)
+def record_pattern(log_format: str) -> "re.Pattern[bytes]":
+    """
+    Compile a pattern matching the record header written by a logging format.
+
+    The pattern ends with the literal text following the later of
+    %(asctime)s and %(levelname)s; every other field before that matches
+    lazily, so "%(name)s" or "%(threadName)s" can sit anywhere.
+
+    Raises:
+        ValueError: If the format lacks %(asctime)s or %(levelname)s
+    """
+    parts = [b"^"]
+    seen: Set[str] = set()
+    position = 0
+    for match in _FORMAT_FIELD.finditer(log_format):
+        parts.append(re.escape(log_format[position:match.start()].encode("utf-8")))
+        position = match.end()
+        if seen >= _HEADER_FIELDS.keys():
+            break
+        field, spec = match.groups()
+        if field is None:
+            parts.append(b"%")
+        elif field in _HEADER_FIELDS and field not in seen:
+            seen.add(field)
+            # A width such as %(levelname)-8s pads the value with spaces
+            padding = rb" *" if spec else b""
+            parts.append(padding + _HEADER_FIELDS[field] + padding)
+        else:
+            parts.append(rb".*?")
+    else:
+        parts.append(re.escape(log_format[position:].encode("utf-8")))
+
+    missing = [f"%({field})s" for field in _HEADER_FIELDS if field not in seen]
+    if missing:
+        raise ValueError(
+            f"logging.format '{log_format}' has no {' or '.join(missing)} field, "
+            "so its log lines cannot be indexed"
+        )
+    return re.compile(b"".join(parts))
+
+
+DEFAULT_RECORD = record_pattern(DEFAULT_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def _epoch(stamp: bytes) -> float:
+    """Epoch seconds of a "%Y-%m-%d %H:%M:%S" local timestamp"""
+    return datetime.strptime(stamp.decode("ascii"), "%Y-%m-%d %H:%M:%S").timestamp()
+
+
+def parse_log_line(
+    raw: bytes,
+    pattern: "re.Pattern[bytes]" = DEFAULT_RECORD
+) -> Tuple[Optional[str], Optional[float], int]:
+    """
+    Parse the record header of one log line.
+
+    Only the levelname field is considered, so a message that merely
+    contains "ERROR" is not classified as an error.
+
+    Args:
+        raw: One log line without its newline
+        pattern: Header pattern from record_pattern() for the log's format
+
+    Returns:
+        (timestamp text, epoch seconds, level code), or (None, None, 0)
+        for continuation lines such as tracebacks
+    """
+    match = pattern.match(raw)
+    if match is None:
+        return None, None, 0
+    stamp, millis, level = match.group("stamp", "millis", "level")
+    text = f"{stamp.decode('ascii')},{millis.decode('ascii')}"
+    return text, _epoch(stamp) + int(millis) / 1000, LEVEL_CODES[level.decode("ascii")]
+
+
+class LogIndex:
+    """
+    Byte offsets, epoch timestamps and level codes of every log line.
+
+    The columns are compact arrays and each level also has a bitmap (a
+    Python int with one bit per line). Timestamps are kept non-decreasing
+    -- continuation lines and clock steps backwards reuse the previous
+    value -- so time ranges can be found with binary search.
+    """
+
+    def __init__(self, pattern: "re.Pattern[bytes]" = DEFAULT_RECORD):
+        self.pattern = pattern
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, inode: Optional[int]) -> None:
+        self._inode = inode
+        self._indexed_size = 0
+        self.offsets = array("Q")
+        self.timestamps = array("d")
+        self.levels = array("B")
+        self.bitmaps = [0] * len(LEVELS)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def indexed_size(self) -> int:
+        """Byte offset up to which complete lines have been indexed"""
+        return self._indexed_size
+
+    def refresh(self, f: BinaryIO, stat: os.stat_result) -> int:
+        """
+        Index lines appended since the last refresh.
+
+        A replaced or truncated log is re-indexed from the start. A trailing
+        line without a newline is left for a later refresh.
+
+        Returns:
+            Number of newly indexed lines
+        """
+        with self._lock:
+            if stat.st_ino != self._inode or stat.st_size < self._indexed_size:
+                self._reset(stat.st_ino)
+
+            first = len(self.offsets)
+            offset = self._indexed_size
+            previous = self.timestamps[-1] if first else 0.0
+            f.seek(offset)
+            pending = b""
+            while offset + len(pending) < stat.st_size:
+                chunk = f.read(min(_READ_SIZE, stat.st_size - offset - len(pending)))
+                if not chunk:
+                    break
+                pieces = (pending + chunk).split(b"\n")
+                pending = pieces.pop()
+                for raw in pieces:
+                    _, epoch, code = parse_log_line(raw, self.pattern)
+                    if epoch is None or epoch < previous:
+                        epoch = previous
+                    previous = epoch
+                    self.offsets.append(offset)
+                    self.timestamps.append(epoch)
+                    self.levels.append(code)
+                    offset += len(raw) + 1
+
+            added = len(self.offsets) - first
+            if added:
+                # Bit i of a level bitmap is line i; the string is reversed so
+                # that the first new line lands in the lowest bit
+                segment = self.levels[first:].tobytes()
+                for code, table in enumerate(_BIT_TABLES):
+                    bits = int(segment.translate(table)[::-1], 2)
+                    if bits:
+                        self.bitmaps[code] |= bits << first
+            self._indexed_size = offset
+            if added:
+                logger.debug("LogIndex: Indexed %d new lines up to byte %d", added, offset)
+            return added
+
+    def query(
+        self,
+        levels: Optional[List[int]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        max_lines: int = 50
+    ) -> Tuple[List[int], int]:
+        """
+        Find the most recent lines matching a level set and time range.
+
+        Args:
+            levels: Level codes to include, or None for every line
+            since: Inclusive lower bound in epoch seconds
+            until: Inclusive upper bound in epoch seconds
+            max_lines: Maximum number of line numbers to return
+
+        Returns:
+            (matching line numbers in file order, total number of matches)
+        """
+        with self._lock:
+            lo = 0 if since is None else bisect_left(self.timestamps, since)
+            hi = len(self.offsets) if until is None else bisect_right(self.timestamps, until)
+            if hi <= lo:
+                return [], 0
+
+            if levels is None:
+                start = max(lo, hi - max_lines)
+                return list(range(start, hi)), hi - lo
+
+            combined = 0
+            for code in levels:
+                combined |= self.bitmaps[code]
+            window = (combined >> lo) & ((1 << (hi - lo)) - 1)
+            total = window.bit_count()
+
+            # Walk the level column back from `hi` a block at a time, so the
+            # cost follows the lines scanned rather than max_lines x window
+            wanted = bytes(code in levels for code in range(256))
+            matches: List[int] = []
+            end = hi
+            while end > lo and len(matches) < min(max_lines, total):
+                start = max(lo, end - _SCAN_LINES)
+                block = self.levels[start:end].tobytes().translate(wanted)
+                position = len(block)
+                while len(matches) < max_lines:
+                    position = block.rfind(b"\x01", 0, position)
+                    if position < 0:
+                        break
+                    matches.append(start + position)
+                end = start
+            matches.reverse()
+            return matches, total
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """Byte range of an indexed line, excluding its newline"""
+        with self._lock:
+            start = self.offsets[line]
+            end = self.offsets[line + 1] - 1 if line + 1 < len(self.offsets) else self._indexed_size - 1
+            return start, end
+
+    def stats(self) -> Dict[str, Any]:
+        """Line counts per level and memory held by the columns"""
+        with self._lock:
+            return {
+                "indexed_lines": len(self.offsets),
+                "indexed_bytes": self._indexed_size,
+                "lines_per_level": {
+                    name: self.bitmaps[code].bit_count()
+                    for code, name in enumerate(LEVELS)
+                },
+                "memory_bytes": (
+                    self.offsets.itemsize * len(self.offsets)
+                    + self.timestamps.itemsize * len(self.timestamps)
+                    + self.levels.itemsize * len(self.levels)
+                    + sum((bits.bit_length() + 7) // 8 for bits in self.bitmaps)
+                )
+            }
@@ -5,79 +5,139 @@ Provides access to server logs and activity history.
 """
 
 from fastmcp import resource
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, BinaryIO
 import os
+import re
+import time
 import logging
 from datetime import datetime
 from pathlib import Path
+from .log_index import LogIndex, LEVELS, LEVEL_CODES, parse_log_line, record_pattern
+from utils.log_setup import DEFAULT_FORMAT
+from utils.settings import SettingsStore
 
 logger = logging.getLogger(__name__)
 
+# Block size used when reading the log backwards from EOF
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Relative durations accepted by the since/until filters
+_RELATIVE_TIME = re.compile(r"^(\d+)([smhd])$")
+_TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
 class LogsResource:
     """Logs resource for accessing server activity"""
     
-    def __init__(self):
-        self.log_file = Path("server.log")
+    def __init__(
+        self,
+        log_file: Optional[Path] = None,
+        settings: Optional[SettingsStore] = None,
+        log_format: Optional[str] = None
+    ):
+        self.log_file = Path(log_file or "server.log")
+        # Record header pattern for config.json logging.format; raises
+        # ValueError for formats without asctime and levelname
+        self.record = record_pattern(log_format or DEFAULT_FORMAT)
+        # Default and maximum number of returned lines, re-read on every call
+        self.settings = settings or SettingsStore()
+        # (inode, size, newline count) of the last counted version of the log
+        self._line_count_state = (None, 0, 0)
+        # Columnar index used for level and time-range queries
+        self.index = LogIndex(self.record)
     
     @resource
-    def get_logs(self, max_lines: int = 50, level: str = "all") -> Dict[str, Any]:
+    def get_logs(
+        self,
+        max_lines: Optional[int] = None,
+        level: str = "all",
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get recent server logs.
         
+        Unfiltered requests read the log backwards from the end, so the cost
+        depends on max_lines rather than on the size of the log. Level and
+        time filters are answered from an incrementally maintained index.
+        
         Args:
-            max_lines: Maximum number of log lines to return (default: 50)
-            level: Log level filter (all, info, warning, error)
+            max_lines: Maximum number of log lines to return (default and upper
+                bound come from config.json: default_max_lines, max_lines_per_file)
+            level: Log level filter (all, debug, info, warning, error, critical)
+            since: Only lines at or after this time (ISO 8601, or relative like "10m")
+            until: Only lines at or before this time (ISO 8601, or relative like "10m")
             
         Returns:
             Dictionary containing log entries
         """
+        limits = self.settings.current
+        if max_lines is None:
+            max_lines = limits.logs_default_max_lines
+        max_lines = min(max_lines, limits.max_lines_per_file)
+        
+        level_codes = self._parse_level(level)
+        if level_codes == []:
+            return {
+                "error": f"Unknown log level '{level}'",
+                "available_levels": ["all"] + [name.lower() for name in LEVELS[1:]]
+            }
+        
         try:
-            if not self.log_file.exists():
+            since_epoch = self._parse_time(since)
+            until_epoch = self._parse_time(until)
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "log_file": str(self.log_file)
+            }
+        
+        try:
+            try:
+                f = open(self.log_file, 'rb')
+            except FileNotFoundError:
                 return {
                     "message": "No log file found yet",
                     "log_file": str(self.log_file),
                     "logs": []
                 }
             
-            # Read log file
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Get recent lines
-            recent_lines = lines[-max_lines:] if len(lines) > max_lines else lines
-            
-            # Filter by log level if specified
-            if level.lower() != "all":
-                level_upper = level.upper()
-                recent_lines = [
-                    line for line in recent_lines 
-                    if level_upper in line
-                ]
+            with f:
+                stat = os.fstat(f.fileno())
+                if level_codes is None and since_epoch is None and until_epoch is None:
+                    recent_lines = self._tail(f, stat.st_size, max_lines)
+                    total_lines = self._count_lines(f, stat)
+                    matched_lines = total_lines
+                else:
+                    self.index.refresh(f, stat)
+                    matches, matched_lines = self.index.query(
+                        level_codes, since_epoch, until_epoch, max_lines
+                    )
+                    recent_lines = self._read_lines(f, matches)
+                    total_lines = len(self.index)
             
             # Parse log entries
             log_entries = []
             for line in recent_lines:
-                line = line.strip()
-                if line:
-                    log_entries.append({
-                        "timestamp": self._extract_timestamp(line),
-                        "level": self._extract_level(line),
-                        "message": line
-                    })
+                log_entries.append({
+                    "timestamp": self._extract_timestamp(line),
+                    "level": self._extract_level(line),
+                    "message": line
+                })
             
             result = {
                 "log_file": str(self.log_file),
-                "total_lines": len(lines),
+                "total_lines": total_lines,
+                "matched_lines": matched_lines,
                 "returned_lines": len(log_entries),
                 "filter_level": level,
+                "since": since,
+                "until": until,
                 "logs": log_entries,
-                "file_size": self.log_file.stat().st_size if self.log_file.exists() else 0,
-                "last_modified": datetime.fromtimestamp(
-                    self.log_file.stat().st_mtime
-                ).isoformat() if self.log_file.exists() else None
+                "file_size": stat.st_size,
+                "last_modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
             }
             
-            logger.info(f"LogsResource: Retrieved {len(log_entries)} log entries (filter: {level})")
+            logger.info("LogsResource: Retrieved %d log entries (filter: %s)", len(log_entries), level)
             return result
             
         except Exception as e:
@@ -85,26 +145,103 @@ class LogsResource:
                 "error": f"Failed to read logs: {str(e)}",
                 "log_file": str(self.log_file)
             }
-            logger.error(f"LogsResource: Error reading logs: {e}")
+            logger.error("LogsResource: Error reading logs: %s", e)
             return error_result
     
+    @staticmethod
+    def _parse_level(level: str) -> Optional[List[int]]:
+        """Map a level filter to index level codes: None means all lines, [] an unknown level"""
+        if level.lower() == "all":
+            return None
+        code = LEVEL_CODES.get(level.upper())
+        return [code] if code else []
+    
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[float]:
+        """Convert an ISO 8601 time or a relative duration ("90s", "10m", "2h", "1d") to epoch seconds"""
+        if value is None:
+            return None
+        relative = _RELATIVE_TIME.match(value.strip())
+        if relative:
+            amount, unit = relative.groups()
+            return time.time() - int(amount) * _TIME_UNITS[unit]
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            raise ValueError(f"Invalid time '{value}': use ISO 8601 or a duration like '10m'")
+    
+    def _read_lines(self, f: BinaryIO, line_numbers: List[int]) -> List[str]:
+        """Read indexed lines by seeking straight to their byte offsets"""
+        lines = []
+        for number in line_numbers:
+            start, end = self.index.line_span(number)
+            f.seek(start)
+            line = f.read(end - start).decode('utf-8', errors='replace').strip()
+            if line:
+                lines.append(line)
+        return lines
+    
+    def _tail(self, f: BinaryIO, size: int, max_lines: int) -> List[str]:
+        """
+        Return the last `max_lines` non-empty lines of the log.
+        
+        Fixed-size blocks are read backwards from `size`; the partial line at
+        the start of each block is carried over and completed by the next
+        (earlier) block.
+        """
+        matched: List[str] = []
+        position = size
+        carry = b""
+        while position > 0 and len(matched) < max_lines:
+            read_size = min(TAIL_BLOCK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + carry
+            pieces = chunk.split(b"\n")
+            # The first piece may continue in the previous block
+            carry = pieces[0] if position > 0 else b""
+            start = 1 if position > 0 else 0
+            for raw in reversed(pieces[start:]):
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line:
+                    matched.append(line)
+                    if len(matched) >= max_lines:
+                        break
+        matched.reverse()
+        return matched
+    
+    def _count_lines(self, f: BinaryIO, stat: os.stat_result) -> int:
+        """
+        Count lines in the log, reusing the previous count when it only grew.
+        
+        Only bytes appended since the last call are scanned; a rotated or
+        truncated log is recounted from the start.
+        """
+        inode, counted_size, newlines = self._line_count_state
+        if inode != stat.st_ino or counted_size > stat.st_size:
+            counted_size, newlines = 0, 0
+        
+        f.seek(counted_size)
+        remaining = stat.st_size - counted_size
+        while remaining > 0:
+            chunk = f.read(min(TAIL_BLOCK_SIZE * 16, remaining))
+            if not chunk:
+                break
+            newlines += chunk.count(b"\n")
+            remaining -= len(chunk)
+        self._line_count_state = (stat.st_ino, stat.st_size, newlines)
+        
+        if stat.st_size == 0:
+            return 0
+        f.seek(stat.st_size - 1)
+        return newlines + (0 if f.read(1) == b"\n" else 1)
+    
     def _extract_timestamp(self, log_line: str) -> str:
         """Extract timestamp from log line"""
-        try:
-            # Assuming format: "2025-07-21 10:30:00,123 - ..."
-            if " - " in log_line:
-                return log_line.split(" - ")[0]
-            return "unknown"
-        except:
-            return "unknown"
+        timestamp, _, _ = parse_log_line(log_line.encode('utf-8'), self.record)
+        return timestamp or "unknown"
     
     def _extract_level(self, log_line: str) -> str:
-        """Extract log level from log line"""
-        try:
-            levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-            for level in levels:
-                if level in log_line:
-                    return level
-            return "UNKNOWN"
-        except:
-            return "UNKNOWN"
\ No newline at end of file
+        """Extract log level from the levelname field of a log line"""
+        _, _, code = parse_log_line(log_line.encode('utf-8'), self.record)
+        return LEVELS[code]
@@ -0,0 +1,38 @@
+"""
+Metrics Resource
+
+Provides per-tool and per-resource call counts, errors, latency
+percentiles and payload sizes, and the state of admission control.
+"""
+
+from fastmcp import resource
+from typing import Optional
+import json
+import logging
+from utils.admission import AdmissionController
+from utils.metrics import RequestMetrics
+
+logger = logging.getLogger(__name__)
+
+class MetricsResource:
+    """Metrics resource exposing the server's request metrics"""
+    
+    def __init__(self, metrics: RequestMetrics, admission: Optional[AdmissionController] = None):
+        self.metrics = metrics
+        self.admission = admission
+    
+    @resource
+    def get_metrics(self) -> str:
+        """
+        Get request metrics for every tool and resource.
+        
+        Returns:
+            JSON text with calls, errors, latency percentiles (ms) and payload
+            bytes per tool and per resource, plus running, queued and shed calls
+            per admission cost class
+        """
+        logger.debug("MetricsResource: Metrics requested")
+        snapshot = self.metrics.snapshot()
+        if self.admission is not None and self.admission.enabled:
+            snapshot["admission"] = self.admission.stats()
+        return json.dumps(snapshot, ensure_ascii=False, indent=2)
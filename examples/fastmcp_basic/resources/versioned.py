@@ -0,0 +1,112 @@
+"""
+Versioned Resources
+
+Pre-serialized resource bodies with a content-derived ETag, and a notifier
+that tells client sessions when a resource they read has changed.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedDocument:
+    """
+    A JSON resource body built once and served as text until its content changes.
+
+    The served document is the payload plus "etag" (a hash of the payload)
+    and "resource_version" (bumped on every content change), so clients
+    can tell whether anything changed without diffing bodies.
+    """
+
+    def __init__(self, build: Callable[[], Dict[str, Any]]):
+        self._build = build
+        self.etag: Optional[str] = None
+        self.version = 0
+        self.text = ""
+
+    def refresh(self) -> bool:
+        """
+        Rebuild the payload and re-serialize it if it changed.
+
+        Returns:
+            True if the content (and so the ETag) changed
+        """
+        payload = self._build()
+        body = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        etag = hashlib.sha256(body).hexdigest()[:16]
+        if etag == self.etag:
+            return False
+        self.etag = etag
+        self.version += 1
+        self.text = json.dumps(
+            {"etag": etag, "resource_version": self.version, **payload},
+            ensure_ascii=False,
+            indent=2
+        )
+        return True
+
+
+class ResourceNotifier:
+    """
+    Remembers which sessions read which resource URIs and sends them
+    notifications/resources/updated when those resources change.
+
+    Sessions are held weakly, so closed connections drop out on their own.
+    """
+
+    def __init__(self):
+        self._readers: Dict[str, "weakref.WeakSet[Any]"] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set = set()
+        self.sent = 0
+
+    def track(self, uri: str, session: Any) -> None:
+        """Record that a session read a resource; call from the request handler"""
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            self._readers.setdefault(uri, weakref.WeakSet()).add(session)
+
+    def notify(self, uris: Iterable[str]) -> None:
+        """
+        Notify the readers of changed resources.
+
+        Safe to call from any thread, e.g. the config watcher; the sends run
+        on the server's event loop.
+        """
+        with self._lock:
+            targets = [
+                (uri, session)
+                for uri in uris
+                for session in list(self._readers.get(uri, ()))
+            ]
+        if not targets or self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            task = self._loop.create_task(self._send(targets))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(self._send(targets), self._loop)
+
+    async def _send(self, targets: list) -> None:
+        for uri, session in targets:
+            try:
+                await session.send_resource_updated(uri)
+                self.sent += 1
+            except Exception as e:
+                # The connection went away; stop notifying it
+                logger.debug("ResourceNotifier: Dropping session for %s: %s", uri, e)
+                with self._lock:
+                    self._readers.get(uri, weakref.WeakSet()).discard(session)
@@ -5,121 +5,727 @@ FastMCP Basic Server
 A simple MCP server demonstrating basic tools and resources.
 """
 
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import threading
+import inspect
 import logging
+import functools
 from datetime import datetime
-from fastmcp import FastMCP
+from typing import Any, Callable, Optional, List, Dict, Tuple, Union
+from fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+try:
+    from fastmcp.server.dependencies import get_http_request
+except ImportError:  # fastmcp without access to the HTTP request
+    get_http_request = None
 
 # Import tool and resource classes
 from tools.calculator import CalculatorTool
 from tools.weather import WeatherTool
+from tools.city_catalog import CityCatalog
+from tools.weather_providers import WeatherCache, create_provider
 from tools.file_reader import FileReaderTool
+from tools.line_index import LineIndexCache
+from tools.metadata_cache import MetadataCache
+from tools.content_cache import ContentCache
+from tools.file_search import FileSearchTool
+from tools.search_index import SearchIndex
 from tools.text_processor import TextProcessorTool
 from resources.config import ConfigResource
 from resources.help import HelpResource
 from resources.logs import LogsResource
+from resources.metrics import MetricsResource
+from resources.versioned import ResourceNotifier
+from utils.config_loader import CONFIG_PATH, load_config, resolve_path
+from utils.settings import Settings, SettingsStore
+from utils.log_setup import receive_forwarded, setup_logging
+from utils.executor import BlockingExecutor
+from utils.admission import AdmissionController, exceeds_size
+from utils.http_workers import DRAIN_SIGNAL, WorkerSupervisor, bind_socket
+from utils.metrics import SIZE_SAMPLE_INTERVAL, PrometheusFileWriter, RequestMetrics, payload_size
+from utils.shaping import ResponseShape, returns_dict
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure the queued logging pipeline from config.json
+config = load_config()
+log_listener = setup_logging(config.get("logging", {}))
 logger = logging.getLogger(__name__)
 
+# Limits and enabled groups, swapped atomically when config.json is reloaded
+settings = SettingsStore(
+    Settings.from_config(config),
+    path=CONFIG_PATH,
+    poll_interval_seconds=config.get("server", {}).get("config_reload_seconds", 2)
+)
+
+# Names registered at startup per config.json group: {"tools" | "resources": {group: [names]}}
+registry: Dict[str, Dict[str, List[str]]] = {"tools": {}, "resources": {}}
+
+def live_registry() -> Dict[str, Dict[str, List[str]]]:
+    """Registered tools and resources whose group is still enabled"""
+    current = settings.current
+    return {
+        section: {
+            group: list(names) for group, names in groups.items()
+            if current.is_enabled(section, group)
+        }
+        for section, groups in registry.items()
+    }
+
+# Call counts, errors, latency histograms and payload sizes of every handler
+metrics = RequestMetrics()
+metrics_settings = config.get("metrics", {})
+
+# Cost classes, per-client token buckets and wait queues of tool calls
+admission_settings = config.get("admission", {})
+admission = AdmissionController(
+    classes=admission_settings.get("classes"),
+    tools=admission_settings.get("tools"),
+    default_class=admission_settings.get("default_class", "cheap"),
+    enabled=admission_settings.get("enabled", True)
+)
+
+def client_key() -> str:
+    """
+    The client a tool call is rate-limited as: its MCP session over HTTP,
+    or its address when HTTP sessions are stateless; stdio has one client.
+    """
+    if get_http_request is None:
+        return "local"
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        return "local"
+    session = request.headers.get("mcp-session-id")
+    if session:
+        return session
+    return request.client.host if request.client else "http"
+
+# Parameter types whose values are too small to need the request size check
+SCALAR_ANNOTATIONS = {int, float, bool, Optional[int], Optional[float], Optional[bool]}
+
+# Texts per chunk when process_texts streams a large batch
+BATCH_CHUNK_SIZE = 1000
+
 # Create the FastMCP server
 server = FastMCP("FastMCP Basic Server")
 
+# Thread pool for blocking file, log and text work, limited per category
+executor_settings = config.get("executor", {})
+executor = BlockingExecutor(
+    max_workers=executor_settings.get("max_workers", 16),
+    category_limits=executor_settings.get("category_limits")
+)
+
 # Initialize tool instances
 calculator = CalculatorTool()
-weather = WeatherTool()
-file_reader = FileReaderTool()
+weather_settings = config.get("tools", {}).get("weather", {})
+weather = WeatherTool(
+    provider=create_provider(weather_settings),
+    cache=WeatherCache(
+        ttl_seconds=weather_settings.get("cache", {}).get("ttl_seconds", 300),
+        stale_seconds=weather_settings.get("cache", {}).get("stale_while_revalidate_seconds", 0),
+        max_entries=weather_settings.get("cache", {}).get("max_entries", 1024)
+    ),
+    catalog=CityCatalog(resolve_path(weather_settings.get("catalog", {}).get("path", "data/cities.tsv"))),
+    max_batch_cities=weather_settings.get("max_batch_cities", 100),
+    batch_concurrency=weather_settings.get("batch_concurrency", 16)
+)
+file_reader_settings = config.get("tools", {}).get("file_reader", {})
+metadata_settings = file_reader_settings.get("metadata_cache", {})
+content_settings = file_reader_settings.get("content_cache", {})
+line_index_dir = file_reader_settings.get("line_index_dir")
+file_reader = FileReaderTool(
+    allowed_dirs=list(settings.current.allowed_directories),
+    settings=settings,
+    line_index=LineIndexCache(cache_dir=str(resolve_path(line_index_dir)) if line_index_dir else None),
+    metadata=MetadataCache(
+        stat_ttl_seconds=metadata_settings.get("stat_ttl_seconds", 1.0),
+        max_stats=metadata_settings.get("max_stats", 8192),
+        max_listings=metadata_settings.get("max_listings", 256)
+    ),
+    content_cache=ContentCache(
+        max_bytes=int(content_settings.get("max_mb", 64) * 1024 * 1024),
+        max_entry_bytes=int(content_settings.get("max_entry_mb", 4) * 1024 * 1024)
+    )
+)
+search_settings = config.get("tools", {}).get("file_search", {})
+file_search = FileSearchTool(
+    index=SearchIndex(
+        resolve_path(search_settings.get("index_path", ".search_index/index.sqlite3")),
+        extensions=search_settings.get("extensions"),
+        max_file_size=search_settings.get("max_file_size_kb", 1024) * 1024,
+        workers=search_settings.get("workers"),
+        refresh_interval_seconds=search_settings.get("refresh_interval_seconds", 30)
+    ),
+    allowed_roots=file_reader.allowed_roots
+)
 text_processor = TextProcessorTool()
 
 # Initialize resource instances
-config_resource = ConfigResource()
-help_resource = HelpResource()
-logs_resource = LogsResource()
+config_resource = ConfigResource(settings, live_registry)
+help_resource = HelpResource(live_registry)
+notifier = ResourceNotifier()
+logs_resource = LogsResource(
+    resolve_path(config.get("logging", {}).get("file", "server.log")),
+    settings=settings,
+    log_format=config.get("logging", {}).get("format")
+)
+metrics_resource = MetricsResource(metrics, admission)
+
+def apply_settings(old: Settings, new: Settings) -> None:
+    """Apply the reloadable parts of a new config.json snapshot"""
+    if new.log_level != old.log_level:
+        logging.getLogger().setLevel(new.log_level)
+    if new.allowed_directories != old.allowed_directories:
+        file_reader.set_allowed_dirs(list(new.allowed_directories))
+    for section in ("tools", "resources"):
+        for group in new.config.get(section, {}):
+            if (
+                new.is_enabled(section, group)
+                and not old.is_enabled(section, group)
+                and group not in registry[section]
+            ):
+                logger.warning("Enabling %s group '%s' requires a restart", section, group)
+    refresh_resources()
+
+def refresh_resources() -> None:
+    """Regenerate the config/help documents and notify readers of the ones that changed"""
+    changed = []
+    if config_resource.refresh():
+        changed.append("config://server")
+    changed.extend(f"help://tools/{name}" for name in help_resource.refresh())
+    if changed:
+        logger.info("Resources regenerated: %s", ", ".join(changed))
+        notifier.notify(changed)
+
+settings.subscribe(apply_settings)
+
+def _guarded(
+    section: str,
+    group: str,
+    name: str,
+    func: Callable[..., Any],
+    shape: Optional[ResponseShape] = None,
+    controller: Optional[AdmissionController] = None
+) -> Callable[..., Any]:
+    """
+    Wrap a handler so it refuses calls once a reload disables its group,
+    applies the request size limit to tool calls and the controller's
+    admission control, shapes its result if it accepts fields/compact,
+    and records its metrics. Raised exceptions and results with an
+    "error" key count as errors.
+    """
+    key = (section[:-1], name)
+    # Bound once here; the wrappers run on every call
+    record = metrics.record
+    clock = time.perf_counter_ns
+    calls = -1
+    # Only tools taking strings, lists or mappings can receive a large request
+    limit_size = section == "tools" and any(
+        parameter.annotation not in SCALAR_ANNOTATIONS
+        for parameter in inspect.signature(func).parameters.values()
+    )
+    
+    def finish(started: int, error: bool, kwargs: Dict[str, Any], result: Any, shaped: Any) -> None:
+        nonlocal calls
+        record(key, clock() - started, error)
+        calls += 1
+        if not calls & (SIZE_SAMPLE_INTERVAL - 1):
+            response_bytes = payload_size(shaped)
+            saved_bytes = payload_size(result) - response_bytes if shaped is not result else 0
+            metrics.record_sizes(key, payload_size(kwargs), response_bytes, saved_bytes)
+    
+    def check(kwargs: Dict[str, Any]) -> None:
+        current = settings.current
+        if not current.is_enabled(section, group):
+            raise RuntimeError(f"'{func.__name__}' is disabled in config.json ({section}.{group})")
+        if limit_size and exceeds_size(kwargs, current.max_request_bytes):
+            raise ValueError(
+                f"Request to '{name}' is larger than the "
+                f"{current.max_request_bytes // 1024} KB limit (security.max_request_kb)"
+            )
+    
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = clock()
+            result = shaped = None
+            error = True
+            cost_class = None
+            try:
+                check(kwargs)
+                if controller is not None and controller.enabled:
+                    cost_class = await controller.acquire(name, client_key())
+                    admitted = clock()
+                if shape is None:
+                    result = shaped = await func(*args, **kwargs)
+                else:
+                    fields, compact = shape.split(kwargs)
+                    result = await func(*args, **kwargs)
+                    shaped = shape.apply(result, kwargs, fields, compact)
+                error = type(shaped) is dict and "error" in shaped
+                return shaped
+            finally:
+                if cost_class is not None:
+                    controller.release(cost_class, (clock() - admitted) / 1e9)
+                finish(started, error, kwargs, result, shaped)
+        handler = async_wrapper
+    else:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = clock()
+            result = shaped = None
+            error = True
+            cost_class = None
+            try:
+                check(kwargs)
+                if controller is not None and controller.enabled:
+                    cost_class = controller.try_acquire(name, client_key())
+                    admitted = clock()
+                if shape is None:
+                    result = shaped = func(*args, **kwargs)
+                else:
+                    fields, compact = shape.split(kwargs)
+                    result = func(*args, **kwargs)
+                    shaped = shape.apply(result, kwargs, fields, compact)
+                error = type(shaped) is dict and "error" in shaped
+                return shaped
+            finally:
+                if cost_class is not None:
+                    controller.release(cost_class, (clock() - admitted) / 1e9)
+                finish(started, error, kwargs, result, shaped)
+        handler = wrapper
+    
+    if shape is not None:
+        # Expose fields/compact in the tool's input schema
+        handler.__signature__ = shape.signature
+        handler.__annotations__ = shape.annotations
+    return handler
+
+def register_tool(
+    group: str,
+    echoes: Tuple[str, ...] = (),
+    joined: Tuple[str, ...] = ()
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a tool if its config.json tool group is enabled at startup.
+    
+    Tools returning a dict also accept `fields` and `compact` (see
+    utils/shaping.py); `echoes` and `joined` are their compact-mode rules.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if not settings.current.is_enabled("tools", group):
+            logger.info("Tool '%s' not registered: tools.%s is disabled", func.__name__, group)
+            return func
+        registry["tools"].setdefault(group, []).append(func.__name__)
+        shape = ResponseShape(func, echoes, joined) if returns_dict(func) else None
+        return server.tool(_guarded("tools", group, func.__name__, func, shape, admission))
+    return decorator
+
+def register_resource(group: str, uri: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a resource if its config.json resource group is enabled at startup"""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if not settings.current.is_enabled("resources", group):
+            logger.info("Resource '%s' not registered: resources.%s is disabled", uri, group)
+            return func
+        registry["resources"].setdefault(group, []).append(uri)
+        return server.resource(uri)(_guarded("resources", group, uri, func))
+    return decorator
 
 # Register calculator tools
-@server.tool
+@register_tool("calculator")
 def add(a: float, b: float) -> float:
     """Add two numbers together."""
     return calculator.add(a, b)
 
-@server.tool
+@register_tool("calculator")
 def subtract(a: float, b: float) -> float:
     """Subtract second number from first number."""
     return calculator.subtract(a, b)
 
-@server.tool
+@register_tool("calculator")
 def multiply(a: float, b: float) -> float:
     """Multiply two numbers."""
     return calculator.multiply(a, b)
 
-@server.tool
+@register_tool("calculator")
 def divide(a: float, b: float) -> float:
     """Divide first number by second number."""
     return calculator.divide(a, b)
 
-# Register weather tool
-@server.tool
-def get_weather(city: str) -> dict:
-    """Get current weather information for a city."""
-    return weather.get_weather(city)
+@register_tool("calculator")
+def batch_calculate(
+    operation: str,
+    a: Union[float, List[float]],
+    b: Union[float, List[float]]
+) -> dict:
+    """Apply add/subtract/multiply/divide element-wise to lists (scalars are broadcast)."""
+    return calculator.batch_calculate(operation, a, b)
+
+@register_tool("calculator")
+def reduce_values(operation: str, values: List[float]) -> dict:
+    """Reduce a list of numbers with sum, mean, min or max."""
+    return calculator.reduce(operation, values)
+
+@register_tool("calculator", echoes=("operation",))
+def dot_product(a: List[float], b: List[float]) -> dict:
+    """Compute the dot product of two equal-length lists of numbers."""
+    return calculator.dot(a, b)
+
+@register_tool("calculator")
+def evaluate(
+    expression: str,
+    variables: Optional[Dict[str, Union[float, List[float]]]] = None
+) -> dict:
+    """Evaluate an arithmetic expression; list-valued variables evaluate over a whole dataset."""
+    return calculator.evaluate(expression, variables)
+
+@register_tool("calculator")
+def get_expression_cache_stats() -> dict:
+    """Get hit/miss counters of the compiled-expression cache."""
+    return calculator.get_expression_cache_stats()
+
+# Register weather tools
+async def load_city_catalog() -> None:
+    """Read the city catalog on first use without blocking the event loop"""
+    if not weather.catalog.loaded:
+        await executor.run("file_io", weather.catalog.load)
+
+@register_tool("weather")
+async def get_weather(city: str) -> dict:
+    """Get current weather for a city name, alias, prefix or near-miss spelling ("Seoul, KR" limits the country)."""
+    await load_city_catalog()
+    return await weather.get_weather(city)
+
+@register_tool("weather")
+async def get_weather_many(cities: List[str]) -> dict:
+    """Get current weather for many cities in one call; distinct cities are fetched concurrently."""
+    await load_city_catalog()
+    return await weather.get_weather_many(cities)
+
+@register_tool("weather")
+async def search_cities(query: str, limit: int = 10) -> dict:
+    """Find catalog cities whose name starts with a query, most populous first."""
+    await load_city_catalog()
+    return weather.search_cities(query, limit)
+
+@register_tool("weather")
+def get_weather_cache_stats() -> dict:
+    """Get hit/miss/coalesced counters of the weather cache."""
+    return weather.get_cache_stats()
+
+@register_tool("weather")
+def get_city_catalog_stats() -> dict:
+    """Get city count, memory use and lookup counters of the city catalog."""
+    return weather.get_catalog_stats()
 
 # Register file reader tools
-@server.tool
-def list_files(directory_path: str = ".") -> dict:
-    """List files and directories in a given path."""
-    return file_reader.list_files(directory_path)
+@register_tool("file_reader")
+async def list_files(
+    directory_path: str = ".",
+    page_size: int = 1000,
+    cursor: Optional[str] = None,
+    recursive: bool = False,
+    max_depth: int = 10,
+    pattern: Optional[str] = None,
+    extensions: Optional[List[str]] = None
+) -> dict:
+    """List files and directories a page at a time; pass next_cursor back to continue."""
+    return await executor.run(
+        "file_io", file_reader.list_files, directory_path, page_size, cursor,
+        recursive, max_depth, pattern, extensions
+    )
+
+@register_tool("file_reader", joined=("content",))
+async def read_file(
+    file_path: str,
+    max_lines: Optional[int] = None,
+    start_line: int = 0,
+    byte_offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+    encoding: Optional[str] = None,
+    lossy: bool = False
+) -> dict:
+    """Read a window of lines from a text file (encoding detected unless given); pass next_cursor back to page."""
+    return await executor.run(
+        "file_io", file_reader.read_file, file_path, max_lines, start_line, byte_offset, cursor,
+        encoding, lossy
+    )
+
+@register_tool("file_reader")
+async def read_bytes(file_path: str, offset: int = 0, length: Optional[int] = None) -> dict:
+    """Read a byte range of any file, text or binary, as base64; pass next_offset back to continue."""
+    return await executor.run("file_io", file_reader.read_bytes, file_path, offset, length)
+
+@register_tool("file_reader")
+def get_file_index_stats() -> dict:
+    """Get hit/miss counters and memory usage of the line-offset index cache."""
+    return file_reader.get_index_stats()
+
+@register_tool("file_reader")
+def get_file_content_cache_stats() -> dict:
+    """Get hit ratio, coalesced reads and bytes served from memory of the file content cache."""
+    return file_reader.get_content_cache_stats()
+
+@register_tool("file_reader")
+def get_file_metadata_stats() -> dict:
+    """Get hit ratios and saved syscalls of the stat/listing cache."""
+    return file_reader.get_metadata_stats()
 
-@server.tool
-def read_file(file_path: str, max_lines: int = 100) -> dict:
-    """Read contents of a text file safely."""
-    return file_reader.read_file(file_path, max_lines)
+# Register file search tools
+@register_tool("file_search")
+async def search_files(query: str, path: str = ".", limit: int = 20) -> dict:
+    """Full-text search of text files; supports "quoted phrases" and prefix* terms."""
+    return await executor.run("search", file_search.search_files, query, path, limit)
+
+@register_tool("file_search")
+def get_search_index_stats() -> dict:
+    """Get indexed file counts, index size and last refresh of the search index."""
+    return file_search.get_index_stats()
 
 # Register text processor tools
-@server.tool
-def count_words(text: str) -> dict:
-    """Count words, characters, and lines in text."""
-    return text_processor.count_words(text)
+@register_tool("text_processor", echoes=("operation",))
+async def count_words(
+    text: str,
+    include_text: bool = True,
+    include_words: bool = True,
+    top_k: int = 0
+) -> dict:
+    """Count words, characters, and lines in text; optionally return the top_k most frequent words."""
+    return await executor.run(
+        "text_processing", text_processor.count_words, text, include_text, include_words, top_k
+    )
+
+@register_tool("text_processor")
+async def process_texts(
+    texts: List[str],
+    operations: List[str],
+    ctx: Context,
+    stream: bool = False
+) -> dict:
+    """Apply an ordered chain of operations (uppercase, lowercase, reverse, count) to many texts; with stream=True each chunk's results arrive in order as a JSON progress message instead of in the response."""
+    results: list = []
+    count = 0
+    for start in range(0, max(len(texts), 1), BATCH_CHUNK_SIZE):
+        chunk = await executor.run(
+            "text_processing",
+            text_processor.process_batch,
+            texts[start:start + BATCH_CHUNK_SIZE],
+            operations
+        )
+        if "error" in chunk:
+            return chunk
+        count += chunk["count"]
+        message = None
+        if stream:
+            # Only one chunk's results are held at a time
+            message = json.dumps({"offset": start, "results": chunk["results"]}, ensure_ascii=False)
+        else:
+            results.extend(chunk["results"])
+        # Report progress in order and let other requests run between chunks
+        await ctx.report_progress(count, len(texts), message)
+    if stream:
+        return {
+            "operations": operations,
+            "count": count,
+            "streamed": True
+        }
+    return {
+        "operations": operations,
+        "count": count,
+        "results": results
+    }
 
-@server.tool
-def reverse_text(text: str) -> str:
+@register_tool("text_processor", echoes=("original", "operation"))
+def reverse_text(text: str) -> dict:
     """Reverse the order of characters in text."""
     return text_processor.reverse_text(text)
 
-@server.tool
-def to_uppercase(text: str) -> str:
+@register_tool("text_processor", echoes=("original", "operation"))
+def to_uppercase(text: str) -> dict:
     """Convert text to uppercase."""
     return text_processor.to_uppercase(text)
 
-@server.tool
-def to_lowercase(text: str) -> str:
+@register_tool("text_processor", echoes=("original", "operation"))
+def to_lowercase(text: str) -> dict:
     """Convert text to lowercase."""
     return text_processor.to_lowercase(text)
 
 # Register resources
-@server.resource("config://server")
-def get_config() -> str:
-    """Get server configuration information."""
+@register_resource("config", "config://server")
+async def get_config(ctx: Context) -> str:
+    """Get server configuration information; versioned with an etag, updates are notified."""
+    notifier.track("config://server", ctx.session)
     return config_resource.get_config()
 
-@server.resource("help://tools/{tool_name}")
-def get_help(tool_name: str = "all") -> str:
-    """Get help information for tools."""
-    return help_resource.get_help(tool_name)
+@register_resource("help", "help://tools/{tool_name}")
+async def get_help(tool_name: str, ctx: Context) -> str:
+    """Get help for a tool category, or general help for "all"; updates are notified."""
+    notifier.track(f"help://tools/{tool_name}", ctx.session)
+    if tool_name == "all":
+        return help_resource.get_help()
+    return help_resource.get_tool_help(tool_name)
+
+@register_resource("logs", "logs://server/{log_type}{?max_lines,since,until}")
+async def get_logs(
+    log_type: str = "all",
+    max_lines: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> str:
+    """Get server logs filtered by level (all, info, warning, error), e.g. logs://server/error?since=10m&max_lines=20."""
+    return await executor.run(
+        "logs", logs_resource.get_logs,
+        max_lines=max_lines, level=log_type, since=since, until=until
+    )
+
+@register_resource("metrics", "metrics://server")
+def get_metrics() -> str:
+    """Get call counts, errors, latency percentiles and payload sizes per tool and resource."""
+    return metrics_resource.get_metrics()
+
+# Build the config/help documents from what was actually registered
+refresh_resources()
+
+# HTTP transport: set once this process starts serving HTTP
+server_settings = config.get("server", {})
+http_settings = server_settings.get("http", {})
+started_at = time.time()
+worker_index: Optional[int] = None
+draining = threading.Event()
+
+@server.custom_route(http_settings.get("health_path", "/health"), methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    """Liveness/readiness for load balancers; 503 once the worker is draining."""
+    return JSONResponse(
+        {
+            "status": "draining" if draining.is_set() else "ok",
+            "worker": worker_index,
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - started_at, 1),
+            "active_blocking_calls": executor.stats()["active"]
+        },
+        status_code=503 if draining.is_set() else 200
+    )
 
-@server.resource("logs://server/{log_type}")
-def get_logs(log_type: str = "all") -> str:
-    """Get server logs."""
-    return logs_resource.get_logs(log_type)
+def create_prometheus_writer(index: Optional[int] = None) -> Optional[PrometheusFileWriter]:
+    """Prometheus file writer from config.json; each HTTP worker writes its own file"""
+    if not metrics_settings.get("prometheus_file"):
+        return None
+    path = resolve_path(metrics_settings["prometheus_file"])
+    labels = None
+    if index is not None:
+        path = path.with_name(f"{path.stem}.worker-{index}{path.suffix}")
+        labels = {"worker": str(index)}
+    return PrometheusFileWriter(
+        metrics,
+        path,
+        interval_seconds=metrics_settings.get("write_interval_seconds", 15),
+        labels=labels
+    )
+
+def run_http(sock: socket.socket, host: str, port: int) -> None:
+    """Serve streamable HTTP on an already bound socket until SIGTERM/SIGINT"""
+    if DRAIN_SIGNAL is not None:
+        signal.signal(DRAIN_SIGNAL, lambda signum, frame: draining.set())
+    # uvicorn re-raises SIGTERM once it has drained; exit normally so shutdown hooks run
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    server.run(
+        transport="http",
+        show_banner=False,
+        host=host,
+        port=port,
+        sockets=[sock],
+        path=http_settings.get("path", "/mcp"),
+        # Any worker may receive any request, so workers keep no session state
+        stateless_http=http_settings.get("stateless", True),
+        json_response=http_settings.get("json_response", True),
+        uvicorn_config={
+            # Requests in flight get this long to finish after SIGTERM
+            "timeout_graceful_shutdown": http_settings.get("drain_seconds", 10),
+            "log_config": None,
+            "access_log": False
+        }
+    )
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="FastMCP Basic Server")
+    parser.add_argument("--transport", choices=["stdio", "http"],
+                        default=server_settings.get("transport", "stdio"),
+                        help="stdio for one client, http to serve many (default: server.transport)")
+    parser.add_argument("--host", default=server_settings.get("host", "localhost"))
+    parser.add_argument("--port", type=int, default=server_settings.get("port", 8000))
+    parser.add_argument("--workers", type=int, default=http_settings.get("workers") or os.cpu_count() or 1,
+                        help="HTTP worker processes (default: server.http.workers or the CPU count)")
+    parser.add_argument("--no-admission", action="store_true",
+                        help="Turn off admission control, e.g. to benchmark raw handler capacity")
+    # Set by the supervisor when it starts a worker process
+    parser.add_argument("--worker-fd", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-index", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
 
 def main():
     """Main function to run the server."""
+    global worker_index
+    args = parse_args()
+    
+    if args.transport == "http" and args.worker_fd is None and args.workers > 1:
+        # Supervisor: bind once, then hand the socket to the worker processes
+        logger.info("Starting FastMCP Basic Server on http://%s:%d with %d workers...",
+                    args.host, args.port, args.workers)
+        supervisor = WorkerSupervisor(
+            lambda index, fd: [
+                sys.executable, os.path.abspath(__file__), "--transport", "http",
+                "--host", args.host, "--port", str(args.port),
+                "--worker-fd", str(fd), "--worker-index", str(index),
+                *(["--no-admission"] if args.no_admission else [])
+            ],
+            bind_socket(args.host, args.port),
+            args.workers,
+            drain_notice_seconds=http_settings.get("drain_notice_seconds", 1),
+            drain_seconds=http_settings.get("drain_seconds", 10),
+            # Workers send their records here, so only this process writes the log file
+            forward_logs=lambda sock: receive_forwarded(sock, log_listener)
+        )
+        sys.exit(supervisor.run())
+    
     logger.info("Starting FastMCP Basic Server...")
+    worker_index = args.worker_index
+    if args.no_admission:
+        admission.enabled = False
+    
+    # Reload config.json when it changes on disk or on SIGHUP
+    settings.start()
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: settings.request_reload())
+    
+    # Build the search index in the background, so the first search does not crawl the tree
+    if settings.current.is_enabled("tools", "file_search"):
+        file_search.index.refresh_if_stale(file_reader.allowed_roots.roots)
+    
+    # Periodically write metrics in Prometheus text format
+    prometheus_writer = create_prometheus_writer(worker_index)
+    if prometheus_writer is not None:
+        prometheus_writer.start()
     
     # Let FastMCP handle the event loop
-    server.run()
+    try:
+        if args.transport == "stdio":
+            server.run()
+        elif args.worker_fd is not None:
+            run_http(socket.socket(fileno=args.worker_fd), args.host, args.port)
+        else:
+            run_http(bind_socket(args.host, args.port), args.host, args.port)
+    finally:
+        if prometheus_writer is not None:
+            prometheus_writer.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,11 @@
+"""
+Shared pytest setup: run the example's modules from the source tree the
+same way server.py does.
+"""
+
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
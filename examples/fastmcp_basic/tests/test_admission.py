@@ -0,0 +1,119 @@
+"""Tests for utils/admission.py: request size, token buckets, queues and shedding"""
+
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, CostClass, Overloaded, exceeds_size
+from utils.metrics import payload_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def controller(clock=None, **limits):
+    heavy = {"max_concurrent": 1, "max_queue": 1, "rate_per_second": 1, "burst": 2, **limits}
+    return AdmissionController(
+        classes={"cheap": {}, "heavy": heavy},
+        tools={"count_words": "heavy"},
+        clock=clock or FakeClock()
+    )
+
+
+def test_exceeds_size_counts_every_list_element():
+    request = {"texts": ["a", "x" * 50_000]}
+    # The metrics estimate samples the first element only
+    assert payload_size(request) < 100
+    assert exceeds_size(request, 10_000)
+    assert not exceeds_size(request, 60_000)
+
+
+def test_exceeds_size_handles_nesting_and_scalars():
+    assert not exceeds_size({"a": [1, 2, 3]}, 100)
+    assert exceeds_size({"variables": {"b": list(range(1000))}}, 1000)
+    assert exceeds_size([[["y" * 20]]], 10)
+    assert not exceeds_size({}, 0)
+
+
+def test_exceeds_size_counts_tuples_and_keys():
+    assert exceeds_size(tuple(["x" * 10] * 11), 100)
+    assert exceeds_size({"k" * 101: None}, 100)
+    assert exceeds_size(["x"] * 1_000_000, 10)
+
+
+def test_cost_class_validates_limits():
+    with pytest.raises(ValueError):
+        CostClass.from_config("heavy", {"max_concurrent": 0})
+    with pytest.raises(ValueError):
+        AdmissionController(classes={"cheap": {}}, tools={"x": "missing"})
+
+
+def test_rate_limit_and_refill():
+    clock = FakeClock()
+    admission = controller(clock, max_concurrent=10)
+    for _ in range(2):
+        admission.release(admission.try_acquire("count_words", "c1"), 0.01)
+    with pytest.raises(Overloaded) as error:
+        admission.try_acquire("count_words", "c1")
+    assert error.value.retry_after_seconds == pytest.approx(1.0)
+    # Other clients have their own bucket
+    admission.release(admission.try_acquire("count_words", "c2"), 0.01)
+    clock.now += 1.0
+    admission.release(admission.try_acquire("count_words", "c1"), 0.01)
+
+
+def test_sync_calls_are_shed_without_using_a_token():
+    admission = controller(burst=2)
+    held = admission.try_acquire("count_words", "c1")
+    with pytest.raises(Overloaded, match="overloaded"):
+        admission.try_acquire("count_words", "c2")
+    admission.release(held, 0.01)
+    # c2's shed call did not spend its token: two more calls fit its burst
+    admission.release(admission.try_acquire("count_words", "c2"), 0.01)
+    admission.release(admission.try_acquire("count_words", "c2"), 0.01)
+    stats = admission.stats()["heavy"]
+    assert stats["shed"] == 1 and stats["rate_limited"] == 0
+
+
+def test_async_calls_queue_then_shed():
+    async def scenario():
+        admission = controller(burst=10)
+        first = await admission.acquire("count_words", "c1")
+        waiter = asyncio.ensure_future(admission.acquire("count_words", "c1"))
+        await asyncio.sleep(0)
+        assert admission.stats()["heavy"]["waiting"] == 1
+        with pytest.raises(Overloaded, match="overloaded"):
+            await admission.acquire("count_words", "c1")
+        admission.release(first, 0.5)
+        second = await asyncio.wait_for(waiter, 1)
+        admission.release(second, 0.5)
+        stats = admission.stats()["heavy"]
+        assert (stats["running"], stats["waiting"], stats["admitted"], stats["shed"]) == (0, 0, 2, 1)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_gives_its_slot_back():
+    async def scenario():
+        admission = controller(burst=10)
+        first = await admission.acquire("count_words", "c1")
+        waiter = asyncio.ensure_future(admission.acquire("count_words", "c1"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        admission.release(first, 0.1)
+        await asyncio.sleep(0)
+        assert admission.stats()["heavy"]["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cheap_tools_are_unaffected_by_heavy_load():
+    admission = controller()
+    admission.try_acquire("count_words", "c1")
+    admission.release(admission.try_acquire("add", "c1"), 0.001)
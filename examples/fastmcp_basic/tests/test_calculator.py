@@ -0,0 +1,55 @@
+"""Tests for the batch arithmetic tools of tools/calculator.py"""
+
+import pytest
+
+from tools.calculator import DIVISION_BY_ZERO, CalculatorTool
+
+
+@pytest.fixture
+def calculator():
+    return CalculatorTool()
+
+
+def test_batch_calculate_element_wise(calculator):
+    result = calculator.batch_calculate("multiply", [1, 2, 3], [4, 5, 6])
+    assert result["results"] == [4.0, 10.0, 18.0]
+    assert result["count"] == 3
+    assert result["error_count"] == 0
+
+
+def test_batch_calculate_broadcasts_scalars(calculator):
+    assert calculator.batch_calculate("subtract", [10, 20], 1)["results"] == [9.0, 19.0]
+    assert calculator.batch_calculate("add", 1, 2)["results"] == [3.0]
+
+
+def test_division_by_zero_only_masks_affected_elements(calculator):
+    result = calculator.batch_calculate("divide", [1, 2, 3], [1, 0, 2])
+    assert result["results"] == [1.0, None, 1.5]
+    assert result["error_mask"] == [False, True, False]
+    assert result["error_count"] == 1
+    assert result["error_message"] == DIVISION_BY_ZERO
+
+
+@pytest.mark.parametrize("operation, a, b, message", [
+    ("power", [1], [1], "Unknown operation"),
+    ("add", [1, 2], [1, 2, 3], "equal length"),
+    ("add", [[1, 2]], [1], "flat lists"),
+    ("add", ["x"], [1], "flat lists"),
+])
+def test_batch_calculate_rejects_bad_input(calculator, operation, a, b, message):
+    assert message in calculator.batch_calculate(operation, a, b)["error"]
+
+
+@pytest.mark.parametrize("operation, expected", [("sum", 10.0), ("mean", 2.5), ("min", 1.0), ("max", 4.0)])
+def test_reduce(calculator, operation, expected):
+    assert calculator.reduce(operation, [3, 1, 4, 2])["result"] == expected
+
+
+def test_reduce_rejects_empty_and_unknown(calculator):
+    assert "empty" in calculator.reduce("sum", [])["error"]
+    assert "available_reductions" in calculator.reduce("median", [1])
+
+
+def test_dot(calculator):
+    assert calculator.dot([1, 2, 3], [4, 5, 6])["result"] == 32.0
+    assert "equal length" in calculator.dot([1], [1, 2])["error"]
@@ -0,0 +1,161 @@
+"""Tests for tools/city_catalog.py and WeatherTool's catalog-backed lookups"""
+
+import asyncio
+import gzip
+
+import pytest
+
+from tools.city_catalog import CityCatalog, normalize
+from tools.weather import WeatherTool
+from tools.weather_providers import WeatherProvider
+
+ROWS = [
+    "# name\tcode\tcountry\tlat\tlon\tpopulation\taliases",
+    "Seoul\tKR\tSouth Korea\t37.566\t126.978\t9586195\t서울,Seoul City",
+    "Busan\tKR\tSouth Korea\t35.180\t129.076\t3349016\t부산,Pusan",
+    "Sydney\tAU\tAustralia\t-33.868\t151.209\t4627345\t",
+    "San Jose\tUS\tUnited States\t37.339\t-121.895\t1013240\t",
+    "San Jose\tCR\tCosta Rica\t9.928\t-84.091\t342188\t",
+    "Springfield\tAU\tAustralia\t-27.653\t152.917\t19000\t",
+    "Springfield\tUS\tUnited States\t39.801\t-89.644\t114394\t",
+    "",
+]
+
+
+def write_catalog(path, rows=ROWS):
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return CityCatalog(path)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return write_catalog(tmp_path / "cities.tsv")
+
+
+def resolved(catalog, query):
+    match = catalog.resolve(query)
+    return None if match is None else (match[0].name, match[0].country_code, match[1])
+
+
+def test_normalize_drops_case_accents_and_punctuation():
+    assert normalize("New York-City") == "newyorkcity"
+    assert normalize("São Paulo") == "saopaulo"
+
+
+def test_exact_names_and_aliases(catalog):
+    assert resolved(catalog, "seoul") == ("Seoul", "KR", "exact")
+    assert resolved(catalog, "Pusan") == ("Busan", "KR", "exact")
+    assert resolved(catalog, "서울") == ("Seoul", "KR", "exact")
+    assert resolved(catalog, "seoul city") == ("Seoul", "KR", "exact")
+
+
+def test_same_name_prefers_most_populous(catalog):
+    assert resolved(catalog, "San Jose") == ("San Jose", "US", "exact")
+    assert resolved(catalog, "Springfield") == ("Springfield", "US", "exact")
+
+
+def test_country_qualifier_limits_matches(catalog):
+    assert resolved(catalog, "San Jose, CR") == ("San Jose", "CR", "exact")
+    assert resolved(catalog, "Springfield, Australia") == ("Springfield", "AU", "exact")
+    assert resolved(catalog, "Spring, AU") == ("Springfield", "AU", "prefix")
+
+
+def test_prefix_and_typo_matches(catalog):
+    assert resolved(catalog, "Syd") == ("Sydney", "AU", "prefix")
+    assert resolved(catalog, "Sydeny") == ("Sydney", "AU", "fuzzy")
+    assert resolved(catalog, "Seuol") == ("Seoul", "KR", "fuzzy")
+    assert resolved(catalog, "Busn") == ("Busan", "KR", "fuzzy")
+
+
+def test_short_and_unknown_queries_do_not_match(catalog):
+    assert catalog.resolve("Se") is None
+    assert catalog.resolve("Xyzzy") is None
+    assert catalog.resolve(", ,") is None
+    assert catalog.stats()["lookups"]["not_found"] == 3
+
+
+def test_search_orders_by_population(catalog):
+    assert [(city.name, city.country_code) for city in catalog.search("s")] == [
+        ("Seoul", "KR"), ("Sydney", "AU"), ("San Jose", "US"),
+        ("San Jose", "CR"), ("Springfield", "US"), ("Springfield", "AU")
+    ]
+    assert [city.country_code for city in catalog.search("San", 1)] == ["US"]
+    assert [city.name for city in catalog.search("Sydeny")] == ["Sydney"]
+    assert catalog.search("Seoul", 0) == []
+
+
+def test_catalog_loads_lazily_and_reports_stats(catalog):
+    assert catalog.stats() == {"path": str(catalog.path), "loaded": False,
+                               "lookups": {"exact": 0, "prefix": 0, "fuzzy": 0, "not_found": 0}}
+    catalog.resolve("Seoul")
+    stats = catalog.stats()
+    assert stats["loaded"] is True
+    assert (stats["cities"], stats["countries"]) == (7, 4)
+    # Names plus distinct aliases: 서울, seoulcity, 부산, pusan
+    assert stats["keys"] == 11
+    assert stats["lookups"]["exact"] == 1
+    assert stats["memory_bytes"] > 0
+
+
+def test_gzipped_catalog(tmp_path):
+    path = tmp_path / "cities.tsv.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(ROWS) + "\n")
+    assert resolved(CityCatalog(path), "Busan") == ("Busan", "KR", "exact")
+
+
+def test_geonames_rows(tmp_path):
+    columns = ["2867714", "München", "Muenchen", "Monaco di Baviera", "48.13743", "11.57549",
+               "P", "PPLA", "DE", "", "02", "091", "09162", "09162000", "1260391", "", "524",
+               "Europe/Berlin", "2023-10-12"]
+    catalog = write_catalog(tmp_path / "cities1000.txt", ["\t".join(columns)])
+    city, matched_by = catalog.resolve("Muenchen")
+    assert (city.name, city.country, city.population, matched_by) == ("München", "DE", 1260391, "exact")
+    assert resolved(catalog, "munchen, DE") == ("München", "DE", "exact")
+
+
+def test_malformed_line_names_file_and_line(tmp_path):
+    catalog = write_catalog(tmp_path / "bad.tsv", [ROWS[1], "Nowhere\tXX\tNowhere"])
+    with pytest.raises(ValueError, match=r"bad\.tsv:2: expected 7"):
+        catalog.load()
+    assert catalog.loaded is False
+
+
+class CountingProvider(WeatherProvider):
+    name = "counting"
+
+    def __init__(self):
+        self.fetched = []
+
+    async def fetch(self, city_data):
+        self.fetched.append(city_data["city"])
+        await asyncio.sleep(0)
+        return {"temperature": "20°C"}
+
+
+def test_get_weather_reports_match_and_suggestions(catalog):
+    tool = WeatherTool(provider=CountingProvider(), catalog=catalog)
+    result = asyncio.run(tool.get_weather("Sydeny"))
+    assert (result["city"], result["country_code"], result["matched_by"]) == ("Sydney", "AU", "fuzzy")
+    missing = asyncio.run(tool.get_weather("Sanxx"))
+    assert missing["error"] == "City 'Sanxx' not found"
+    assert missing["suggestions"] == ["San Jose, US", "San Jose, CR"]
+
+
+def test_get_weather_many_fetches_each_city_once(catalog):
+    provider = CountingProvider()
+    tool = WeatherTool(provider=provider, catalog=catalog)
+    result = asyncio.run(tool.get_weather_many(["Seoul", "서울", "Pusan", "Nowhere"]))
+    assert (result["count"], result["distinct_cities"], result["failed"]) == (4, 2, 1)
+    assert sorted(provider.fetched) == ["Busan", "Seoul"]
+    first, second, third, fourth = result["results"]
+    assert first["city"] == second["city"] == "Seoul"
+    assert third["city"] == "Busan"
+    assert fourth["error"] == "City 'Nowhere' not found"
+
+
+def test_get_weather_many_rejects_oversized_batches(catalog):
+    tool = WeatherTool(provider=CountingProvider(), catalog=catalog, max_batch_cities=2)
+    result = asyncio.run(tool.get_weather_many(["Seoul", "Busan", "Sydney"]))
+    assert result == {"error": "At most 2 cities per call, got 3"}
+    assert catalog.loaded is False
@@ -0,0 +1,150 @@
+"""Tests for tools/content_cache.py: version keys, TinyLFU admission and coalesced misses"""
+
+import os
+import threading
+
+import pytest
+
+from tools.content_cache import ContentCache, FrequencySketch
+
+
+def write(path, size, fill=b"x"):
+    path.write_bytes(fill * size)
+    return path
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_repeat_reads_hit_memory(tmp_path):
+    path = write(tmp_path / "a.txt", 10)
+    cache = ContentCache(max_bytes=1000, max_entry_bytes=100)
+    assert cache.get(path)[1] == b"x" * 10
+    assert cache.get(path)[1] == b"x" * 10
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["bytes_read_from_disk"] == 10
+    assert stats["memory_bytes"] == 10
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_changed_file_is_reread(tmp_path):
+    path = write(tmp_path / "a.txt", 10)
+    cache = ContentCache(max_bytes=1000, max_entry_bytes=100)
+    cache.get(path)
+    write(path, 10, b"y")
+    bump_mtime(path)
+    assert cache.get(path)[1] == b"y" * 10
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 2, 1)
+    assert stats["memory_bytes"] == 10
+
+
+def test_large_files_bypass_the_cache(tmp_path):
+    path = write(tmp_path / "big.txt", 200)
+    cache = ContentCache(max_bytes=1000, max_entry_bytes=100)
+    stat, data = cache.get(path)
+    assert data is None and stat.st_size == 200
+    small = write(tmp_path / "small.txt", 50)
+    assert cache.get(small, max_size=10)[1] is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 0, 0)
+
+
+def test_entry_limit_never_exceeds_budget():
+    cache = ContentCache(max_bytes=100, max_entry_bytes=1000)
+    assert cache.max_entry_bytes == 100
+
+
+def test_cold_file_does_not_displace_hot_one(tmp_path):
+    hot = write(tmp_path / "hot.txt", 80)
+    cold = write(tmp_path / "cold.txt", 80)
+    cache = ContentCache(max_bytes=100, max_entry_bytes=100)
+    for _ in range(3):
+        cache.get(hot)
+    assert cache.get(cold)[1] == b"x" * 80
+    stats = cache.stats()
+    assert stats["rejected"] == 1 and stats["evictions"] == 0
+    cache.get(hot)
+    assert cache.stats()["hits"] == 3
+
+
+def test_more_popular_file_evicts_less_popular(tmp_path):
+    old = write(tmp_path / "old.txt", 80)
+    new = write(tmp_path / "new.txt", 80)
+    cache = ContentCache(max_bytes=100, max_entry_bytes=100)
+    cache.get(old)
+    # A tie keeps the incumbent; the second request wins admission
+    cache.get(new)
+    assert cache.stats()["rejected"] == 1
+    cache.get(new)
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 1
+    cache.get(new)
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_misses_share_one_read(tmp_path, monkeypatch):
+    path = write(tmp_path / "a.txt", 10)
+    cache = ContentCache(max_bytes=1000, max_entry_bytes=100)
+    started = threading.Event()
+    release = threading.Event()
+    reads = []
+    original = ContentCache._read
+
+    def slow_read(key, stat):
+        reads.append(key)
+        started.set()
+        release.wait(5)
+        return original(key, stat)
+
+    monkeypatch.setattr(ContentCache, "_read", staticmethod(slow_read))
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get(path)[1]))
+    owner.start()
+    assert started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(cache.get(path)[1]))
+    waiter.start()
+    while cache.stats()["coalesced"] == 0:
+        threading.Event().wait(0.001)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+    assert results == [b"x" * 10, b"x" * 10]
+    assert len(reads) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"]) == (1, 1)
+
+
+def test_failed_read_is_not_left_pending(tmp_path, monkeypatch):
+    path = write(tmp_path / "a.txt", 10)
+    cache = ContentCache(max_bytes=1000, max_entry_bytes=100)
+
+    def failing_read(key, stat):
+        raise PermissionError(key)
+
+    monkeypatch.setattr(ContentCache, "_read", staticmethod(failing_read))
+    with pytest.raises(PermissionError):
+        cache.get(path)
+    monkeypatch.undo()
+    assert cache.get(path)[1] == b"x" * 10
+
+
+def test_record_served_counts_bytes():
+    cache = ContentCache()
+    cache.record_served(5)
+    cache.record_served(7)
+    assert cache.stats()["bytes_served_from_memory"] == 12
+
+
+def test_sketch_counts_saturate_and_fade():
+    sketch = FrequencySketch(width=64)
+    for _ in range(20):
+        sketch.increment("a")
+    assert sketch.estimate("a") == 15
+    assert sketch.estimate("b") <= sketch.estimate("a")
+    for _ in range(sketch.sample_size):
+        sketch.increment("b")
+    assert sketch.estimate("a") < 15
@@ -0,0 +1,107 @@
+"""Tests for tools/encoding.py and the encoding handling of read_file/read_bytes"""
+
+import base64
+
+import pytest
+
+from tools.encoding import BINARY, detect_encoding, splits_on_newline_byte
+from tools.file_reader import FileReaderTool
+from utils.settings import Settings, SettingsStore
+
+
+@pytest.mark.parametrize("sample, expected", [
+    ("héllo\n".encode("utf-8"), ("utf-8", False)),
+    ("﻿hi".encode("utf-8"), ("utf-8-sig", False)),
+    ("hi".encode("utf-16"), ("utf-16", False)),
+    ("hi".encode("utf-32"), ("utf-32", False)),
+    ("안녕".encode("utf-8")[:-1], ("utf-8", False)),
+    ("안녕하세요".encode("cp949"), ("cp949", True)),
+    ("안녕하세요".encode("cp949")[:-1], ("cp949", True)),
+    ("café\n".encode("latin-1"), ("latin-1", True)),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", (BINARY, False)),
+    ((bytes(range(1, 8)) + b"\xff") * 10, (BINARY, False)),
+    (b"", ("utf-8", False)),
+])
+def test_detect_encoding(sample, expected):
+    assert detect_encoding(sample) == expected
+
+
+def test_detect_encoding_tries_fallbacks_in_order():
+    sample = "こんにちは\n".encode("shift_jis")
+    assert detect_encoding(sample, ("shift_jis", "latin-1")) == ("shift_jis", True)
+    assert detect_encoding(b"caf\xe9\n", ("utf-8", "cp949", "latin-1")) == ("latin-1", True)
+    assert detect_encoding(b"\xff\n", ("utf-8", "shift_jis")) == ("shift_jis", True)
+
+
+def test_splits_on_newline_byte():
+    assert splits_on_newline_byte("cp949")
+    assert splits_on_newline_byte("UTF8")
+    assert not splits_on_newline_byte("utf-16-le")
+    with pytest.raises(LookupError):
+        splits_on_newline_byte("no-such-codec")
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return FileReaderTool(allowed_dirs=[tmp_path])
+
+
+def test_read_file_flags_guessed_encodings(reader, tmp_path):
+    path = tmp_path / "korean.txt"
+    path.write_bytes("첫째 줄\n둘째 줄\n".encode("cp949"))
+    result = reader.read_file(str(path))
+    assert (result["encoding"], result["encoding_guessed"]) == ("cp949", True)
+    assert result["content"] == ["첫째 줄", "둘째 줄"]
+    result = reader.read_file(str(path), encoding="cp949")
+    assert (result["content"], result["encoding_guessed"]) == (["첫째 줄", "둘째 줄"], False)
+    (tmp_path / "plain.txt").write_text("plain\n", encoding="utf-8")
+    assert reader.read_file(str(tmp_path / "plain.txt"))["encoding_guessed"] is False
+
+
+def test_fallback_encodings_come_from_config(tmp_path):
+    path = tmp_path / "japanese.txt"
+    path.write_bytes("こんにちは\n".encode("shift_jis"))
+    settings = Settings.from_config({
+        "security": {"allowed_directories": [str(tmp_path)]},
+        "tools": {"file_reader": {"fallback_encodings": ["shift_jis", "latin-1"]}}
+    })
+    reader = FileReaderTool(allowed_dirs=[tmp_path], settings=SettingsStore(settings))
+    result = reader.read_file(str(path))
+    assert (result["encoding"], result["encoding_guessed"]) == ("shift_jis", True)
+    assert result["content"] == ["こんにちは"]
+    ranged = reader.read_bytes(str(path))
+    assert (ranged["detected_encoding"], ranged["encoding_guessed"]) == ("shift_jis", True)
+
+
+def test_read_file_refuses_binary_unless_lossy(reader, tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"ab\x00cd\nef\xff\n")
+    assert "looks binary" in reader.read_file(str(path))["error"]
+    assert reader.read_file(str(path), lossy=True)["content"] == ["ab\x00cd", "ef�"]
+
+
+def test_read_file_sends_utf16_to_read_bytes(reader, tmp_path):
+    path = tmp_path / "wide.txt"
+    path.write_bytes("hi\n".encode("utf-16"))
+    assert "read_bytes" in reader.read_file(str(path))["error"]
+    assert "read_bytes" in reader.read_file(str(path), encoding="utf-16")["error"]
+    assert "Unknown encoding" in reader.read_file(str(path), encoding="klingon")["error"]
+
+
+def test_invalid_bytes_report_their_offset(reader, tmp_path):
+    path = tmp_path / "broken.txt"
+    path.write_bytes(b"fine\nbad \xff here\n")
+    assert "at byte 9" in reader.read_file(str(path), encoding="utf-8")["error"]
+
+
+def test_read_bytes_returns_binary_ranges(reader, tmp_path):
+    path = tmp_path / "blob.bin"
+    data = bytes(range(256)) * 4
+    path.write_bytes(data)
+    first = reader.read_bytes(str(path), offset=0, length=600)
+    rest = reader.read_bytes(str(path), offset=first["next_offset"], length=600)
+    assert base64.b64decode(first["data"]) + base64.b64decode(rest["data"]) == data
+    assert (first["detected_encoding"], first["encoding_guessed"]) == (BINARY, False)
+    assert rest["has_more"] is False
+    assert reader.read_bytes(str(path), offset=5000)["length"] == 0
+    assert "must not be negative" in reader.read_bytes(str(path), offset=-1)["error"]
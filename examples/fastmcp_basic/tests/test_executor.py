@@ -0,0 +1,69 @@
+"""Tests for utils/executor.py: off-loop execution and per-category limits"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.executor import BlockingExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = BlockingExecutor(max_workers=4, category_limits={"file_io": 2, "logs": 1})
+    yield executor
+    executor.shutdown()
+
+
+def test_runs_blocking_calls_off_the_event_loop(executor):
+    async def scenario():
+        loop_thread = threading.get_ident()
+        worker_thread = await executor.run("file_io", threading.get_ident)
+        assert worker_thread != loop_thread
+        assert await executor.run("logs", sorted, [3, 1, 2], reverse=True) == [3, 2, 1]
+    asyncio.run(scenario())
+
+
+def test_category_limit_bounds_concurrency(executor):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    async def scenario():
+        await asyncio.gather(*(executor.run("file_io", work) for _ in range(6)))
+    asyncio.run(scenario())
+    assert max(peak) == 2
+    assert executor.stats()["active"] == {"file_io": 0, "logs": 0}
+
+
+def test_event_loop_stays_responsive(executor):
+    async def scenario():
+        blocked = executor.run("logs", time.sleep, 0.2)
+        task = asyncio.ensure_future(blocked)
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        assert time.perf_counter() - started < 0.15
+        await task
+    asyncio.run(scenario())
+
+
+def test_exceptions_propagate_and_release_the_slot(executor):
+    async def scenario():
+        with pytest.raises(ZeroDivisionError):
+            await executor.run("logs", lambda: 1 / 0)
+        assert await executor.run("logs", int, "5") == 5
+    asyncio.run(scenario())
+
+
+def test_unknown_category_is_rejected(executor):
+    with pytest.raises(KeyError):
+        asyncio.run(executor.run("gpu", int))
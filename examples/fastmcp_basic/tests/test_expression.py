@@ -0,0 +1,74 @@
+"""Tests for tools/expression.py and CalculatorTool.evaluate"""
+
+import math
+
+import pytest
+
+from tools.calculator import DIVISION_BY_ZERO, CalculatorTool
+from tools.expression import MAX_EXPRESSION_LENGTH, cache_stats, compile_expression
+
+
+@pytest.fixture
+def calculator():
+    return CalculatorTool()
+
+
+def test_compiled_expression_reports_its_variables():
+    compiled = compile_expression("(a + b) * 2 / sqrt(c)")
+    assert compiled.variables == {"a", "b", "c"}
+    assert compiled({"a": 1.0, "b": 3.0, "c": 4.0}) == 4.0
+
+
+def test_constant_subtrees_are_folded():
+    compiled = compile_expression("2 * pi + sqrt(16) - -1")
+    assert compiled.variables == frozenset()
+    assert compiled({}) == pytest.approx(2 * math.pi + 5)
+
+
+def test_compiled_expressions_are_cached_by_text():
+    before = cache_stats()
+    first = compile_expression("x * 41 + 1")
+    assert compile_expression("x * 41 + 1") is first
+    after = cache_stats()
+    assert after["hits"] == before["hits"] + 1
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('true')",
+    "x.real",
+    "[1, 2]",
+    "'text'",
+    "True + 1",
+    "sqrt",
+    "max(1, 2)",
+    "sqrt(1, 2)",
+    "lambda: 1",
+    "1 +",
+    "1" + "+1" * MAX_EXPRESSION_LENGTH,
+])
+def test_unsafe_or_invalid_expressions_are_rejected(calculator, expression):
+    result = calculator.evaluate(expression)
+    assert "error" in result
+    assert "result" not in result
+
+
+def test_evaluate_scalar(calculator):
+    assert calculator.evaluate("a ** 2 + b % 3", {"a": 3, "b": 7}) == {"expression": "a ** 2 + b % 3", "result": 10.0}
+
+
+def test_evaluate_reports_missing_variables(calculator):
+    result = calculator.evaluate("a + b", {"a": 1})
+    assert result["error"] == "Missing variables: b"
+    assert result["required_variables"] == ["a", "b"]
+
+
+def test_evaluate_division_by_zero(calculator):
+    assert calculator.evaluate("1 / x", {"x": 0})["error"] == DIVISION_BY_ZERO
+    assert "undefined" in calculator.evaluate("log(x)", {"x": -1})["error"]
+
+
+def test_evaluate_over_lists_masks_undefined_elements(calculator):
+    result = calculator.evaluate("1 / x + y", {"x": [1, 0, 4], "y": 1})
+    assert result["results"] == [2.0, None, 1.25]
+    assert result["error_mask"] == [False, True, False]
+    assert result["error_count"] == 1
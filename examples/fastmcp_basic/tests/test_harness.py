@@ -0,0 +1,51 @@
+"""Tests for the pure helpers of benchmarks/harness.py"""
+
+import argparse
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.harness import compare, format_size, is_error, parse_size, percentile, scenarios, text_of_size
+
+
+@pytest.mark.parametrize("text, size", [("1KB", 1024), ("10 mb", 10 * 1024 * 1024), ("512B", 512)])
+def test_parse_and_format_size(text, size):
+    assert parse_size(text) == size
+    assert parse_size(format_size(size)) == size
+
+
+def test_parse_size_rejects_unknown_units():
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_size("1GB")
+
+
+def test_text_of_size_is_exact():
+    assert len(text_of_size(100_000)) == 100_000
+
+
+def test_percentile_is_nearest_rank():
+    ordered = [float(i) for i in range(1, 101)]
+    assert (percentile(ordered, 50), percentile(ordered, 95), percentile(ordered, 100)) == (50.0, 95.0, 100.0)
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_is_error_reads_tool_results():
+    assert is_error(SimpleNamespace(data={"error": "boom"}))
+    assert not is_error(SimpleNamespace(data={"result": 1}))
+    assert is_error(SimpleNamespace(data=None, structured_content={"error": "x"}))
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    def row(p95, rps, scenario="add"):
+        return {"scenario": scenario, "transport": "memory", "concurrency": 1, "size": "-",
+                "p95_ms": p95, "throughput_rps": rps}
+    baseline = [row(1.0, 1000.0), row(1.0, 1000.0, "echo")]
+    assert compare([row(1.1, 950.0)], baseline, 0.2) == []
+    regressions = compare([row(1.5, 700.0), row(9.0, 1.0, "new")], baseline, 0.2)
+    assert len(regressions) == 2
+    assert all(message.startswith("add/memory/1/-") for message in regressions)
+
+
+def test_scenario_names_are_unique():
+    names = [scenario.name for scenario in scenarios()]
+    assert len(names) == len(set(names))
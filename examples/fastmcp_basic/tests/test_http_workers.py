@@ -0,0 +1,67 @@
+"""Tests for utils/http_workers.py: the shared socket, worker restarts and draining"""
+
+import os
+import sys
+import time
+
+import pytest
+
+from utils import http_workers
+from utils.http_workers import WorkerSupervisor, bind_socket
+from utils.log_setup import FORWARD_FD_ENV
+
+
+@pytest.fixture
+def sock():
+    sock = bind_socket("127.0.0.1", 0)
+    yield sock
+    sock.close()
+
+
+def python(code):
+    return lambda index, fd: [sys.executable, "-c", code]
+
+
+def test_bind_socket_is_listening_and_inheritable(sock):
+    assert sock.getsockname()[1] > 0
+    assert sock.get_inheritable()
+
+
+def test_crashed_worker_is_restarted(sock, monkeypatch):
+    monkeypatch.setattr(http_workers, "RESTART_DELAY_SECONDS", 0.0)
+    supervisor = WorkerSupervisor(python("raise SystemExit(3)"), sock, workers=1)
+    supervisor._check_workers()
+    supervisor._processes[0].wait()
+    # The first check notices the exit, the next one starts a new worker
+    supervisor._check_workers()
+    assert supervisor._processes[0] is None
+    supervisor._check_workers()
+    assert supervisor.restarts == 1
+    supervisor._processes[0].wait()
+
+
+def test_drain_stops_running_workers(sock):
+    supervisor = WorkerSupervisor(
+        python("import time; time.sleep(60)"), sock, workers=2,
+        drain_notice_seconds=0, drain_seconds=5
+    )
+    supervisor._check_workers()
+    started = time.monotonic()
+    supervisor._drain()
+    assert time.monotonic() - started < 5
+    assert all(process.poll() is not None for process in supervisor._processes)
+
+
+def test_workers_get_a_log_socket_to_the_supervisor(sock):
+    received = []
+    code = (
+        "import os, socket; "
+        f"s = socket.socket(fileno=int(os.environ['{FORWARD_FD_ENV}'])); "
+        "s.sendall(b'record'); s.close()"
+    )
+    supervisor = WorkerSupervisor(python(code), sock, workers=1, forward_logs=received.append)
+    supervisor._check_workers()
+    assert supervisor._processes[0].wait(5) == 0
+    with received[0] as ours:
+        assert ours.recv(16) == b"record"
+    assert FORWARD_FD_ENV not in os.environ
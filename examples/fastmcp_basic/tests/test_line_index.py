@@ -0,0 +1,178 @@
+"""Tests for tools/line_index.py: line skipping, sparse indexes and the index cache"""
+
+import mmap
+import os
+import tempfile
+import threading
+
+import pytest
+
+from tools.file_reader import FileReaderTool
+from tools.line_index import LineIndex, LineIndexCache, index_key, skip_lines
+
+
+@pytest.fixture
+def numbered(tmp_path):
+    path = tmp_path / "numbered.txt"
+    path.write_bytes(b"".join(b"line %d\n" % i for i in range(5000)))
+    return path
+
+
+def mapped(path):
+    with open(path, "rb") as f:
+        return os.fstat(f.fileno()), mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def line_at(mm, offset):
+    return mm[offset:mm.find(b"\n", offset)]
+
+
+def test_skip_lines(numbered):
+    _, mm = mapped(numbered)
+    with mm:
+        assert skip_lines(mm, 0, 0) == 0
+        assert line_at(mm, skip_lines(mm, 0, 1234)) == b"line 1234"
+        assert skip_lines(mm, 0, 5000) == len(mm)
+        assert skip_lines(mm, 0, 5001) is None
+
+
+def test_index_checkpoints_every_stride_lines(numbered):
+    stat, mm = mapped(numbered)
+    with mm:
+        index = LineIndex.build(index_key(stat), mm, stride=100)
+        assert index.line_count == 5000
+        assert len(index.offsets) == 50
+        offset, line = index.seek(1234)
+        assert line == 1200
+        assert line_at(mm, offset) == b"line 1200"
+        assert line_at(mm, skip_lines(mm, offset, 1234 - line)) == b"line 1234"
+
+
+def test_index_counts_last_line_without_newline(tmp_path):
+    path = tmp_path / "short.txt"
+    path.write_bytes(b"a\nb\nc")
+    stat, mm = mapped(path)
+    with mm:
+        assert LineIndex.build(index_key(stat), mm, stride=2).line_count == 3
+
+
+def test_cache_hits_and_rebuilds_changed_files(numbered):
+    cache = LineIndexCache(stride=100)
+    stat, mm = mapped(numbered)
+    with mm:
+        first = cache.get(stat, mm)
+        assert cache.get(stat, mm) is first
+    with open(numbered, "ab") as f:
+        f.write(b"line 5000\n")
+    stat, mm = mapped(numbered)
+    with mm:
+        assert cache.get(stat, mm).line_count == 5001
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["builds"]) == (1, 2, 2)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LineIndexCache(stride=10, max_memory_bytes=1)
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_bytes(b"x\n" * 100)
+        stat, mm = mapped(path)
+        with mm:
+            cache.get(stat, mm)
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_persisted_index_is_reused_after_restart(numbered, tmp_path):
+    cache_dir = tmp_path / "index"
+    stat, mm = mapped(numbered)
+    with mm:
+        built = LineIndexCache(stride=100, cache_dir=str(cache_dir)).get(stat, mm)
+        restarted = LineIndexCache(stride=100, cache_dir=str(cache_dir))
+        loaded = restarted.get(stat, mm)
+    assert list(loaded.offsets) == list(built.offsets)
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.stats()["builds"] == 0
+    assert len(list(cache_dir.glob("*.idx"))) == 1
+
+
+def test_unreadable_sidecar_is_rebuilt(numbered, tmp_path):
+    cache_dir = tmp_path / "index"
+    stat, mm = mapped(numbered)
+    with mm:
+        LineIndexCache(stride=100, cache_dir=str(cache_dir)).get(stat, mm)
+        for sidecar in cache_dir.glob("*.idx"):
+            sidecar.write_bytes(b"garbage")
+        restarted = LineIndexCache(stride=100, cache_dir=str(cache_dir))
+        assert restarted.get(stat, mm).line_count == 5000
+    assert restarted.stats()["builds"] == 1
+
+
+def test_read_file_persists_indexes_of_large_files(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"".join(b"row %07d\n" % i for i in range(200_000)))
+    cache_dir = tmp_path / "index"
+    reader = FileReaderTool(
+        line_index=LineIndexCache(cache_dir=str(cache_dir)),
+        allowed_dirs=[tmp_path]
+    )
+    result = reader.read_file(str(path), max_lines=2, start_line=150_000)
+    assert result["content"] == ["row 0150000", "row 0150001"]
+    assert result["total_lines"] == 200_000
+    assert len(list(cache_dir.glob("*.idx"))) == 1
+
+
+def test_truncated_sidecar_is_rebuilt(numbered, tmp_path):
+    cache_dir = tmp_path / "index"
+    stat, mm = mapped(numbered)
+    with mm:
+        LineIndexCache(stride=100, cache_dir=str(cache_dir)).get(stat, mm)
+        (sidecar,) = cache_dir.glob("*.idx")
+        sidecar.write_bytes(sidecar.read_bytes()[:-8])
+        restarted = LineIndexCache(stride=100, cache_dir=str(cache_dir))
+        index = restarted.get(stat, mm)
+    assert len(index.offsets) == 50
+    assert restarted.stats()["builds"] == 1
+
+
+def test_new_version_of_a_file_replaces_its_sidecar(numbered, tmp_path):
+    cache_dir = tmp_path / "index"
+    cache = LineIndexCache(stride=100, cache_dir=str(cache_dir))
+    for extra in range(3):
+        with open(numbered, "ab") as f:
+            f.write(b"more %d\n" % extra)
+        stat, mm = mapped(numbered)
+        with mm:
+            cache.get(stat, mm)
+    assert len(list(cache_dir.glob("*.idx"))) == 1
+    restarted = LineIndexCache(stride=100, cache_dir=str(cache_dir))
+    stat, mm = mapped(numbered)
+    with mm:
+        assert restarted.get(stat, mm).line_count == 5003
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_concurrent_writers_use_separate_temp_files(numbered, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "index"
+    stat, mm = mapped(numbered)
+    with mm:
+        index = LineIndex.build(index_key(stat), mm, stride=100)
+    temp_files = []
+    mkstemp = tempfile.mkstemp
+
+    def recording_mkstemp(**kwargs):
+        fd, name = mkstemp(**kwargs)
+        temp_files.append(name)
+        return fd, name
+
+    monkeypatch.setattr(tempfile, "mkstemp", recording_mkstemp)
+    caches = [LineIndexCache(stride=100, cache_dir=str(cache_dir)) for _ in range(4)]
+    threads = [threading.Thread(target=cache._save, args=(index,)) for cache in caches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(temp_files)) == 4
+    assert [path.suffix for path in cache_dir.iterdir()] == [".idx"]
+    assert list(LineIndexCache(stride=100, cache_dir=str(cache_dir))._load(index.key).offsets) == list(index.offsets)
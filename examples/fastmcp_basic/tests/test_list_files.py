@@ -0,0 +1,94 @@
+"""Tests for FileReaderTool.list_files paging, recursion and cursor checks"""
+
+import os
+
+import pytest
+
+from tools.file_reader import FileReaderTool
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    (root / "a" / "b").mkdir(parents=True)
+    for i in range(5):
+        (root / f"f{i}.txt").write_text("x" * i)
+    (root / "a" / "inner.py").write_text("print()")
+    (root / "a" / "b" / "deep.md").write_text("# deep")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "pw.txt").write_text("secret")
+    return root, outside
+
+
+def all_pages(reader, path, **kwargs):
+    entries, cursor = [], None
+    while True:
+        page = reader.list_files(str(path), cursor=cursor, **kwargs)
+        assert "error" not in page, page
+        entries += page["files"] + page["directories"]
+        if not page["has_more"]:
+            return entries
+        cursor = page["next_cursor"]
+
+
+def test_pages_cover_every_entry_once(tree):
+    root, _ = tree
+    reader = FileReaderTool(allowed_dirs=[root])
+    entries = all_pages(reader, root, page_size=2, recursive=True)
+    paths = sorted(entry["path"] for entry in entries)
+    assert paths == sorted([
+        "a", "a/b", "a/b/deep.md", "a/inner.py", *(f"f{i}.txt" for i in range(5))
+    ])
+
+
+def test_filters_keep_matching_files_only(tree):
+    root, _ = tree
+    reader = FileReaderTool(allowed_dirs=[root])
+    entries = all_pages(reader, root, page_size=1, recursive=True, extensions=[".py", ".md"])
+    assert sorted(entry["path"] for entry in entries) == ["a/b/deep.md", "a/inner.py"]
+
+
+def test_recursive_walk_does_not_follow_symlinks(tree):
+    root, outside = tree
+    os.symlink(outside, root / "link")
+    reader = FileReaderTool(allowed_dirs=[root])
+    entries = all_pages(reader, root, recursive=True)
+    assert not any(entry.get("path", "").startswith("link/") for entry in entries)
+
+
+@pytest.mark.parametrize("frames", [
+    [["", 0], ["link", 0]],
+    [["link", 0]],
+    [["", 0], ["../outside", 0]],
+    [["", 0], ["a/b", 0]],
+    [["", 0], ["missing", 0]],
+    [["", 0], ["a", True]],
+    [],
+])
+def test_forged_cursor_frames_are_rejected(tree, frames):
+    root, outside = tree
+    os.symlink(outside, root / "link")
+    reader = FileReaderTool(allowed_dirs=[root])
+    cursor = FileReaderTool._encode_cursor({"frames": frames})
+    result = reader.list_files(str(root), cursor=cursor, recursive=True)
+    assert result["error"] == "Invalid cursor"
+
+
+def test_cursor_frames_beyond_max_depth_are_rejected(tree):
+    root, _ = tree
+    reader = FileReaderTool(allowed_dirs=[root])
+    cursor = FileReaderTool._encode_cursor({"frames": [["", 0], ["a", 0], ["a/b", 0]]})
+    result = reader.list_files(str(root), cursor=cursor, recursive=True, max_depth=2)
+    assert result["error"] == "Invalid cursor"
+    result = reader.list_files(str(root), cursor=cursor, recursive=False)
+    assert result["error"] == "Invalid cursor"
+
+
+def test_valid_nested_cursor_resumes(tree):
+    root, _ = tree
+    reader = FileReaderTool(allowed_dirs=[root])
+    cursor = FileReaderTool._encode_cursor({"frames": [["", 0], ["a", 0], ["a/b", 0]]})
+    result = reader.list_files(str(root), cursor=cursor, recursive=True)
+    assert "error" not in result
+    assert "a/b/deep.md" in [entry["path"] for entry in result["files"]]
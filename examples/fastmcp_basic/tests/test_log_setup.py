@@ -0,0 +1,102 @@
+"""Tests for utils/log_setup.py: the queued pipeline, sampling and caller info"""
+
+import logging
+import os
+import queue
+import socket
+
+import pytest
+
+from utils import log_setup
+from utils.log_setup import (
+    FORWARD_FD_ENV, DeferredQueueHandler, SamplingFilter, receive_forwarded, setup_logging, shutdown_logging
+)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Run setup_logging against a temporary file and restore logging afterwards"""
+    root = logging.getLogger()
+    saved = (root.handlers[:], root.level, logging._srcfile, logging.logThreads,
+             logging.logProcesses, logging.logMultiprocessing)
+    listeners = []
+
+    def setup(**settings):
+        listener = setup_logging({"file": str(tmp_path / "test.log"), "console": False, **settings})
+        listeners.append(listener)
+        return listener
+
+    yield setup, tmp_path / "test.log"
+    for listener in listeners:
+        if listener._thread is not None:
+            shutdown_logging(listener)
+    (root.handlers[:], level, logging._srcfile, logging.logThreads,
+     logging.logProcesses, logging.logMultiprocessing) = saved
+    root.setLevel(level)
+
+
+def make_record(name, level):
+    return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+
+def test_records_are_written_by_the_listener(pipeline):
+    setup, path = pipeline
+    listener = setup(format="%(levelname)s %(name)s %(message)s")
+    logging.getLogger("tests.pipeline").warning("hello %s", "world")
+    shutdown_logging(listener)
+    assert path.read_text(encoding="utf-8").splitlines()[-1] == "WARNING tests.pipeline hello world"
+
+
+def test_caller_info_is_only_disabled_when_the_format_does_not_use_it(pipeline):
+    setup, path = pipeline
+    listener = setup(format="%(asctime)s %(message)s")
+    assert logging._srcfile is None
+    shutdown_logging(listener)
+    assert "Caller info (funcName, lineno, pathname) is not collected" in path.read_text(encoding="utf-8")
+
+    listener = setup(format="%(funcName)s:%(lineno)d %(message)s")
+    assert logging._srcfile == log_setup._SRCFILE
+    logging.getLogger("tests.caller").warning("where")
+    shutdown_logging(listener)
+    assert path.read_text(encoding="utf-8").splitlines()[-1].startswith(
+        "test_caller_info_is_only_disabled_when_the_format_does_not_use_it:"
+    )
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DeferredQueueHandler(queue.Queue(1))
+    handler.handle(make_record("a", logging.INFO))
+    handler.handle(make_record("a", logging.INFO))
+    assert handler.dropped == 1
+
+
+def test_sampling_keeps_one_in_n_below_warning():
+    sampler = SamplingFilter({"tools.calculator": 0.25, "noisy": 0})
+    kept = [sampler.filter(make_record("tools.calculator.batch", logging.INFO)) for _ in range(8)]
+    assert kept.count(True) == 2
+    assert not sampler.filter(make_record("noisy", logging.DEBUG))
+    assert sampler.filter(make_record("noisy", logging.WARNING))
+    assert sampler.filter(make_record("other", logging.DEBUG))
+
+
+def test_worker_records_are_written_by_the_supervisor(pipeline, monkeypatch, tmp_path):
+    setup, path = pipeline
+    supervisor = setup(format="%(levelname)s %(name)s %(message)s")
+    ours, theirs = socket.socketpair()
+    receiver = receive_forwarded(ours, supervisor)
+
+    monkeypatch.setenv(FORWARD_FD_ENV, str(theirs.detach()))
+    worker = setup_logging({"file": str(tmp_path / "worker.log"), "console": True})
+    assert FORWARD_FD_ENV not in os.environ
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("worker.test").exception("failed %s", "once")
+    shutdown_logging(worker)
+    receiver.join(5)
+    shutdown_logging(supervisor)
+
+    assert not (tmp_path / "worker.log").exists()
+    text = path.read_text(encoding="utf-8")
+    assert "ERROR worker.test failed once" in text
+    assert "RuntimeError: boom" in text
@@ -0,0 +1,179 @@
+"""Tests for resources/logs.py and resources/log_index.py: tailing, level and time filters"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from resources import log_index as log_index_module
+from resources.log_index import DEFAULT_RECORD, LEVEL_CODES, LogIndex, parse_log_line, record_pattern
+from resources import logs as logs_module
+from resources.logs import LogsResource
+from utils.settings import SettingsStore
+
+START = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def record(minute, level, message, name="server"):
+    stamp = (START + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S")
+    return f"{stamp},123 - {name} - {level} - {message}\n"
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "server.log"
+    path.write_text(
+        record(0, "INFO", "started")
+        + record(1, "ERROR", "disk full")
+        + "Traceback (most recent call last):\n"
+        + record(2, "INFO", "message mentions ERROR")
+        + record(3, "WARNING", "slow call")
+        + record(4, "ERROR", "timeout"),
+        encoding="utf-8"
+    )
+    return path
+
+
+def messages(result):
+    return [entry["message"].rsplit(" - ", 1)[-1] for entry in result["logs"]]
+
+
+def test_parse_log_line_reads_the_levelname_field():
+    stamp, epoch, code = parse_log_line(record(0, "INFO", "ERROR in message").encode())
+    assert stamp == "2024-05-01 12:00:00,123"
+    assert epoch == pytest.approx(START.timestamp() + 0.123)
+    assert code == 2
+    assert parse_log_line(b"Traceback (most recent call last):") == (None, None, 0)
+
+
+def test_record_pattern_follows_the_configured_format():
+    pattern = record_pattern("[%(levelname)-8s] %(asctime)s %(name)s: %(message)s")
+    assert pattern is not DEFAULT_RECORD
+    _, _, code = parse_log_line(b"[WARNING ] 2024-05-01 12:00:00,500 app: hi", pattern)
+    assert code == 3
+    # The default pattern does not understand this layout
+    assert parse_log_line(b"[WARNING ] 2024-05-01 12:00:00,500 app: hi") == (None, None, 0)
+
+
+@pytest.mark.parametrize("log_format", ["%(message)s", "%(asctime)s %(message)s", "%(levelname)s: %(message)s"])
+def test_record_pattern_rejects_formats_it_cannot_index(log_format):
+    with pytest.raises(ValueError, match="cannot be indexed"):
+        record_pattern(log_format)
+
+
+def test_logs_resource_rejects_unparseable_format(log_file):
+    with pytest.raises(ValueError):
+        LogsResource(log_file, SettingsStore(), log_format="%(message)s")
+
+
+def test_tail_returns_last_lines(log_file):
+    result = LogsResource(log_file, SettingsStore()).get_logs(max_lines=2)
+    assert messages(result) == ["slow call", "timeout"]
+    assert result["total_lines"] == 6
+
+
+def test_level_filter_ignores_level_names_in_messages(log_file):
+    result = LogsResource(log_file, SettingsStore()).get_logs(level="error")
+    assert messages(result) == ["disk full", "timeout"]
+    assert result["matched_lines"] == 2
+
+
+def test_time_range_filters(log_file):
+    logs = LogsResource(log_file, SettingsStore())
+    since = (START + timedelta(minutes=2)).isoformat()
+    until = (START + timedelta(minutes=3, seconds=30)).isoformat()
+    result = logs.get_logs(since=since, until=until)
+    assert messages(result) == ["message mentions ERROR", "slow call"]
+    assert logs.get_logs(level="error", since=since)["matched_lines"] == 1
+
+
+def test_invalid_filters_return_errors(log_file):
+    logs = LogsResource(log_file, SettingsStore())
+    assert "available_levels" in logs.get_logs(level="loud")
+    assert "Invalid time" in logs.get_logs(since="yesterday")["error"]
+
+
+def test_custom_format_is_used_for_filters(tmp_path):
+    path = tmp_path / "custom.log"
+    path.write_text(
+        "INFO|2024-05-01 12:00:00,000|ok\nERROR|2024-05-01 12:01:00,000|bad\n",
+        encoding="utf-8"
+    )
+    logs = LogsResource(path, SettingsStore(), log_format="%(levelname)s|%(asctime)s|%(message)s")
+    result = logs.get_logs(level="error")
+    assert [entry["level"] for entry in result["logs"]] == ["ERROR"]
+    assert result["logs"][0]["timestamp"] == "2024-05-01 12:01:00,000"
+
+
+def test_index_refresh_is_incremental(log_file):
+    index = LogIndex()
+    with open(log_file, "rb") as f:
+        assert index.refresh(f, os.fstat(f.fileno())) == 6
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(record(5, "CRITICAL", "down"))
+    with open(log_file, "rb") as f:
+        assert index.refresh(f, os.fstat(f.fileno())) == 1
+    assert index.stats()["lines_per_level"]["CRITICAL"] == 1
+
+
+def test_query_collects_recent_matches_across_scan_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_index_module, "_SCAN_LINES", 7)
+    levels = ["INFO", "ERROR", "INFO", "DEBUG", "WARNING", "ERROR", "INFO", "INFO", "CRITICAL"] * 5
+    path = tmp_path / "server.log"
+    path.write_text("".join(record(i, level, str(i)) for i, level in enumerate(levels)), encoding="utf-8")
+    index = LogIndex()
+    with open(path, "rb") as f:
+        index.refresh(f, os.fstat(f.fileno()))
+    errors = [i for i, level in enumerate(levels) if level in ("ERROR", "CRITICAL")]
+    codes = [LEVEL_CODES["ERROR"], LEVEL_CODES["CRITICAL"]]
+    assert index.query(codes, max_lines=4) == (errors[-4:], len(errors))
+    assert index.query(codes, max_lines=100) == (errors, len(errors))
+    since = (START + timedelta(minutes=10)).timestamp()
+    until = (START + timedelta(minutes=30, seconds=1)).timestamp()
+    in_range = [i for i in errors if 10 <= i <= 30]
+    assert index.query(codes, since, until, max_lines=3) == (in_range[-3:], len(in_range))
+    assert index.query([LEVEL_CODES["DEBUG"]], until=until, max_lines=0) == ([], 4)
+
+
+def test_line_span_waits_for_the_index_lock(log_file):
+    index = LogIndex()
+    with open(log_file, "rb") as f:
+        index.refresh(f, os.fstat(f.fileno()))
+    spans = []
+    with index._lock:
+        reader = threading.Thread(target=lambda: spans.append(index.line_span(0)))
+        reader.start()
+        reader.join(0.1)
+        assert spans == []
+    reader.join()
+    assert spans == [(0, len(record(0, "INFO", "started")) - 1)]
+
+
+def test_tail_joins_lines_split_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(logs_module, "TAIL_BLOCK_SIZE", 16)
+    path = tmp_path / "server.log"
+    lines = [record(i % 60, "INFO", "m" * (i % 23)) for i in range(40)]
+    path.write_text("".join(lines) + "\n\n", encoding="utf-8")
+    result = LogsResource(path, SettingsStore()).get_logs(max_lines=25)
+    assert [entry["message"] for entry in result["logs"]] == [line.strip() for line in lines[-25:]]
+
+
+def test_line_count_follows_appends_and_rotation(log_file):
+    logs = LogsResource(log_file, SettingsStore())
+    assert logs.get_logs(max_lines=1)["total_lines"] == 6
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(record(5, "INFO", "appended"))
+    assert logs.get_logs(max_lines=1)["total_lines"] == 7
+
+    rotated = log_file.with_name("server.log.new")
+    rotated.write_text(record(6, "INFO", "fresh"), encoding="utf-8")
+    os.replace(rotated, log_file)
+    result = logs.get_logs(max_lines=5)
+    assert result["total_lines"] == 1
+    assert messages(result) == ["fresh"]
+
+
+def test_missing_log_file(tmp_path):
+    result = LogsResource(tmp_path / "absent.log", SettingsStore()).get_logs()
+    assert result["logs"] == []
@@ -0,0 +1,76 @@
+"""Tests for tools/metadata_cache.py: stat TTL, listing revalidation and LRU bounds"""
+
+import os
+
+import pytest
+
+from tools.metadata_cache import MetadataCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_stat_is_reused_within_ttl(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("one", encoding="utf-8")
+    clock = FakeClock()
+    cache = MetadataCache(stat_ttl_seconds=1.0, clock=clock)
+    assert cache.stat(path).st_size == 3
+    path.write_text("three", encoding="utf-8")
+    assert cache.stat(path).st_size == 3
+    clock.now = 1.0
+    assert cache.stat(path).st_size == 5
+    stats = cache.stats()
+    assert (stats["stat_hits"], stats["stat_misses"]) == (1, 2)
+
+
+def test_missing_files_are_not_cached(tmp_path):
+    cache = MetadataCache()
+    with pytest.raises(FileNotFoundError):
+        cache.stat(tmp_path / "later.txt")
+    (tmp_path / "later.txt").write_text("x", encoding="utf-8")
+    assert cache.stat(tmp_path / "later.txt").st_size == 1
+
+
+def test_listing_is_revalidated_by_directory_mtime(tmp_path):
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    clock = FakeClock()
+    cache = MetadataCache(stat_ttl_seconds=0, clock=clock)
+    assert sorted(cache.listing(tmp_path)) == [("a.txt", "file", False), ("sub", "directory", False)]
+    assert cache.listing(tmp_path) is cache.listing(tmp_path)
+
+    (tmp_path / "b.txt").write_text("b", encoding="utf-8")
+    bump_mtime(tmp_path)
+    assert ("b.txt", "file", False) in cache.listing(tmp_path)
+    stats = cache.stats()
+    assert (stats["listing_hits"], stats["listing_misses"]) == (2, 2)
+    assert stats["saved_entry_reads"] == 4
+
+
+def test_listing_reports_symlinks(tmp_path):
+    (tmp_path / "target").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "target")
+    entries = dict((name, (kind, link)) for name, kind, link in MetadataCache().listing(tmp_path))
+    assert entries["link"] == ("directory", True)
+
+
+def test_lru_bounds(tmp_path):
+    cache = MetadataCache(max_stats=2, max_listings=1)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        cache.listing(tmp_path / name)
+    stats = cache.stats()
+    assert stats["stat_entries"] == 2
+    assert stats["listing_entries"] == 1
+    assert stats["evictions"] == 3
@@ -0,0 +1,105 @@
+"""Tests for utils/metrics.py and resources/metrics.py"""
+
+import json
+import threading
+
+import pytest
+
+from resources.metrics import MetricsResource
+from utils.metrics import (
+    BUCKET_COUNT, PrometheusFileWriter, RequestMetrics, bucket_index, bucket_upper_bound, payload_size
+)
+
+KEY = ("tool", "read_file")
+
+
+@pytest.mark.parametrize("value_us", [0, 1, 15, 16, 17, 100, 1023, 1024, 99_999, 10 ** 9])
+def test_bucket_bounds_contain_their_values(value_us):
+    index = bucket_index(value_us)
+    assert value_us < bucket_upper_bound(index)
+    assert index == 0 or bucket_upper_bound(index - 1) <= value_us
+
+
+def test_bucket_relative_error_is_bounded():
+    for value_us in range(16, 200_000, 997):
+        assert bucket_upper_bound(bucket_index(value_us)) <= value_us * 1.125 + 1
+
+
+def test_huge_latencies_land_in_the_last_bucket():
+    assert bucket_index(1 << 45) == BUCKET_COUNT - 1
+
+
+def test_payload_size_estimates():
+    assert payload_size("abc") == 3
+    assert payload_size({"a": "xyz", "bb": 1}) == 1 + 3 + 2 + 8
+    assert payload_size(["ab"] * 100) == 200
+    assert payload_size([]) == 0
+
+
+def test_snapshot_counts_errors_and_percentiles():
+    metrics = RequestMetrics()
+    for elapsed_us in range(1, 101):
+        metrics.record(KEY, elapsed_us * 1000, error=elapsed_us % 10 == 0)
+    series = metrics.snapshot()["tools"]["read_file"]
+    assert (series["calls"], series["errors"], series["error_rate"]) == (100, 10, 0.1)
+    assert 0.050 <= series["latency_ms"]["p50"] <= 0.050 * 1.125
+    assert series["latency_ms"]["max"] == 0.1
+    assert series["latency_ms"]["p99"] <= 0.1
+
+
+def test_shards_from_several_threads_are_merged():
+    metrics = RequestMetrics()
+
+    def worker():
+        for _ in range(1000):
+            metrics.record(KEY, 5000, error=False)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()["tools"]["read_file"]["calls"] == 4000
+
+
+def test_size_samples_are_scaled_to_all_calls():
+    metrics = RequestMetrics()
+    for _ in range(32):
+        metrics.record(KEY, 1000, error=False)
+    metrics.record_sizes(KEY, 100, 1000, saved_bytes=50)
+    metrics.record_sizes(KEY, 300, 3000, saved_bytes=150)
+    series = metrics.snapshot()["tools"]["read_file"]
+    assert (series["avg_request_bytes"], series["estimated_response_bytes"]) == (200, 2000 * 32)
+    assert series["estimated_bytes_saved"] == 100 * 32
+
+
+def test_prometheus_histogram_is_cumulative():
+    metrics = RequestMetrics()
+    # 20 ms and 3 s
+    metrics.record(KEY, 20_000_000, error=False)
+    metrics.record(KEY, 3_000_000_000, error=True)
+    text = metrics.prometheus(labels={"worker": "0"})
+    assert 'mcp_requests_total{worker="0",kind="tool",name="read_file"} 2' in text
+    assert 'mcp_request_errors_total{worker="0",kind="tool",name="read_file"} 1' in text
+    buckets = [line for line in text.splitlines() if line.startswith("mcp_request_duration_seconds_bucket")]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert 'le="0.032768"} 1' in text
+    assert buckets[-1].endswith('le="+Inf"} 2')
+
+
+def test_prometheus_file_is_written_atomically(tmp_path):
+    metrics = RequestMetrics()
+    metrics.record(KEY, 1000, error=False)
+    path = tmp_path / "metrics" / "server.prom"
+    PrometheusFileWriter(metrics, path).write()
+    assert "mcp_requests_total" in path.read_text(encoding="utf-8")
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_metrics_resource_serves_the_snapshot():
+    metrics = RequestMetrics()
+    metrics.record(("resource", "logs://server/{log_type}"), 1000, error=False)
+    document = json.loads(MetricsResource(metrics).get_metrics())
+    assert document["resources"]["logs://server/{log_type}"]["calls"] == 1
+    assert "admission" not in document
@@ -0,0 +1,61 @@
+"""Tests for tools/path_guard.py: allowed-root matching, symlinks and updates"""
+
+from tools.path_guard import AllowedRoots
+
+
+def test_paths_inside_roots_are_allowed(tmp_path):
+    (tmp_path / "docs").mkdir()
+    roots = AllowedRoots([tmp_path / "docs", tmp_path / "data"])
+    assert roots.is_allowed(tmp_path / "docs")
+    assert roots.is_allowed(tmp_path / "docs" / "a" / "b.txt")
+    assert roots.is_allowed(tmp_path / "data" / "missing.csv")
+    assert not roots.is_allowed(tmp_path)
+    assert not roots.is_allowed(tmp_path / "other.txt")
+
+
+def test_component_prefixes_do_not_match(tmp_path):
+    roots = AllowedRoots([tmp_path / "docs"])
+    assert not roots.is_allowed(tmp_path / "docs-private" / "secret.txt")
+
+
+def test_dot_dot_and_symlinks_are_resolved(tmp_path):
+    allowed = tmp_path / "allowed"
+    allowed.mkdir()
+    (tmp_path / "secret.txt").write_text("s", encoding="utf-8")
+    (allowed / "escape").symlink_to(tmp_path / "secret.txt")
+    roots = AllowedRoots([allowed])
+    assert not roots.is_allowed(f"{allowed}/../secret.txt")
+    assert not roots.is_allowed(allowed / "escape")
+
+
+def test_retargeted_symlink_is_rechecked(tmp_path):
+    allowed = tmp_path / "allowed"
+    allowed.mkdir()
+    (allowed / "inside.txt").write_text("i", encoding="utf-8")
+    (tmp_path / "outside.txt").write_text("o", encoding="utf-8")
+    link = allowed / "link"
+    link.symlink_to(allowed / "inside.txt")
+    roots = AllowedRoots([allowed])
+    assert roots.is_allowed(link)
+    link.unlink()
+    link.symlink_to(tmp_path / "outside.txt")
+    assert not roots.is_allowed(link)
+
+
+def test_root_directory_allows_everything(tmp_path):
+    assert AllowedRoots(["/"]).is_allowed(tmp_path / "anything")
+
+
+def test_update_replaces_roots_and_drops_decisions(tmp_path):
+    roots = AllowedRoots([tmp_path / "a"])
+    assert roots.is_allowed(tmp_path / "a" / "x")
+    roots.update([tmp_path / "b"])
+    assert not roots.is_allowed(tmp_path / "a" / "x")
+    assert roots.is_allowed(tmp_path / "b" / "x")
+
+
+def test_decision_cache_is_bounded(tmp_path):
+    roots = AllowedRoots([tmp_path], cache_size=3)
+    for index in range(10):
+        roots.is_allowed(tmp_path / f"{index}.txt")
+    assert len(roots._decisions) == 3
@@ -0,0 +1,124 @@
+"""Tests for FileReaderTool.read_file and read_bytes in tools/file_reader.py"""
+
+import base64
+import os
+
+import pytest
+
+from tools.file_reader import FileReaderTool
+from utils.settings import Settings, SettingsStore
+
+
+def reader_for(root, **file_reader):
+    settings = Settings.from_config({
+        "security": {"allowed_directories": [str(root)], "max_lines_per_file": 1000},
+        "tools": {"file_reader": file_reader}
+    })
+    return FileReaderTool(allowed_dirs=[root], settings=SettingsStore(settings))
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    # Larger than the content cache's per-entry limit and a few read windows
+    path = tmp_path / "large.log"
+    path.write_bytes(b"".join(b"entry %06d\n" % i for i in range(600_000)))
+    return path
+
+
+@pytest.fixture
+def numbered(tmp_path):
+    path = tmp_path / "numbered.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(25)), encoding="utf-8")
+    return path
+
+
+def test_start_line_window(numbered, tmp_path):
+    result = reader_for(tmp_path).read_file(str(numbered), max_lines=3, start_line=10)
+    assert result["content"] == ["line 10", "line 11", "line 12"]
+    assert result["start_line"] == 10
+    assert result["has_more"]
+
+
+def test_byte_offset_aligns_to_the_next_line(numbered, tmp_path):
+    # Offset 2 falls inside "line 0"
+    result = reader_for(tmp_path).read_file(str(numbered), max_lines=1, byte_offset=2)
+    assert result["content"] == ["line 1"]
+    assert result["start_line"] is None
+
+
+def test_cursors_walk_the_whole_file(numbered, tmp_path):
+    reader = reader_for(tmp_path)
+    lines, cursor = [], None
+    while True:
+        result = reader.read_file(str(numbered), max_lines=7, cursor=cursor)
+        assert result["start_line"] == len(lines)
+        lines += result["content"]
+        cursor = result["next_cursor"]
+        if not result["has_more"]:
+            break
+    assert lines == [f"line {i}" for i in range(25)]
+    assert cursor is None
+
+
+def test_cursor_of_a_replaced_file_is_stale(numbered, tmp_path):
+    reader = reader_for(tmp_path)
+    cursor = reader.read_file(str(numbered), max_lines=5)["next_cursor"]
+    replacement = tmp_path / "replacement.txt"
+    replacement.write_text("other\n" * 25, encoding="utf-8")
+    os.replace(replacement, numbered)
+    assert "stale" in reader.read_file(str(numbered), cursor=cursor)["error"]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "W10=", "eyJvIjotMX0="])
+def test_invalid_cursor(numbered, tmp_path, cursor):
+    # W10= is "[]" and eyJvIjotMX0= is {"o":-1}
+    assert reader_for(tmp_path).read_file(str(numbered), cursor=cursor)["error"] == "Invalid cursor"
+
+
+def test_negative_positions_and_disallowed_paths(numbered, tmp_path):
+    reader = reader_for(tmp_path)
+    assert "must not be negative" in reader.read_file(str(numbered), start_line=-1)["error"]
+    assert "not allowed" in reader.read_file("/etc/hostname")["error"]
+
+
+def test_max_lines_is_capped_by_max_lines_per_file(tmp_path):
+    path = tmp_path / "many.txt"
+    path.write_text("x\n" * 2000, encoding="utf-8")
+    assert reader_for(tmp_path).read_file(str(path), max_lines=5000)["lines_read"] == 1000
+
+
+def test_files_of_any_size_can_be_paged(large_file, tmp_path):
+    reader = reader_for(tmp_path)
+    result = reader.read_file(str(large_file), max_lines=3, start_line=599_997)
+    assert result["content"] == ["entry 599997", "entry 599998", "entry 599999"]
+    assert result["has_more"] is False
+
+
+def test_read_file_returns_at_most_max_read_kb(tmp_path):
+    path = tmp_path / "wide.txt"
+    path.write_bytes(b"".join(b"%04d " % i + b"x" * 94 + b"\n" for i in range(50)))
+    reader = reader_for(tmp_path, max_read_kb=1)
+    result = reader.read_file(str(path), max_lines=50)
+    # 100-byte lines: ten fit into 1 KB, and the cut falls on a line boundary
+    assert result["lines_read"] == 10
+    assert result["end_offset"] == 1000
+    assert result["has_more"]
+
+    rest = reader.read_file(str(path), max_lines=50, cursor=result["next_cursor"])
+    assert rest["start_line"] == 10
+    assert rest["content"][0].startswith("0010 ")
+
+
+def test_line_longer_than_read_limit_points_to_read_bytes(tmp_path):
+    path = tmp_path / "one_line.txt"
+    path.write_bytes(b"y" * 5000 + b"\n")
+    result = reader_for(tmp_path, max_read_kb=1).read_file(str(path))
+    assert "use read_bytes" in result["error"]
+
+
+def test_read_bytes_reads_ranges_of_large_files(large_file, tmp_path):
+    reader = reader_for(tmp_path, max_read_kb=4)
+    result = reader.read_bytes(str(large_file), offset=13 * 500_000, length=1_000_000)
+    assert result["length"] == 4096
+    assert base64.b64decode(result["data"]).startswith(b"entry 500000\n")
+    assert result["next_offset"] == 13 * 500_000 + 4096
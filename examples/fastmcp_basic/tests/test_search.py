@@ -0,0 +1,146 @@
+"""Tests for tools/search_index.py and tools/file_search.py"""
+
+import os
+import threading
+
+import pytest
+
+from tools import search_index
+from tools.file_search import FileSearchTool
+from tools.path_guard import AllowedRoots
+from tools.search_index import SearchIndex, build_match
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "docs"
+    (root / "guide").mkdir(parents=True)
+    (root / "guide" / "paging.md").write_text("Cursor based paging for large files.\n", encoding="utf-8")
+    (root / "notes.txt").write_text("The line index makes seeking cheap.\n", encoding="utf-8")
+    (root / "image.txt").write_bytes(b"\0binary cursor\0")
+    (root / "skipped.bin").write_text("cursor", encoding="utf-8")
+    (root / ".hidden").mkdir()
+    (root / ".hidden" / "secret.md").write_text("cursor secret", encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / "index" / "index.sqlite3"), workers=1, refresh_interval_seconds=3600)
+    yield index
+    index.close()
+
+
+def paths(results, root):
+    return sorted(os.path.relpath(result["path"], root) for result in results)
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("cursor paging", '"cursor" "paging"'),
+    ('"line index" seek*', '"line index" "seek" *'),
+    ("NEAR(a b) OR c", '"NEAR a" "b" "OR" "c"'),
+])
+def test_build_match_quotes_every_term(query, expected):
+    assert build_match(query) == expected
+
+
+def test_build_match_rejects_queries_without_words():
+    with pytest.raises(ValueError):
+        build_match('"" * -')
+
+
+def test_search_ranks_text_files_only(index, corpus):
+    index.refresh([str(corpus)])
+    assert paths(index.search("cursor"), corpus) == ["guide/paging.md"]
+    assert paths(index.search('"line index"'), corpus) == ["notes.txt"]
+    assert paths(index.search("seek*"), corpus) == ["notes.txt"]
+    assert "[Cursor]" in index.search("cursor")[0]["snippet"]
+
+
+def test_search_restricted_to_a_directory(index, corpus):
+    index.refresh([str(corpus)])
+    assert index.search("cursor", str(corpus / "guide")) != []
+    assert index.search("cursor", str(corpus / "gui")) == []
+
+
+def test_refresh_only_rereads_changed_files(index, corpus):
+    first = index.refresh([str(corpus)])
+    assert first["updated_files"] == 3
+    assert index.refresh([str(corpus)])["updated_files"] == 0
+
+    notes = corpus / "notes.txt"
+    notes.write_text("Now about tokenizers.\n", encoding="utf-8")
+    bump_mtime(notes)
+    (corpus / "guide" / "paging.md").unlink()
+    result = index.refresh([str(corpus)])
+    assert (result["updated_files"], result["removed_files"]) == (1, 1)
+    assert index.search("cursor") == []
+    assert paths(index.search("tokenizers"), corpus) == ["notes.txt"]
+
+
+def test_nested_roots_are_walked_once(index, corpus):
+    result = index.refresh([str(corpus), str(corpus / "guide")])
+    assert result["scanned_files"] == 3
+
+
+def test_search_files_tool(index, corpus):
+    tool = FileSearchTool(index, AllowedRoots([corpus]))
+    assert tool.search_files("paging", str(corpus))["index_refreshing"] is True
+    index.wait_for_refresh(5)
+    result = tool.search_files("paging", str(corpus))
+    assert result["result_count"] == 1
+    assert result["index_refreshing"] is False
+    assert "not allowed" in tool.search_files("paging", "/")["error"]
+    assert "limit" in tool.search_files("paging", str(corpus), limit=0)["error"]
+    assert "no searchable words" in tool.search_files("***", str(corpus))["error"]
+
+
+def test_stale_index_refreshes_in_the_background(index, corpus, monkeypatch):
+    index.refresh([str(corpus)])
+    index.refresh_interval_seconds = 0
+    release = threading.Event()
+    walk = index._walk
+
+    def slow_walk(roots):
+        release.wait(5)
+        return walk(roots)
+
+    monkeypatch.setattr(index, "_walk", slow_walk)
+    # Searches answer from the current index while the refresh waits
+    assert index.refresh_if_stale([str(corpus)]) is True
+    assert paths(index.search("cursor"), corpus) == ["guide/paging.md"]
+    assert index.refresh_if_stale([str(corpus)]) is True
+    assert index.stats()["refreshing"] is True
+    release.set()
+    index.wait_for_refresh(5)
+    assert index.refreshing is False
+
+
+def test_queued_refresh_rechecks_staleness(index, corpus, monkeypatch):
+    refreshes = []
+    refresh = index.refresh
+    monkeypatch.setattr(index, "refresh", lambda roots: refreshes.append(roots) or refresh(roots))
+    roots = (str(corpus),)
+    with index._refresh_lock:
+        assert index.refresh_if_stale(roots) is True
+        refresh(roots)
+    index.wait_for_refresh(5)
+    assert refreshes == []
+
+
+def test_large_refresh_is_written_in_batches(index, tmp_path, monkeypatch):
+    root = tmp_path / "many"
+    root.mkdir()
+    for i in range(70):
+        (root / f"{i}.txt").write_text(f"word{i} shared\n", encoding="utf-8")
+    monkeypatch.setattr(search_index, "REFRESH_BATCH_SIZE", 16)
+    index.workers = 4
+    result = index.refresh([str(root)])
+    assert (result["updated_files"], result["parallel"]) == (70, True)
+    assert len(index.search("shared", limit=100)) == 70
+    assert paths(index.search("word69"), root) == ["69.txt"]
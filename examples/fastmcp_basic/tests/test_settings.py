@@ -0,0 +1,83 @@
+"""Tests for utils/settings.py: config validation, snapshots and reloads"""
+
+import json
+import os
+
+import pytest
+
+from utils.settings import Settings, SettingsStore
+
+
+def write_config(path, **security):
+    path.write_text(json.dumps({"security": security}), encoding="utf-8")
+    # Make every rewrite visible to the mtime check
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_defaults_and_unit_conversion():
+    settings = Settings.from_config({"tools": {"file_reader": {"max_read_kb": 2}}})
+    assert settings.max_read_bytes == 2048
+    assert settings.max_lines_per_file == 1000
+    assert settings.log_level == "INFO"
+    assert settings.fallback_encodings == ("cp949", "latin-1")
+
+
+@pytest.mark.parametrize("config", [
+    {"security": {"max_lines_per_file": 0}},
+    {"security": {"max_request_kb": "big"}},
+    {"security": {"max_lines_per_file": True}},
+    {"logging": {"level": "LOUD"}},
+    {"tools": {"file_reader": {"fallback_encodings": "cp949"}}},
+    {"tools": {"file_reader": {"fallback_encodings": []}}},
+    {"tools": {"file_reader": {"fallback_encodings": ["cp949", "klingon"]}}},
+])
+def test_invalid_config_is_rejected(config):
+    with pytest.raises(ValueError):
+        Settings.from_config(config)
+
+
+def test_config_snapshot_is_read_only():
+    settings = Settings.from_config({"security": {"allowed_directories": ["/tmp"]}})
+    with pytest.raises(TypeError):
+        settings.config["security"]["allowed_directories"] = []
+
+
+def test_reload_swaps_snapshot_and_notifies(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, max_lines_per_file=10)
+    store = SettingsStore(path=path)
+    assert store.reload()
+    changes = []
+    store.subscribe(lambda old, new: changes.append((old.max_lines_per_file, new.max_lines_per_file)))
+
+    write_config(path, max_lines_per_file=20)
+    assert store.reload()
+    assert store.current.max_lines_per_file == 20
+    assert changes == [(10, 20)]
+    # Unchanged content is not a change
+    assert not store.reload()
+
+
+def test_invalid_reload_keeps_previous_snapshot(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, max_lines_per_file=10)
+    store = SettingsStore(path=path)
+    store.reload()
+    path.write_text("{not json", encoding="utf-8")
+    assert not store.reload()
+    write_config(path, max_lines_per_file=-1)
+    assert not store.reload()
+    assert store.current.max_lines_per_file == 10
+    assert store.failed_reloads == 2
+
+
+def test_failing_subscriber_does_not_block_others(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, max_lines_per_file=10)
+    store = SettingsStore(path=path)
+    seen = []
+    store.subscribe(lambda old, new: 1 / 0)
+    store.subscribe(lambda old, new: seen.append(new.max_lines_per_file))
+    assert store.reload()
+    assert seen == [10]
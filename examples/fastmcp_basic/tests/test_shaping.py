@@ -0,0 +1,77 @@
+"""Tests for utils/shaping.py: field projection and compact responses"""
+
+import inspect
+from typing import List, Optional
+
+from utils.shaping import ResponseShape, project, returns_dict
+
+
+def read_file(file_path: str, max_lines: int = 10) -> dict:
+    return {}
+
+
+def count_words(text: str, include_text: bool = True, include_words: bool = True) -> dict:
+    return {}
+
+
+def add(a: float, b: float) -> float:
+    return a + b
+
+
+LISTING = {
+    "directory": "/srv",
+    "files": [{"name": "a.txt", "size": 1, "path": "a.txt"}, {"name": "b.txt", "size": 2, "path": "b.txt"}],
+    "has_more": False
+}
+
+
+def test_project_selects_nested_fields_in_lists():
+    assert project(LISTING, ["files.name", "has_more"]) == {
+        "files": [{"name": "a.txt"}, {"name": "b.txt"}],
+        "has_more": False
+    }
+
+
+def test_project_keeps_errors_and_ignores_unknown_fields():
+    assert project({"error": "nope", "file_path": "x"}, ["content", "missing.field"]) == {"error": "nope"}
+
+
+def test_returns_dict():
+    assert returns_dict(read_file)
+    assert not returns_dict(add)
+
+
+def test_signature_gains_shaping_parameters():
+    shape = ResponseShape(count_words)
+    parameters = shape.signature.parameters
+    assert parameters["fields"].kind is inspect.Parameter.KEYWORD_ONLY
+    assert parameters["fields"].annotation == Optional[List[str]]
+    assert parameters["include_text"].default is None
+    assert shape.annotations["compact"] is bool
+
+
+def test_split_fills_include_flags():
+    shape = ResponseShape(count_words)
+    kwargs = {"text": "hi", "include_words": True, "compact": True, "fields": ["word_count"]}
+    assert shape.split(kwargs) == (["word_count"], True)
+    assert kwargs == {"text": "hi", "include_words": True, "include_text": False}
+
+    kwargs = {"text": "hi"}
+    assert shape.split(kwargs) == (None, False)
+    assert kwargs == {"text": "hi", "include_text": True, "include_words": True}
+
+
+def test_compact_drops_echoes_and_joins_lines():
+    shape = ResponseShape(read_file, echoes=("operation",), joined=("content",))
+    result = {"file_path": "a.txt", "operation": "read", "content": ["one", "two"], "lines_read": 2}
+    compact = shape.apply(result, {"file_path": "a.txt"}, None, True)
+    assert compact == {"content": "one\ntwo", "lines_read": 2}
+    # The original result is not modified
+    assert result["content"] == ["one", "two"]
+
+
+def test_apply_leaves_other_results_alone():
+    shape = ResponseShape(read_file)
+    assert shape.apply(3.0, {}, ["x"], True) == 3.0
+    result = {"a": 1}
+    assert shape.apply(result, {}, None, False) is result
@@ -0,0 +1,87 @@
+"""Tests for count_words and the batch pipeline in tools/text_processor.py"""
+
+import pytest
+
+from tools import text_processor as text_module
+from tools.text_processor import TextProcessorTool
+
+
+@pytest.fixture
+def processor():
+    return TextProcessorTool()
+
+
+def test_count_words_statistics(processor):
+    result = processor.count_words("Hello world\nhello again, World!")
+    assert result["word_count"] == 5
+    assert result["character_count"] == 31
+    assert result["character_count_no_spaces"] == 28
+    assert result["line_count"] == 2
+    assert result["words"] == ["Hello", "world", "hello", "again", "World"]
+    assert result["text"] == "Hello world\nhello again, World!"
+
+
+def test_count_words_can_skip_echo_and_word_list(processor):
+    result = processor.count_words("a b c", include_text=False, include_words=False)
+    assert "text" not in result
+    assert "words" not in result
+    assert result["word_count"] == 3
+
+
+def test_top_words_are_case_insensitive(processor):
+    result = processor.count_words("The cat and THE dog and the bird", include_words=False, top_k=2)
+    assert result["top_words"] == [{"word": "the", "count": 3}, {"word": "and", "count": 2}]
+    assert result["unique_word_count"] == 5
+
+
+def test_top_words_are_the_counted_words_lowercased(processor):
+    # Lowercasing "İ" adds a combining dot that is not a word character
+    result = processor.count_words("İstanbul istanbul", include_words=False, top_k=5)
+    assert result["word_count"] == 2
+    assert result["top_words"] == [{"word": "i̇stanbul", "count": 1}, {"word": "istanbul", "count": 1}]
+
+
+def test_chunk_boundaries_never_split_words(processor, monkeypatch):
+    monkeypatch.setattr(text_module, "CHUNK_SIZE", 7)
+    text = "alphabet soup, consonants and vowels " * 20
+    chunked = processor.count_words(text, include_text=False, top_k=3)
+    monkeypatch.setattr(text_module, "CHUNK_SIZE", 64 * 1024)
+    whole = processor.count_words(text, include_text=False, top_k=3)
+    assert chunked == whole
+    assert chunked["word_count"] == 100
+
+
+def test_empty_text(processor):
+    result = processor.count_words("")
+    assert (result["word_count"], result["character_count"], result["line_count"]) == (0, 0, 1)
+
+
+def test_pipeline_applies_steps_in_order(processor):
+    result = processor.process_batch(["Hello", "World"], ["uppercase", "reverse"])
+    assert result == {"operations": ["uppercase", "reverse"], "count": 2, "results": ["OLLEH", "DLROW"]}
+
+
+def test_pipeline_ending_in_count_returns_statistics(processor):
+    result = processor.process_batch(["one two\nthree", ""], ["lowercase", "count"])
+    assert result["results"] == [
+        {"word_count": 3, "character_count": 13, "line_count": 2},
+        {"word_count": 0, "character_count": 0, "line_count": 1}
+    ]
+
+
+def test_empty_pipeline_returns_texts_unchanged(processor):
+    assert processor.process_batch(["a", "B"], [])["results"] == ["a", "B"]
+
+
+@pytest.mark.parametrize("operations, message", [
+    (["count", "uppercase"], "must be the last"),
+    (["shout"], "Unknown operation 'shout'"),
+])
+def test_invalid_pipelines_are_rejected(processor, operations, message):
+    assert message in processor.process_batch(["text"], operations)["error"]
+
+
+def test_iter_batch_is_lazy(processor):
+    results = processor.iter_batch(iter(["a", "b"]), ["uppercase"])
+    assert next(results) == "A"
+    assert list(results) == ["B"]
@@ -0,0 +1,80 @@
+"""Tests for resources/versioned.py and the precomputed config/help resources"""
+
+import asyncio
+import json
+
+from resources.config import ConfigResource
+from resources.help import HelpResource
+from resources.versioned import ResourceNotifier, VersionedDocument
+
+
+class FakeSession:
+    def __init__(self, fail=False):
+        self.updated = []
+        self.fail = fail
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise ConnectionError("gone")
+        self.updated.append(uri)
+
+
+def test_document_version_only_changes_with_content():
+    payload = {"a": 1}
+    document = VersionedDocument(lambda: dict(payload))
+    assert document.refresh()
+    etag, text = document.etag, document.text
+    assert not document.refresh()
+    assert document.text is text
+
+    payload["a"] = 2
+    assert document.refresh()
+    served = json.loads(document.text)
+    assert served == {"etag": document.etag, "resource_version": 2, "a": 2}
+    assert document.etag != etag
+
+
+def test_config_resource_follows_the_registry():
+    registry = {"tools": {"calculator": ["add"]}, "resources": {}}
+    config = ConfigResource(registry=lambda: registry)
+    first = json.loads(config.get_config())
+    assert first["supported_operations"]["tools"] == ["add"]
+    assert not config.refresh()
+
+    registry["tools"]["weather"] = ["get_weather"]
+    assert config.refresh()
+    second = json.loads(config.get_config())
+    assert second["resource_version"] == first["resource_version"] + 1
+    assert second["supported_operations"]["tools"] == ["add", "get_weather"]
+
+
+def test_help_only_lists_registered_tools():
+    registry = {"tools": {"calculator": ["add", "evaluate"]}, "resources": {}}
+    help_resource = HelpResource(lambda: registry)
+    calculator = json.loads(help_resource.get_tool_help("calculator"))
+    assert sorted(calculator["tools"]) == ["add", "evaluate"]
+    assert "error" in json.loads(help_resource.get_tool_help("weather"))
+
+    registry["tools"]["calculator"].append("divide")
+    assert help_resource.refresh() == ["calculator"]
+    assert json.loads(help_resource.get_tool_help("calculator"))["total_tools"] == 3
+
+
+def test_notifier_sends_updates_to_readers_only():
+    async def scenario():
+        notifier = ResourceNotifier()
+        reader, other, gone = FakeSession(), FakeSession(), FakeSession(fail=True)
+        notifier.track("config://server", reader)
+        notifier.track("config://server", gone)
+        notifier.track("help://tools/all", other)
+        notifier.notify(["config://server"])
+        await asyncio.sleep(0.01)
+        assert reader.updated == ["config://server"]
+        assert other.updated == []
+        assert notifier.sent == 1
+        # A failed send drops the session
+        notifier.notify(["config://server"])
+        await asyncio.sleep(0.01)
+        assert notifier.sent == 2
+        assert gone not in notifier._readers["config://server"]
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+"""Tests for WeatherCache in tools/weather_providers.py: TTL, stale serving, single flight and size bound"""
+
+import asyncio
+
+import pytest
+
+from tools.weather_providers import WeatherCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFetch:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        async def fetch():
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            return {"call": self.calls}
+        return fetch
+
+
+def test_hit_within_ttl_and_refetch_after_expiry():
+    async def scenario():
+        clock = FakeClock()
+        cache = WeatherCache(ttl_seconds=10, clock=clock)
+        fetch = CountingFetch()
+        assert await cache.get("seoul", fetch()) == ({"call": 1}, "miss")
+        clock.now = 9
+        assert await cache.get("seoul", fetch()) == ({"call": 1}, "hit")
+        clock.now = 10
+        assert await cache.get("seoul", fetch()) == ({"call": 2}, "miss")
+    asyncio.run(scenario())
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def scenario():
+        cache = WeatherCache()
+        fetch = CountingFetch(delay=0.01)
+        results = await asyncio.gather(*(cache.get("tokyo", fetch()) for _ in range(5)))
+        assert fetch.calls == 1
+        assert sorted(status for _, status in results) == ["coalesced"] * 4 + ["miss"]
+        assert cache.stats()["coalesced"] == 4
+    asyncio.run(scenario())
+
+
+def test_stale_entry_is_served_while_refreshing():
+    async def scenario():
+        clock = FakeClock()
+        cache = WeatherCache(ttl_seconds=10, stale_seconds=5, clock=clock)
+        fetch = CountingFetch()
+        await cache.get("paris", fetch())
+        clock.now = 12
+        assert await cache.get("paris", fetch()) == ({"call": 1}, "stale")
+        await asyncio.sleep(0.01)
+        assert await cache.get("paris", fetch()) == ({"call": 2}, "hit")
+    asyncio.run(scenario())
+
+
+def test_failed_fetch_is_not_cached():
+    async def scenario():
+        cache = WeatherCache()
+
+        async def failing():
+            raise RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get("rome", failing)
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["upstream_errors"] == 1
+    asyncio.run(scenario())
+
+
+def test_least_recently_used_city_is_evicted():
+    async def scenario():
+        cache = WeatherCache(max_entries=2)
+        fetch = CountingFetch()
+        await cache.get("a", fetch())
+        await cache.get("b", fetch())
+        # Touching "a" makes "b" the least recently used
+        await cache.get("a", fetch())
+        await cache.get("c", fetch())
+        stats = cache.stats()
+        assert (stats["entries"], stats["evictions"]) == (2, 1)
+        assert (await cache.get("a", fetch()))[1] == "hit"
+        assert (await cache.get("b", fetch()))[1] == "miss"
+    asyncio.run(scenario())
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        WeatherCache(max_entries=0)
@@ -5,11 +5,32 @@ Provides basic mathematical operations for the MCP server.
 """
 
 from fastmcp import tool
-from typing import Union
+from typing import Union, List, Dict, Any, Optional
+import math
 import logging
+import numpy as np
+from .expression import compile_expression, cache_stats
 
 logger = logging.getLogger(__name__)
 
+# Element-wise operations available to batch_calculate
+BATCH_OPERATIONS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.divide,
+}
+
+# Reductions available to reduce
+REDUCTIONS = {
+    "sum": np.sum,
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+}
+
+DIVISION_BY_ZERO = "Error: Division by zero is not allowed"
+
 class CalculatorTool:
     """Calculator tool providing basic math operations"""
     
@@ -26,7 +47,7 @@ class CalculatorTool:
             The sum of a and b
         """
         result = a + b
-        logger.info(f"Calculator: {a} + {b} = {result}")
+        logger.info("Calculator: %s + %s = %s", a, b, result)
         return result
     
     @tool  
@@ -42,7 +63,7 @@ class CalculatorTool:
             The difference of a and b
         """
         result = a - b
-        logger.info(f"Calculator: {a} - {b} = {result}")
+        logger.info("Calculator: %s - %s = %s", a, b, result)
         return result
     
     @tool
@@ -58,7 +79,7 @@ class CalculatorTool:
             The product of a and b
         """
         result = a * b
-        logger.info(f"Calculator: {a} × {b} = {result}")
+        logger.info("Calculator: %s × %s = %s", a, b, result)
         return result
     
     @tool
@@ -74,10 +95,217 @@ class CalculatorTool:
             The quotient of a and b, or error message if division by zero
         """
         if b == 0:
-            error_msg = "Error: Division by zero is not allowed"
-            logger.warning(f"Calculator: {a} ÷ {b} - {error_msg}")
+            error_msg = DIVISION_BY_ZERO
+            logger.warning("Calculator: %s ÷ %s - %s", a, b, error_msg)
             return error_msg
         
         result = a / b
-        logger.info(f"Calculator: {a} ÷ {b} = {result}")
-        return result
\ No newline at end of file
+        logger.info("Calculator: %s ÷ %s = %s", a, b, result)
+        return result
+    
+    @tool
+    def batch_calculate(
+        self,
+        operation: str,
+        a: Union[float, List[float]],
+        b: Union[float, List[float]]
+    ) -> Dict[str, Any]:
+        """
+        Apply an arithmetic operation element-wise in one vectorized pass.
+        
+        Either operand may be a scalar, which is broadcast against the
+        other. Division by zero does not fail the batch: the affected
+        elements are None in the results and flagged in the mask.
+        
+        Args:
+            operation: One of add, subtract, multiply, divide
+            a: First operand (number or list of numbers)
+            b: Second operand (number or list of numbers)
+            
+        Returns:
+            Dictionary containing results and a per-element error mask
+        """
+        if operation not in BATCH_OPERATIONS:
+            return {
+                "error": f"Unknown operation '{operation}'",
+                "available_operations": list(BATCH_OPERATIONS)
+            }
+        
+        try:
+            left = np.atleast_1d(np.asarray(a, dtype=np.float64))
+            right = np.atleast_1d(np.asarray(b, dtype=np.float64))
+        except (TypeError, ValueError):
+            return {"error": "Operands must be numbers or flat lists of numbers"}
+        if left.ndim > 1 or right.ndim > 1:
+            return {"error": "Operands must be numbers or flat lists of numbers"}
+        if left.size != 1 and right.size != 1 and left.shape != right.shape:
+            return {
+                "error": f"Operands must have equal length (got {left.size} and {right.size})"
+            }
+        
+        left, right = np.broadcast_arrays(left, right)
+        if operation == "divide":
+            mask = right == 0
+            values = np.divide(left, right, out=np.zeros(left.shape), where=~mask)
+        else:
+            mask = np.zeros(left.shape, dtype=bool)
+            values = BATCH_OPERATIONS[operation](left, right)
+        
+        results = values.tolist()
+        error_count = int(mask.sum())
+        if error_count:
+            for index in np.flatnonzero(mask).tolist():
+                results[index] = None
+        
+        result = {
+            "operation": operation,
+            "count": values.size,
+            "results": results,
+            "error_mask": mask.tolist(),
+            "error_count": error_count
+        }
+        if error_count:
+            result["error_message"] = DIVISION_BY_ZERO
+            logger.warning("Calculator: batch %s - %d of %d elements divided by zero",
+                           operation, error_count, values.size)
+        else:
+            logger.info("Calculator: batch %s over %d elements", operation, values.size)
+        return result
+    
+    @tool
+    def reduce(self, operation: str, values: List[float]) -> Dict[str, Any]:
+        """
+        Reduce a list of numbers to a single value.
+        
+        Args:
+            operation: One of sum, mean, min, max
+            values: Numbers to reduce
+            
+        Returns:
+            Dictionary containing the reduced value
+        """
+        if operation not in REDUCTIONS:
+            return {
+                "error": f"Unknown reduction '{operation}'",
+                "available_reductions": list(REDUCTIONS)
+            }
+        if not values:
+            return {"error": f"Cannot compute {operation} of an empty list"}
+        
+        array = np.asarray(values, dtype=np.float64)
+        value = float(REDUCTIONS[operation](array))
+        logger.info("Calculator: %s over %d values = %s", operation, array.size, value)
+        return {
+            "operation": operation,
+            "count": array.size,
+            "result": value
+        }
+    
+    @tool
+    def dot(self, a: List[float], b: List[float]) -> Dict[str, Any]:
+        """
+        Compute the dot product of two equal-length lists.
+        
+        Args:
+            a: First vector
+            b: Second vector
+            
+        Returns:
+            Dictionary containing the dot product
+        """
+        if len(a) != len(b):
+            return {"error": f"Vectors must have equal length (got {len(a)} and {len(b)})"}
+        
+        value = float(np.dot(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)))
+        logger.info("Calculator: dot product of %d-element vectors = %s", len(a), value)
+        return {
+            "operation": "dot",
+            "count": len(a),
+            "result": value
+        }
+    
+    @tool
+    def evaluate(
+        self,
+        expression: str,
+        variables: Optional[Dict[str, Union[float, List[float]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate an arithmetic expression such as "(a + b) * 2 / sqrt(c)".
+        
+        Expressions are compiled once and cached by their text, so repeated
+        evaluations with new variable bindings skip parsing. List-valued
+        variables evaluate the expression over a whole dataset in one call;
+        undefined elements (e.g. division by zero) are None in the results
+        and flagged in the mask.
+        
+        Args:
+            expression: Arithmetic expression using + - * / // % **, variables,
+                pi, e and abs/sqrt/exp/log/log10/sin/cos/tan/floor/ceil
+            variables: Mapping of variable names to numbers or lists of numbers
+            
+        Returns:
+            Dictionary containing the result (or results for list variables)
+        """
+        try:
+            compiled = compile_expression(expression)
+        except ValueError as e:
+            logger.warning("Calculator: Rejected expression %r - %s", expression, e)
+            return {"error": str(e), "expression": expression}
+        
+        bindings = variables or {}
+        missing = compiled.variables - bindings.keys()
+        if missing:
+            return {
+                "error": f"Missing variables: {', '.join(sorted(missing))}",
+                "expression": expression,
+                "required_variables": sorted(compiled.variables)
+            }
+        
+        try:
+            env = {
+                name: (np.asarray(bindings[name], dtype=np.float64)
+                       if isinstance(bindings[name], list) else float(bindings[name]))
+                for name in compiled.variables
+            }
+            with np.errstate(all="ignore"):
+                value = compiled(env)
+        except ZeroDivisionError:
+            logger.warning("Calculator: %s - %s", expression, DIVISION_BY_ZERO)
+            return {"error": DIVISION_BY_ZERO, "expression": expression}
+        except (TypeError, ValueError) as e:
+            return {"error": f"Failed to evaluate expression: {e}", "expression": expression}
+        
+        if np.ndim(value) == 0:
+            value = float(value)
+            if not math.isfinite(value):
+                return {
+                    "error": "Result is undefined or out of range (e.g. division by zero)",
+                    "expression": expression
+                }
+            logger.info("Calculator: %s = %s", expression, value)
+            return {"expression": expression, "result": value}
+        
+        array = np.asarray(value, dtype=np.float64).ravel()
+        mask = ~np.isfinite(array)
+        results = array.tolist()
+        for index in np.flatnonzero(mask).tolist():
+            results[index] = None
+        logger.info("Calculator: %s evaluated over %d elements", expression, array.size)
+        return {
+            "expression": expression,
+            "count": array.size,
+            "results": results,
+            "error_mask": mask.tolist(),
+            "error_count": int(mask.sum())
+        }
+    
+    @tool
+    def get_expression_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get compiled-expression cache statistics.
+        
+        Returns:
+            Dictionary containing hit/miss counters and cache size
+        """
+        return cache_stats()
\ No newline at end of file
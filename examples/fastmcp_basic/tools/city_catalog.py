@@ -0,0 +1,407 @@
+"""
+City Catalog
+
+Cities WeatherTool can report on, loaded lazily from a tab-separated file
+into flat arrays instead of one dict per city: display names are one
+UTF-8 blob with an offset array, and coordinates, populations and
+countries are typed arrays. Normalized names and aliases are kept as one
+sorted list of short byte strings, so exact and prefix lookups are binary
+searches, the most populous cities for a prefix are picked with numpy
+over views of the same arrays, and a misspelled name is found by trying single edits against
+the characters that actually follow each prefix in the catalog.
+
+Two line formats are accepted, told apart by their column count:
+
+- name, country code, country, latitude, longitude, population, aliases
+  (comma-separated), as in data/cities.tsv
+- GeoNames dumps such as cities1000.txt (19 columns); the country is
+  reported by its code
+
+Files ending in .gz are decompressed while reading; lines starting with #
+are comments.
+"""
+
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple, Union
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+import re
+import sys
+import gzip
+import time
+import logging
+import threading
+import unicodedata
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent.parent / "data" / "cities.tsv"
+
+# Shortest query resolved by prefix; shorter ones must match exactly
+MIN_PREFIX_LENGTH = 3
+# Keys examined when picking the most populous cities for a prefix
+PREFIX_SCAN_LIMIT = 65536
+# Shortest query matched despite a typo
+MIN_FUZZY_LENGTH = 4
+# Positions before the query's longest known prefix tried for the typo
+FUZZY_BACKTRACK = 3
+
+_GEONAMES_COLUMNS = 19
+# Keys kept per requested city when ranking a prefix range
+_ALIAS_SLACK = 4
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# Sorts after every UTF-8 byte, so key + _PREFIX_END bounds a prefix range
+_PREFIX_END = b"\xff"
+
+
+def normalize(name: str) -> str:
+    """Lookup key of a city name: case, accents, spaces and punctuation removed"""
+    if name.isascii():
+        return _NON_ALNUM.sub("", name.lower())
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(ch for ch in decomposed if ch.isalnum())
+
+
+def climate(latitude: float) -> Tuple[List[str], Tuple[int, int]]:
+    """Plausible (conditions, temperature range) for mock weather at a latitude"""
+    band = abs(latitude)
+    if band < 23.5:
+        return ["Sunny", "Cloudy", "Rainy", "Thunderstorm"], (18, 38)
+    if band < 40:
+        return ["Sunny", "Cloudy", "Rainy"], (-5, 38)
+    if band < 60:
+        return ["Sunny", "Cloudy", "Rainy", "Snow"], (-20, 35)
+    return ["Cloudy", "Snow", "Sunny"], (-35, 25)
+
+
+class City(NamedTuple):
+    """One catalog entry"""
+
+    name: str
+    country_code: str
+    country: str
+    latitude: float
+    longitude: float
+    population: int
+
+    @property
+    def key(self) -> str:
+        """Cache key that stays the same across catalog reloads"""
+        return f"{normalize(self.name)},{self.country_code.lower()}"
+
+    def weather_data(self) -> Dict[str, Any]:
+        """The city as WeatherProvider.fetch() expects it"""
+        conditions, temp_range = climate(self.latitude)
+        return {
+            "city": self.name,
+            "country": self.country,
+            "country_code": self.country_code,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "conditions": conditions,
+            "temp_range": temp_range
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "city": self.name,
+            "country": self.country,
+            "country_code": self.country_code,
+            "latitude": round(self.latitude, 4),
+            "longitude": round(self.longitude, 4),
+            "population": self.population
+        }
+
+
+class _Strings:
+    """Read-only sequence over a blob of concatenated UTF-8 strings"""
+
+    def __init__(self, blob: bytes, offsets: array):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.blob[self.offsets[index]:self.offsets[index + 1]]
+
+    @classmethod
+    def pack(cls, items: List[bytes]) -> "_Strings":
+        offsets = array("I", [0])
+        total = 0
+        for item in items:
+            total += len(item)
+            offsets.append(total)
+        return cls(b"".join(items), offsets)
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.blob) + sys.getsizeof(self.offsets)
+
+
+def _read_rows(path: Path) -> Iterator[Tuple[str, str, str, float, float, int, List[str]]]:
+    """(name, country code, country, latitude, longitude, population, aliases) per line"""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            columns = line.rstrip("\n").split("\t")
+            try:
+                if len(columns) == _GEONAMES_COLUMNS:
+                    yield (columns[1], columns[8], columns[8], float(columns[4]),
+                           float(columns[5]), int(columns[14] or 0), [columns[2]])
+                elif len(columns) == 7:
+                    yield (columns[0], columns[1], columns[2], float(columns[3]), float(columns[4]),
+                           int(columns[5] or 0), [alias for alias in columns[6].split(",") if alias])
+                else:
+                    raise ValueError(f"expected 7 or {_GEONAMES_COLUMNS} columns, got {len(columns)}")
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+
+
+class CityCatalog:
+    """
+    Sorted, array-backed city catalog with exact, prefix and fuzzy lookup.
+
+    The file is read on first use. After that the arrays are never
+    modified, so lookups from any thread need no lock.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CATALOG_PATH):
+        """
+        Args:
+            path: Catalog file (see the module docstring for formats)
+        """
+        self.path = Path(path)
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self.load_seconds = 0.0
+        self.lookups = {"exact": 0, "prefix": 0, "fuzzy": 0, "not_found": 0}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> None:
+        """
+        Read the catalog file if it has not been read yet.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If a line is malformed
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            started = time.perf_counter()
+            names: List[bytes] = []
+            keys: List[Tuple[bytes, int]] = []
+            countries: List[Tuple[str, str]] = []
+            country_ids: Dict[Tuple[str, str], int] = {}
+            country = array("H")
+            latitude = array("f")
+            longitude = array("f")
+            population = array("I")
+
+            for city_id, (name, code, country_name, lat, lon, people, aliases) in enumerate(
+                _read_rows(self.path)
+            ):
+                names.append(name.encode("utf-8"))
+                country_id = country_ids.setdefault((code, country_name), len(countries))
+                if country_id == len(countries):
+                    countries.append((code, country_name))
+                country.append(country_id)
+                latitude.append(lat)
+                longitude.append(lon)
+                population.append(min(people, 0xFFFFFFFF))
+                for key in {normalize(alias) for alias in [name, *aliases]}:
+                    if key:
+                        keys.append((key.encode("utf-8"), city_id))
+
+            keys.sort()
+            self._names = _Strings.pack(names)
+            self._keys = [key for key, _ in keys]
+            self._key_city = array("I", [city_id for _, city_id in keys])
+            self._countries = countries
+            # Normalized code and name of each country, for "Seoul, KR" queries
+            self._country_lookup: Dict[str, List[int]] = {}
+            for country_id, (code, country_name) in enumerate(countries):
+                for key in {normalize(code), normalize(country_name)}:
+                    self._country_lookup.setdefault(key, []).append(country_id)
+            self._country = country
+            self._latitude = latitude
+            self._longitude = longitude
+            self._population = population
+            # Zero-copy views for ranking whole prefix ranges at once
+            self._key_city_np = np.frombuffer(self._key_city, dtype=np.uint32)
+            self._country_np = np.frombuffer(country, dtype=np.uint16)
+            self._population_np = np.frombuffer(population, dtype=np.uint32)
+            self._memory_bytes = (
+                self._names.memory_bytes() + sys.getsizeof(self._keys)
+                + sum(sys.getsizeof(key) for key in self._keys)
+                + sum(sys.getsizeof(column) for column in (
+                    self._key_city, country, latitude, longitude, population
+                ))
+            )
+            self.load_seconds = time.perf_counter() - started
+            self._loaded = True
+        logger.info("CityCatalog: Loaded %d cities (%d keys) from %s in %.2fs",
+                    len(self._population), len(self._key_city), self.path, self.load_seconds)
+
+    def _city(self, city_id: int) -> City:
+        code, country = self._countries[self._country[city_id]]
+        return City(
+            self._names[city_id].decode("utf-8"), code, country,
+            self._latitude[city_id], self._longitude[city_id], self._population[city_id]
+        )
+
+    def _prefix_range(self, key: bytes) -> Tuple[int, int]:
+        lo = bisect_left(self._keys, key)
+        return lo, bisect_left(self._keys, key + _PREFIX_END, lo)
+
+    def _has_prefix(self, key: bytes) -> bool:
+        lo = bisect_left(self._keys, key)
+        return lo < len(self._keys) and self._keys[lo].startswith(key)
+
+    def _candidates(self, lo: int, hi: int, countries: Optional[List[int]]) -> List[int]:
+        """City ids of the few keys lo..hi, limited to the given countries"""
+        return [
+            city_id for city_id in self._key_city[lo:hi]
+            if countries is None or self._country[city_id] in countries
+        ]
+
+    def _most_populous(self, city_ids: List[int]) -> Optional[int]:
+        return max(city_ids, key=self._population.__getitem__) if city_ids else None
+
+    def _top_cities(self, lo: int, hi: int, countries: Optional[List[int]], limit: int) -> List[int]:
+        """Most populous distinct cities among keys lo..hi, most populous first"""
+        city_ids = self._key_city_np[lo:min(hi, lo + PREFIX_SCAN_LIMIT)]
+        if countries is not None:
+            city_ids = city_ids[np.isin(self._country_np[city_ids], countries)]
+        # A city's name and aliases may all share the prefix, so keep a few
+        # times `limit` keys before dropping duplicate cities
+        keep = limit * _ALIAS_SLACK
+        if len(city_ids) > keep:
+            city_ids = city_ids[np.argpartition(self._population_np[city_ids], -keep)[-keep:]]
+        return sorted(set(city_ids.tolist()), key=self._population.__getitem__, reverse=True)[:limit]
+
+    def _parse(self, query: str) -> Tuple[bytes, Optional[List[int]]]:
+        """Split "Seoul, KR" into the city key and the matching country ids"""
+        name, separator, qualifier = query.rpartition(",")
+        if separator:
+            countries = self._country_lookup.get(normalize(qualifier))
+            if countries is not None:
+                return normalize(name).encode("utf-8"), countries
+        return normalize(query).encode("utf-8"), None
+
+    def _children(self, prefix: bytes) -> Iterator[bytes]:
+        """Each byte that follows `prefix` in some key, skipping over the keys in between"""
+        depth = len(prefix)
+        lo, hi = self._prefix_range(prefix)
+        if lo < hi and len(self._keys[lo]) == depth:
+            lo += 1
+        while lo < hi:
+            child = self._keys[lo][depth:depth + 1]
+            yield child
+            lo = bisect_left(self._keys, prefix + child + _PREFIX_END, lo, hi)
+
+    def _fuzzy(self, key: bytes, countries: Optional[List[int]]) -> Optional[int]:
+        """
+        Most populous city one edit (wrong, missing, extra or swapped
+        character) away from `key`.
+
+        A name is right up to its typo, so the typo is at or shortly before
+        the end of the longest prefix of the query that some key starts
+        with; positions are tried from there backwards.
+        """
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+        shared = len(key)
+        while shared > 0 and not self._has_prefix(key[:shared]):
+            shared -= 1
+        last = min(shared, len(key) - 1)
+        for position in range(last, max(0, last - FUZZY_BACKTRACK) - 1, -1):
+            head, typo, tail = key[:position], key[position:position + 1], key[position + 1:]
+            variants = {head + tail}
+            if tail:
+                variants.add(head + tail[:1] + typo + tail[1:])
+            for child in self._children(head):
+                variants.add(head + child + tail)
+                variants.add(head + child + typo + tail)
+            city_ids: List[int] = []
+            for variant in variants:
+                lo = bisect_left(self._keys, variant)
+                city_ids.extend(self._candidates(lo, bisect_right(self._keys, variant, lo), countries))
+            if city_ids:
+                return self._most_populous(city_ids)
+        return None
+
+    def resolve(self, query: str) -> Optional[Tuple[City, str]]:
+        """
+        Find the city a user means.
+
+        Exact names and aliases win, then the most populous city starting
+        with the query, then the closest misspelling. A trailing ", KR" or
+        ", South Korea" limits the match to that country.
+
+        Returns:
+            (city, "exact" | "prefix" | "fuzzy"), or None if nothing matches
+        """
+        self.load()
+        key, countries = self._parse(query)
+        if not key:
+            self.lookups["not_found"] += 1
+            return None
+
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key, lo)
+        city_id = self._most_populous(self._candidates(lo, hi, countries))
+        matched_by = "exact"
+        if city_id is None and len(key) >= MIN_PREFIX_LENGTH:
+            lo, hi = self._prefix_range(key)
+            city_id = next(iter(self._top_cities(lo, hi, countries, 1)), None)
+            matched_by = "prefix"
+        if city_id is None:
+            city_id = self._fuzzy(key, countries)
+            matched_by = "fuzzy"
+        if city_id is None:
+            self.lookups["not_found"] += 1
+            return None
+        self.lookups[matched_by] += 1
+        return self._city(city_id), matched_by
+
+    def search(self, query: str, limit: int = 10) -> List[City]:
+        """
+        Cities whose name or alias starts with the query, most populous first.
+
+        Falls back to the closest misspelling if no name starts with it.
+        """
+        self.load()
+        key, countries = self._parse(query)
+        if not key or limit <= 0:
+            return []
+        lo, hi = self._prefix_range(key)
+        city_ids = self._top_cities(lo, hi, countries, limit)
+        if not city_ids:
+            city_id = self._fuzzy(key, countries)
+            city_ids = [] if city_id is None else [city_id]
+        return [self._city(city_id) for city_id in city_ids]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, memory footprint and lookup counters"""
+        stats: Dict[str, Any] = {"path": str(self.path), "loaded": self._loaded, "lookups": dict(self.lookups)}
+        if not self._loaded:
+            return stats
+        stats.update({
+            "cities": len(self._population),
+            "keys": len(self._key_city),
+            "countries": len(self._countries),
+            "memory_bytes": self._memory_bytes,
+            "bytes_per_city": round(self._memory_bytes / max(1, len(self._population)), 1),
+            "load_seconds": round(self.load_seconds, 3)
+        })
+        return stats
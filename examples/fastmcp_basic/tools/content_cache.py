@@ -0,0 +1,213 @@
+"""
+Content Cache
+
+Shared in-memory copies of small, frequently read files for
+FileReaderTool. Entries are keyed by path and file version, bounded by
+total bytes, and admitted with a TinyLFU policy: a new file only
+displaces cached ones if it has been requested more often than they have,
+so a single large cold read does not flush the hot set. Concurrent misses
+on the same file share one disk read.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+import os
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# (inode, size, mtime_ns) of a file version
+Version = Tuple[int, int, int]
+
+# Counter rows of the frequency sketch; each uses an independent hash
+_SKETCH_DEPTH = 4
+# Counters saturate at 15, as in TinyLFU's 4-bit counters
+_MAX_COUNT = 15
+_HASH_SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+# bytes.translate table that halves every counter
+_HALVE = bytes(value >> 1 for value in range(256))
+
+
+def file_version(stat: os.stat_result) -> Version:
+    """Identity of a file version for cache lookups"""
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of recent access counts. All counters are halved
+    every `sample_size` increments, so old popularity fades.
+    """
+
+    def __init__(self, width: int = 4096):
+        # A power of two, so a hash is reduced with a mask
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self._mask = self.width - 1
+        self._rows = [bytearray(self.width) for _ in range(_SKETCH_DEPTH)]
+        self.sample_size = 10 * self.width
+        self._additions = 0
+
+    def _slots(self, item: str) -> List[int]:
+        h = hash(item)
+        return [hash((seed, h)) & self._mask for seed in _HASH_SEEDS]
+
+    def increment(self, item: str) -> None:
+        for row, slot in zip(self._rows, self._slots(item)):
+            if row[slot] < _MAX_COUNT:
+                row[slot] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, item: str) -> int:
+        return min(row[slot] for row, slot in zip(self._rows, self._slots(item)))
+
+    def _reset(self) -> None:
+        """Halve every counter"""
+        for index, row in enumerate(self._rows):
+            self._rows[index] = row.translate(_HALVE)
+        self._additions //= 2
+
+
+class ContentCache:
+    """
+    Byte-budgeted cache of whole file contents.
+
+    Each lookup stats the file, so a changed file is never served from
+    memory; the stat replaces the open, read and close of a miss.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 4 * 1024 * 1024,
+        sketch_width: int = 4096
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        # Keyed by absolute path; a path has at most one cached version
+        self._entries: "OrderedDict[str, Tuple[Version, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._loading: Dict[Tuple[str, Version], Future] = {}
+        self._sketch = FrequencySketch(sketch_width)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.evictions = 0
+        self.bytes_read = 0
+        self.bytes_served = 0
+
+    def get(self, path: Path, max_size: Optional[int] = None) -> Tuple[os.stat_result, Optional[bytes]]:
+        """
+        Return the current version of a file and its contents.
+
+        The contents are None if the file is larger than `max_size` (when
+        given) or than one cache entry may be; read those directly.
+
+        Raises:
+            OSError: If the file cannot be stat'ed or read
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        if (max_size is not None and stat.st_size > max_size) or stat.st_size > self.max_entry_bytes:
+            return stat, None
+        version = file_version(stat)
+
+        with self._lock:
+            self._sketch.increment(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return stat, entry[1]
+            pending = self._loading.get((key, version))
+            if pending is None:
+                self.misses += 1
+                pending = self._loading[(key, version)] = Future()
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            stat, data = self._read(key, stat)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[(key, version)]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[(key, version)]
+            self.bytes_read += len(data)
+            self._store(key, file_version(stat), data)
+        pending.set_result((stat, data))
+        return stat, data
+
+    @staticmethod
+    def _read(key: str, stat: os.stat_result) -> Tuple[os.stat_result, bytes]:
+        """Read a whole file, returning the version actually read"""
+        with open(key, "rb") as f:
+            stat = os.fstat(f.fileno())
+            return stat, f.read(stat.st_size)
+
+    def _store(self, key: str, version: Version, data: bytes) -> None:
+        """Cache a file version if the admission policy lets it in (lock held)"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[1])
+        size = len(data)
+        if size > self.max_entry_bytes:
+            return
+
+        needed = self._bytes + size - self.max_bytes
+        if needed > 0:
+            # Admit only if the file is requested more often than every
+            # entry it would evict
+            frequency = self._sketch.estimate(key)
+            victims = []
+            for victim, (_, victim_data) in self._entries.items():
+                if self._sketch.estimate(victim) >= frequency:
+                    self.rejected += 1
+                    return
+                victims.append(victim)
+                needed -= len(victim_data)
+                if needed <= 0:
+                    break
+            for victim in victims:
+                self._bytes -= len(self._entries.pop(victim)[1])
+                self.evictions += 1
+
+        self._entries[key] = (version, data)
+        self._bytes += size
+
+    def record_served(self, size: int) -> None:
+        """Count bytes a caller returned from cached contents"""
+        with self._lock:
+            self.bytes_served += size
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, coalesced reads and bytes served from memory"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entry_bytes": self.max_entry_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "rejected": self.rejected,
+                "evictions": self.evictions,
+                "bytes_read_from_disk": self.bytes_read,
+                "bytes_served_from_memory": self.bytes_served
+            }
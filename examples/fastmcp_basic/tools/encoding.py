@@ -0,0 +1,93 @@
+"""
+Encoding Detection
+
+Guesses the text encoding of a file from a small prefix sample, so that
+FileReaderTool can tell text from binary data before decoding a window.
+"""
+
+from typing import Sequence, Tuple
+import codecs
+
+# Bytes inspected when guessing an encoding
+SAMPLE_SIZE = 4096
+
+# Reported for data that does not look like text in any encoding
+BINARY = "binary"
+
+# Tried in order on non-UTF-8 text without a BOM (tools.file_reader.fallback_encodings);
+# latin-1 decodes any byte, so a list ending in it always has an answer
+DEFAULT_FALLBACK_ENCODINGS: Tuple[str, ...] = ("cp949", "latin-1")
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one
+_BOMS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Control bytes that do not appear in text (tab, newlines, form feed and escape do)
+_CONTROL_BYTES = bytes(sorted(set(range(32)) - {8, 9, 10, 12, 13, 27}))
+
+# Share of control bytes above which a non-UTF-8 sample counts as binary
+_MAX_CONTROL_RATIO = 0.1
+
+
+def detect_encoding(
+    sample: bytes,
+    fallbacks: Sequence[str] = DEFAULT_FALLBACK_ENCODINGS
+) -> Tuple[str, bool]:
+    """
+    Guess the encoding of data from its first bytes.
+
+    A BOM wins; otherwise NUL bytes mean binary and valid UTF-8 means
+    UTF-8. Anything else is mostly control bytes (binary) or the first of
+    `fallbacks` that decodes the sample. Legacy encodings accept many
+    byte sequences that are not theirs, so that last answer is only a
+    guess and is reported as one. A character cut off at the end of the
+    sample is allowed throughout.
+
+    Args:
+        sample: Leading bytes of the data, usually SAMPLE_SIZE of them
+        fallbacks: Encodings to try on non-UTF-8 text, in order
+
+    Returns:
+        (codec name or BINARY, whether the name was guessed from fallbacks);
+        if no fallback fits, the last one is returned so decoding reports
+        where it fails
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, False
+    if b"\x00" in sample:
+        return BINARY, False
+    if _decodes(sample, "utf-8"):
+        return "utf-8", False
+    control = len(sample) - len(sample.translate(None, _CONTROL_BYTES))
+    if control > len(sample) * _MAX_CONTROL_RATIO:
+        return BINARY, False
+    for encoding in fallbacks:
+        if _decodes(sample, encoding):
+            return encoding, True
+    return fallbacks[-1], True
+
+
+def _decodes(sample: bytes, encoding: str) -> bool:
+    """Whether `sample` is valid in `encoding`, up to a character cut off at its end"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def splits_on_newline_byte(encoding: str) -> bool:
+    """
+    Whether lines of this encoding end in the single byte b"\\n", which
+    line windows and cursors rely on (false for UTF-16 and UTF-32).
+
+    Raises:
+        LookupError: If the encoding is unknown
+    """
+    return not codecs.lookup(encoding).name.startswith(("utf-16", "utf-32"))
@@ -0,0 +1,162 @@
+"""
+Expression Compiler
+
+Compiles restricted arithmetic expressions into closures for
+CalculatorTool.evaluate. Only numbers, variables, arithmetic operators and
+a small set of math functions are accepted; anything else is rejected at
+parse time, so evaluation never reaches Python's eval().
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Union
+from functools import lru_cache
+import ast
+import math
+import operator
+import numpy as np
+
+# Number of compiled expressions kept in the LRU
+EXPRESSION_CACHE_SIZE = 256
+
+# Longest expression text accepted, to bound parse time and recursion
+MAX_EXPRESSION_LENGTH = 1000
+
+BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    # np.power keeps negative bases with fractional exponents real (nan)
+    ast.Pow: np.power,
+}
+
+UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS: Dict[str, Callable[[Any], Any]] = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "floor": np.floor,
+    "ceil": np.ceil,
+}
+
+CONSTANTS: Dict[str, float] = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+# A compiled node is either a folded constant or a closure over the bindings
+Node = Union[float, Callable[[Dict[str, Any]], Any]]
+
+
+class CompiledExpression:
+    """An expression compiled to a closure, plus the variables it reads"""
+
+    def __init__(self, text: str, function: Callable[[Dict[str, Any]], Any],
+                 variables: FrozenSet[str]):
+        self.text = text
+        self.function = function
+        self.variables = variables
+
+    def __call__(self, bindings: Dict[str, Any]) -> Any:
+        return self.function(bindings)
+
+
+def _constant(value: float) -> Callable[[Dict[str, Any]], float]:
+    return lambda env: value
+
+
+def _compile_node(node: ast.AST, variables: set) -> Node:
+    """Translate one AST node, folding subtrees that only contain constants"""
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        return float(node.value)
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            return CONSTANTS[node.id]
+        if node.id in FUNCTIONS:
+            raise ValueError(f"Function '{node.id}' must be called")
+        name = node.id
+        variables.add(name)
+        return lambda env: env[name]
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        if isinstance(left, float) and isinstance(right, float):
+            try:
+                return float(op(left, right))
+            except ArithmeticError:
+                # Leave e.g. 1/0 to fail at evaluation time like any other division
+                pass
+        left_fn = _constant(left) if isinstance(left, float) else left
+        right_fn = _constant(right) if isinstance(right, float) else right
+        return lambda env: op(left_fn(env), right_fn(env))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        unary = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, variables)
+        if isinstance(operand, float):
+            return float(unary(operand))
+        return lambda env: unary(operand(env))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError("Only these functions are allowed: " + ", ".join(FUNCTIONS))
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError(f"Function '{node.func.id}' takes exactly one argument")
+        function = FUNCTIONS[node.func.id]
+        argument = _compile_node(node.args[0], variables)
+        if isinstance(argument, float):
+            return float(function(argument))
+        return lambda env: function(argument(env))
+
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Parse and compile an expression, caching the result by its text.
+
+    Raises:
+        ValueError: If the expression is too long, malformed or uses
+            anything beyond the allowed arithmetic subset
+    """
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(text, mode="eval")
+    except (SyntaxError, RecursionError) as e:
+        raise ValueError(f"Invalid expression: {e}")
+
+    variables: set = set()
+    with np.errstate(all="ignore"):
+        body = _compile_node(tree.body, variables)
+    function = _constant(body) if isinstance(body, float) else body
+    return CompiledExpression(text, function, frozenset(variables))
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the compiled-expression LRU"""
+    info = compile_expression.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_ratio": info.hits / lookups if lookups else 0.0
+    }
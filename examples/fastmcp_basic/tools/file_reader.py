@@ -5,164 +5,689 @@ Provides safe file reading capabilities within allowed directories.
 """
 
 from fastmcp import tool
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Union
 import os
+import json
+import fnmatch
+import mmap
+import base64
+import binascii
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
+from .content_cache import ContentCache
+from .encoding import BINARY, SAMPLE_SIZE, detect_encoding, splits_on_newline_byte
+from .line_index import LineIndexCache, skip_lines
+from .metadata_cache import MetadataCache
+from .path_guard import AllowedRoots
+from utils.settings import SettingsStore
 
 logger = logging.getLogger(__name__)
 
+# Files smaller than this are scanned directly instead of being indexed
+INDEX_MIN_FILE_SIZE = 1024 * 1024
+
 class FileReaderTool:
     """File reader tool for safe file operations"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        line_index: Optional[LineIndexCache] = None,
+        metadata: Optional[MetadataCache] = None,
+        allowed_dirs: Optional[List[Union[str, Path]]] = None,
+        settings: Optional[SettingsStore] = None,
+        content_cache: Optional[ContentCache] = None
+    ):
+        # Sparse line-offset indexes shared by every read of the same file version
+        self.line_index = line_index or LineIndexCache()
+        # Stat results and directory listings shared by every call
+        self.metadata = metadata or MetadataCache()
+        # Contents of small hot files shared by every read_file call
+        self.content_cache = content_cache or ContentCache()
         # Define allowed directories for security
-        self.allowed_dirs = [
-            Path(__file__).parent.parent,  # fastmcp_basic directory
-            Path(__file__).parent.parent.parent.parent,  # project root
-        ]
+        if allowed_dirs is None:
+            allowed_dirs = [
+                Path(__file__).parent.parent,  # fastmcp_basic directory
+                Path(__file__).parent.parent.parent.parent,  # project root
+            ]
+        self.allowed_roots = AllowedRoots(allowed_dirs)
+        # Size and line limits, re-read on every call so reloads apply immediately
+        self.settings = settings or SettingsStore()
+        # read_bytes buffer of each file I/O thread, reused across calls
+        self._buffers = threading.local()
+    
+    def set_allowed_dirs(self, allowed_dirs: List[Union[str, Path]]) -> None:
+        """Replace the allowed directories and drop cached access decisions"""
+        self.allowed_roots.update(allowed_dirs)
+        logger.info("FileReader: Allowed directories set to %s", self.allowed_roots.roots)
     
     def _is_path_allowed(self, file_path: str) -> bool:
         """Check if the file path is within allowed directories"""
-        try:
-            abs_path = Path(file_path).resolve()
-            return any(
-                abs_path.is_relative_to(allowed_dir.resolve()) 
-                for allowed_dir in self.allowed_dirs
-            )
-        except Exception:
-            return False
+        return self.allowed_roots.is_allowed(file_path)
     
+    @staticmethod
+    def _encode_cursor(payload: Dict[str, Any]) -> str:
+        """Encode a resume position as an opaque cursor string"""
+        raw = json.dumps(payload, separators=(",", ":")).encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        """Decode a cursor produced by _encode_cursor"""
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(payload, dict):
+            raise ValueError("cursor payload is not an object")
+        return payload
+
+    @staticmethod
+    def _align_to_line(mm: mmap.mmap, offset: int) -> int:
+        """Move a raw byte offset forward to the start of the next line"""
+        if offset == 0 or mm[offset - 1:offset] == b"\n":
+            return offset
+        newline = mm.find(b"\n", offset)
+        return len(mm) if newline == -1 else newline + 1
+
+    @contextmanager
+    def _open_content(
+        self,
+        path: Path
+    ) -> Iterator[Tuple[os.stat_result, Union[bytes, mmap.mmap]]]:
+        """
+        The current version of a file and its bytes: cached contents if the
+        content cache holds (or takes) the file, otherwise a read-only map
+        for the duration of the block. Empty files yield no bytes.
+        """
+        stat, data = self.content_cache.get(path)
+        if data is not None:
+            yield stat, data
+            return
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                yield stat, b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield stat, mm
+
     @tool
-    def read_file(self, file_path: str, max_lines: int = 100) -> Dict[str, Any]:
+    def read_file(
+        self,
+        file_path: str,
+        max_lines: Optional[int] = None,
+        start_line: int = 0,
+        byte_offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        encoding: Optional[str] = None,
+        lossy: bool = False
+    ) -> Dict[str, Any]:
         """
-        Read contents of a text file safely.
+        Read a window of lines from a text file safely.
+        
+        The window can start at a line number, at a byte offset (aligned to
+        the next line boundary) or at a cursor returned by a previous call.
+        Small files are served from the shared content cache; larger ones
+        are memory-mapped so the cost of a page does not depend on how much
+        of the file has to be pulled over the wire. Files of any size can be
+        paged through: a call returns at most max_lines lines and, cut at a
+        line boundary, at most max_read_kb bytes.
+        
+        Without an explicit encoding, it is detected from the first
+        SAMPLE_SIZE bytes of the file. Files that look binary are refused
+        unless `lossy` is set; use read_bytes for those. Text that is not
+        UTF-8 gets the first of config.json's fallback_encodings that
+        decodes it, and the result says `encoding_guessed`.
         
         Args:
             file_path: Path to the file to read
-            max_lines: Maximum number of lines to read (default: 100)
+            max_lines: Maximum number of lines to read (default and upper bound
+                come from config.json: default_max_lines, max_lines_per_file)
+            start_line: Zero-based line number to start reading from (default: 0)
+            byte_offset: Byte offset to start reading from, overrides start_line
+            cursor: Opaque cursor from a previous call, overrides both
+            encoding: Text encoding, e.g. "utf-8" or "cp949" (default: detected)
+            lossy: Replace undecodable bytes with U+FFFD instead of failing
             
         Returns:
-            Dictionary containing file contents and metadata
+            Dictionary containing file contents, encoding, paging metadata
+            and next cursor
         """
         if not self._is_path_allowed(file_path):
             error_result = {
                 "error": "File path not allowed for security reasons",
                 "file_path": file_path
             }
-            logger.warning(f"FileReader: Unauthorized access attempt to {file_path}")
+            logger.warning("FileReader: Unauthorized access attempt to %s", file_path)
             return error_result
         
+        limits = self.settings.current
+        if max_lines is None:
+            max_lines = limits.default_max_lines
+        max_lines = min(max_lines, limits.max_lines_per_file)
+        
+        if max_lines < 0 or start_line < 0 or (byte_offset is not None and byte_offset < 0):
+            return {
+                "error": "max_lines, start_line and byte_offset must not be negative",
+                "file_path": file_path
+            }
+        
+        if encoding is not None:
+            try:
+                line_encoding = splits_on_newline_byte(encoding)
+            except LookupError:
+                return {
+                    "error": f"Unknown encoding '{encoding}'",
+                    "file_path": file_path
+                }
+            if not line_encoding:
+                return {
+                    "error": f"Line windows are not supported for {encoding}; use read_bytes",
+                    "file_path": file_path
+                }
+        
         try:
             path = Path(file_path)
             
-            if not path.exists():
+            try:
+                stat = self.metadata.stat(path)
+            except FileNotFoundError:
                 return {
                     "error": "File not found",
                     "file_path": file_path
                 }
             
-            if not path.is_file():
+            if not S_ISREG(stat.st_mode):
                 return {
                     "error": "Path is not a file",
                     "file_path": file_path
                 }
             
-            # Read file contents
-            with open(path, 'r', encoding='utf-8') as f:
-                lines = []
-                for i, line in enumerate(f):
-                    if i >= max_lines:
-                        break
-                    lines.append(line.rstrip())
+            line_number: Optional[int] = start_line
+            if cursor is not None:
+                try:
+                    position = self._decode_cursor(cursor)
+                    if not isinstance(position.get("o"), int) or position["o"] < 0:
+                        raise ValueError("cursor offset is missing or negative")
+                except (ValueError, TypeError, binascii.Error):
+                    return {
+                        "error": "Invalid cursor",
+                        "file_path": file_path
+                    }
+                byte_offset = position["o"]
+                line_number = position.get("l")
+            elif byte_offset is not None:
+                line_number = None
+            
+            lines: List[str] = []
+            total_lines: Optional[int] = None
+            start = end = 0
+            guessed = False
+            
+            with self._open_content(path) as (stat, mm):
+                # The metadata cache's stat may be up to a TTL old; the index
+                # and the cursor check need the version actually being read
+                if cursor is not None and position.get("i") != stat.st_ino:
+                    return {
+                        "error": "Cursor is stale: the file was replaced since it was issued",
+                        "file_path": file_path
+                    }
+                size = stat.st_size
+                if size > 0:
+                    size = len(mm)
+                    if encoding is None:
+                        encoding, guessed = detect_encoding(mm[:SAMPLE_SIZE], limits.fallback_encodings)
+                        if encoding == BINARY and not lossy:
+                            return {
+                                "error": "File looks binary; use read_bytes, or lossy=True to decode it anyway",
+                                "file_path": file_path,
+                                "encoding": BINARY
+                            }
+                        if encoding == BINARY:
+                            encoding = "utf-8"
+                        elif not splits_on_newline_byte(encoding):
+                            return {
+                                "error": f"File is {encoding} encoded; line windows need read_bytes",
+                                "file_path": file_path,
+                                "encoding": encoding
+                            }
+                    
+                    if cursor is not None:
+                        start = min(byte_offset, size)
+                    elif byte_offset is not None:
+                        start = self._align_to_line(mm, min(byte_offset, size))
+                    elif start_line > 0 and size >= INDEX_MIN_FILE_SIZE:
+                        index = self.line_index.get(stat, mm)
+                        total_lines = index.line_count
+                        checkpoint, checkpoint_line = index.seek(start_line)
+                        start = skip_lines(mm, checkpoint, start_line - checkpoint_line)
+                        if start is None:
+                            start = size
+                    else:
+                        start = skip_lines(mm, 0, start_line)
+                        if start is None:
+                            start = size
+                    
+                    end = start
+                    if max_lines > 0 and start < size:
+                        end = skip_lines(mm, start, max_lines)
+                        if end is None:
+                            end = size
+                        if end - start > limits.max_read_bytes:
+                            # Keep the whole lines that fit in max_read_kb
+                            newline = mm.rfind(b"\n", start, start + limits.max_read_bytes)
+                            if newline == -1:
+                                return {
+                                    "error": f"Line at byte {start} is longer than the "
+                                             f"{limits.max_read_bytes // 1024} KB read limit; use read_bytes",
+                                    "file_path": file_path,
+                                    "file_size": size
+                                }
+                            end = newline + 1
+                        block = mm[start:end].decode(encoding, "replace" if lossy else "strict")
+                        if block.endswith("\n"):
+                            block = block[:-1]
+                        lines = [line.rstrip() for line in block.split("\n")]
+                    if type(mm) is bytes:
+                        self.content_cache.record_served(end - start)
+            
+            has_more = end < size
+            next_line = line_number + len(lines) if line_number is not None else None
             
             result = {
                 "file_path": file_path,
                 "content": lines,
                 "lines_read": len(lines),
-                "file_size": path.stat().st_size,
-                "truncated": len(lines) == max_lines
+                "file_size": size,
+                "start_line": line_number,
+                "total_lines": total_lines,
+                "encoding": encoding,
+                "encoding_guessed": guessed,
+                "start_offset": start,
+                "end_offset": end,
+                "has_more": has_more,
+                "next_cursor": self._encode_cursor(
+                    {"i": stat.st_ino, "o": end, "l": next_line}
+                ) if has_more else None,
+                "truncated": has_more
             }
             
-            logger.info(f"FileReader: Read {len(lines)} lines from {file_path}")
+            logger.info("FileReader: Read %d lines from %s at offset %d", len(lines), file_path, start)
             return result
             
-        except UnicodeDecodeError:
+        except UnicodeDecodeError as e:
             return {
-                "error": "File contains non-text data or unsupported encoding",
+                "error": f"File is not valid {e.encoding} at byte {start + e.start}; "
+                         "pass another encoding or lossy=True",
                 "file_path": file_path
             }
         except Exception as e:
-            logger.error(f"FileReader: Error reading {file_path}: {e}")
+            logger.error("FileReader: Error reading %s: %s", file_path, e)
+            return {
+                "error": f"Failed to read file: {str(e)}",
+                "file_path": file_path
+            }
+
+    def _buffer(self, size: int) -> memoryview:
+        """This thread's reusable read buffer, grown to at least `size` bytes"""
+        buffer = getattr(self._buffers, "buffer", None)
+        if buffer is None or len(buffer) < size:
+            buffer = self._buffers.buffer = bytearray(size)
+        return memoryview(buffer)[:size]
+
+    @staticmethod
+    def _read_into(f: Any, buffer: memoryview, offset: int) -> int:
+        """Fill buffer from offset without an intermediate copy; returns the bytes read"""
+        fd = f.fileno()
+        filled = 0
+        while filled < len(buffer):
+            if hasattr(os, "preadv"):
+                count = os.preadv(fd, [buffer[filled:]], offset + filled)
+            else:
+                f.seek(offset + filled)
+                count = f.readinto(buffer[filled:])
+            if not count:
+                break
+            filled += count
+        return filled
+
+    @tool
+    def read_bytes(
+        self,
+        file_path: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Read a byte range of any file, text or binary, as base64.
+
+        The range is read straight into a per-thread buffer that is reused
+        across calls, so large ranges cost one read and one base64 encode
+        with no per-line work. Access follows the same allowed-directory
+        policy as read_file; files of any size can be read range by range.
+
+        Args:
+            file_path: Path to the file to read
+            offset: Byte offset to start reading from (default: 0)
+            length: Number of bytes to read (default and upper bound come
+                from config.json: max_read_kb)
+
+        Returns:
+            Dictionary containing the base64 data, the detected encoding of
+            the range (and whether it was guessed) and the offset to
+            continue from
+        """
+        if not self._is_path_allowed(file_path):
+            logger.warning("FileReader: Unauthorized access attempt to %s", file_path)
+            return {
+                "error": "File path not allowed for security reasons",
+                "file_path": file_path
+            }
+
+        limits = self.settings.current
+        if length is None:
+            length = limits.max_read_bytes
+        length = min(length, limits.max_read_bytes)
+
+        if offset < 0 or length < 0:
+            return {
+                "error": "offset and length must not be negative",
+                "file_path": file_path
+            }
+
+        try:
+            path = Path(file_path)
+
+            try:
+                stat = self.metadata.stat(path)
+            except FileNotFoundError:
+                return {
+                    "error": "File not found",
+                    "file_path": file_path
+                }
+
+            if not S_ISREG(stat.st_mode):
+                return {
+                    "error": "Path is not a file",
+                    "file_path": file_path
+                }
+
+            with open(path, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                start = min(offset, size)
+                buffer = self._buffer(min(length, size - start))
+                data = buffer[:self._read_into(f, buffer, start)]
+
+            end = start + len(data)
+            has_more = end < size
+            detected, guessed = (
+                detect_encoding(bytes(data[:SAMPLE_SIZE]), limits.fallback_encodings)
+                if data else (None, False)
+            )
+            result = {
+                "file_path": file_path,
+                "offset": start,
+                "length": len(data),
+                "file_size": size,
+                "data": binascii.b2a_base64(data, newline=False).decode("ascii"),
+                "data_encoding": "base64",
+                "detected_encoding": detected,
+                "encoding_guessed": guessed,
+                "has_more": has_more,
+                "next_offset": end if has_more else None
+            }
+
+            logger.info("FileReader: Read %d bytes from %s at offset %d", len(data), file_path, start)
+            return result
+
+        except Exception as e:
+            logger.error("FileReader: Error reading %s: %s", file_path, e)
             return {
                 "error": f"Failed to read file: {str(e)}",
                 "file_path": file_path
             }
+
+    @tool
+    def get_index_stats(self) -> Dict[str, Any]:
+        """
+        Get line-offset index cache statistics.
+        
+        Returns:
+            Dictionary containing hit/miss counters and memory usage
+        """
+        return self.line_index.stats()
     
     @tool
-    def list_files(self, directory_path: str = ".") -> Dict[str, Any]:
+    def get_content_cache_stats(self) -> Dict[str, Any]:
         """
-        List files and directories in a given path.
+        Get file content cache statistics.
+        
+        Returns:
+            Dictionary containing hit ratio, coalesced reads and bytes served from memory
+        """
+        return self.content_cache.stats()
+    
+    @tool
+    def get_metadata_stats(self) -> Dict[str, Any]:
+        """
+        Get stat/listing cache statistics.
+        
+        Returns:
+            Dictionary containing hit ratios and the syscalls saved
+        """
+        return self.metadata.stats()
+    
+    def _walk(
+        self,
+        root: Path,
+        frames: List[List[Any]],
+        recursive: bool,
+        max_depth: int
+    ) -> Iterator[Tuple[str, str, str, List[List[Any]]]]:
+        """
+        Depth-first walk over cached listings that can resume from a saved position.
+        
+        `frames` holds one [relative directory, entries consumed] pair per
+        open directory. Each yielded entry comes with a snapshot of the
+        frames to resume from right after it.
+        
+        Yields:
+            (name, kind, path relative to root, resume frames)
+        """
+        # One slot per frame; a listing is fetched when its frame is on top
+        listings: List[Any] = [None] * len(frames)
+        while frames:
+            depth = len(frames)
+            frame = frames[-1]
+            relative = frame[0]
+            if listings[-1] is None:
+                listings[-1] = self.metadata.listing(root / relative)
+            entries = listings[-1]
+            
+            while frame[1] < len(entries):
+                name, kind, is_symlink = entries[frame[1]]
+                frame[1] += 1
+                entry_path = f"{relative}/{name}" if relative else name
+                descend = (
+                    recursive
+                    and depth < max_depth
+                    and kind == "directory"
+                    and not is_symlink
+                )
+                if descend:
+                    frames.append([entry_path, 0])
+                    listings.append(None)
+                yield name, kind, entry_path, [frame[:] for frame in frames]
+                if descend:
+                    break
+            else:
+                listings.pop()
+                frames.pop()
+    
+    def _check_frames(self, root: Path, frames: Any, max_frames: int) -> None:
+        """
+        Check that cursor frames name only directories the walk itself could
+        have entered: a chain of real (not symlinked) subdirectories of root,
+        one level per frame, that still resolves inside an allowed directory.
+        
+        Raises:
+            ValueError: If the frames are malformed or point anywhere else
+        """
+        if not isinstance(frames, list) or not 0 < len(frames) <= max_frames:
+            raise ValueError("cursor frames are malformed")
+        parent: List[str] = []
+        for index, frame in enumerate(frames):
+            if not (
+                isinstance(frame, list) and len(frame) == 2
+                and isinstance(frame[0], str)
+                and isinstance(frame[1], int) and not isinstance(frame[1], bool)
+                and frame[1] >= 0
+            ):
+                raise ValueError("cursor frames are malformed")
+            if index == 0:
+                if frame[0] != "":
+                    raise ValueError("cursor does not start at the listed directory")
+                continue
+            parts = frame[0].split("/")
+            if parts[:-1] != parent or parts[-1] in ("", ".", ".."):
+                raise ValueError("cursor frames are not nested directories")
+            # lstat, so a symlinked directory is rejected as the walk skips it
+            try:
+                is_directory = S_ISDIR(os.lstat(root / frame[0]).st_mode)
+            except OSError:
+                is_directory = False
+            if not is_directory:
+                raise ValueError("cursor frame is not a directory")
+            parent = parts
+        if parent:
+            deepest = os.path.realpath(root / frames[-1][0])
+            if not self._is_path_allowed(deepest):
+                raise ValueError("cursor frame is outside the allowed directories")
+    
+    @tool
+    def list_files(
+        self,
+        directory_path: str = ".",
+        page_size: int = 1000,
+        cursor: Optional[str] = None,
+        recursive: bool = False,
+        max_depth: int = 10,
+        pattern: Optional[str] = None,
+        extensions: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        List files and directories in a given path, one page at a time.
+        
+        Entries come in os.scandir order from the shared metadata cache, so
+        an unchanged directory is revalidated with one stat instead of being
+        rescanned for every page; pass next_cursor back to continue.
         
         Args:
             directory_path: Path to the directory to list (default: current directory)
+            page_size: Maximum number of entries per page (default: 1000)
+            cursor: Opaque cursor from a previous call with the same arguments
+            recursive: Walk subdirectories depth-first (symlinks are not followed)
+            max_depth: Deepest directory level to enter when recursive (default: 10)
+            pattern: Glob matched against file names, e.g. "*.py"
+            extensions: File extensions to keep, e.g. [".py", ".md"]
+            
+        When a pattern or extensions are given, only matching files are
+        returned; directories are still walked but not listed.
             
         Returns:
-            Dictionary containing list of files and directories
+            Dictionary containing a page of files and directories and the next cursor
         """
         if not self._is_path_allowed(directory_path):
             error_result = {
                 "error": "Directory path not allowed for security reasons",
                 "directory_path": directory_path
             }
-            logger.warning(f"FileReader: Unauthorized access attempt to {directory_path}")
+            logger.warning("FileReader: Unauthorized access attempt to %s", directory_path)
             return error_result
         
+        if page_size < 1 or max_depth < 1:
+            return {
+                "error": "page_size and max_depth must be at least 1",
+                "directory_path": directory_path
+            }
+        
         try:
             path = Path(directory_path)
             
-            if not path.exists():
+            try:
+                directory_stat = self.metadata.stat(path)
+            except FileNotFoundError:
                 return {
                     "error": "Directory not found",
                     "directory_path": directory_path
                 }
             
-            if not path.is_dir():
+            if not S_ISDIR(directory_stat.st_mode):
                 return {
                     "error": "Path is not a directory", 
                     "directory_path": directory_path
                 }
             
+            frames: List[List[Any]] = [["", 0]]
+            if cursor is not None:
+                try:
+                    frames = self._decode_cursor(cursor)["frames"]
+                    self._check_frames(path, frames, max_depth if recursive else 1)
+                except (ValueError, TypeError, KeyError, binascii.Error):
+                    return {
+                        "error": "Invalid cursor",
+                        "directory_path": directory_path
+                    }
+            
+            suffixes = tuple(extension.lower() for extension in extensions) if extensions else None
+            filtered = pattern is not None or suffixes is not None
+            
             files = []
             directories = []
-            
-            for item in sorted(path.iterdir()):
-                if item.is_file():
-                    files.append({
-                        "name": item.name,
-                        "size": item.stat().st_size,
-                        "type": "file"
-                    })
-                elif item.is_dir():
-                    directories.append({
-                        "name": item.name,
-                        "type": "directory"
-                    })
+            resume: Optional[List[List[Any]]] = None
+            has_more = False
+            for name, kind, entry_path, snapshot in self._walk(path, frames, recursive, max_depth):
+                is_file = kind == "file"
+                if filtered and (
+                    not is_file
+                    or (pattern is not None and not fnmatch.fnmatch(name, pattern))
+                    or (suffixes is not None and not name.lower().endswith(suffixes))
+                ):
+                    continue
+                if kind == "other":
+                    continue
+                if len(files) + len(directories) == page_size:
+                    has_more = True
+                    break
+                item: Dict[str, Any] = {"name": name}
+                if recursive:
+                    item["path"] = entry_path
+                if is_file:
+                    item["size"] = self.metadata.stat(path / entry_path).st_size
+                    item["type"] = "file"
+                    files.append(item)
+                else:
+                    item["type"] = "directory"
+                    directories.append(item)
+                resume = snapshot
             
             result = {
                 "directory_path": directory_path,
                 "files": files,
                 "directories": directories,
                 "total_files": len(files),
-                "total_directories": len(directories)
+                "total_directories": len(directories),
+                "has_more": has_more,
+                "next_cursor": self._encode_cursor({"frames": resume}) if has_more else None
             }
             
-            logger.info(f"FileReader: Listed {len(files)} files and {len(directories)} directories in {directory_path}")
+            logger.info("FileReader: Listed %d files and %d directories in %s",
+                        len(files), len(directories), directory_path)
             return result
             
         except Exception as e:
-            logger.error(f"FileReader: Error listing {directory_path}: {e}")
+            logger.error("FileReader: Error listing %s: %s", directory_path, e)
             return {
                 "error": f"Failed to list directory: {str(e)}",
                 "directory_path": directory_path
-            }
\ No newline at end of file
+            }
@@ -0,0 +1,98 @@
+"""
+File Search Tool
+
+Full-text search over the text files in the allowed directories.
+"""
+
+from fastmcp import tool
+from typing import Dict, Any
+import os
+import time
+import logging
+from .path_guard import AllowedRoots
+from .search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on results per query
+MAX_SEARCH_RESULTS = 100
+
+
+class FileSearchTool:
+    """Search tool answering "where is X mentioned" from an on-disk index"""
+
+    def __init__(self, index: SearchIndex, allowed_roots: AllowedRoots):
+        self.index = index
+        # Shared with FileReaderTool, so both always agree on what is readable
+        self.allowed_roots = allowed_roots
+
+    @tool
+    def search_files(self, query: str, path: str = ".", limit: int = 20) -> Dict[str, Any]:
+        """
+        Search text files under a directory, best matches first.
+
+        When the index is older than the configured refresh interval, it is
+        refreshed in the background (changed files only); until that
+        finishes, results come from the current index and
+        index_refreshing is true.
+
+        Args:
+            query: Words to find; use "quoted phrases" for exact phrases
+                and a trailing * for prefixes, e.g. 'cursor "line index" pagin*'
+            path: Directory to search under (default: current directory)
+            limit: Maximum number of results (default: 20, at most 100)
+
+        Returns:
+            Dictionary containing ranked results with snippets
+        """
+        if not self.allowed_roots.is_allowed(path):
+            logger.warning("FileSearch: Unauthorized search in %s", path)
+            return {
+                "error": "Directory path not allowed for security reasons",
+                "path": path
+            }
+
+        if not 1 <= limit <= MAX_SEARCH_RESULTS:
+            return {
+                "error": f"limit must be between 1 and {MAX_SEARCH_RESULTS}",
+                "path": path
+            }
+
+        started = time.perf_counter()
+        try:
+            refreshing = self.index.refresh_if_stale(self.allowed_roots.roots)
+            results = self.index.search(query, os.path.realpath(path), limit)
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "query": query,
+                "path": path
+            }
+        except Exception as e:
+            logger.error("FileSearch: Error searching for %r: %s", query, e)
+            return {
+                "error": f"Search failed: {str(e)}",
+                "query": query,
+                "path": path
+            }
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info("FileSearch: %d results for %r in %.1fms", len(results), query, elapsed_ms)
+        return {
+            "query": query,
+            "path": path,
+            "results": results,
+            "result_count": len(results),
+            "index_refreshing": refreshing,
+            "elapsed_ms": round(elapsed_ms, 2)
+        }
+
+    @tool
+    def get_index_stats(self) -> Dict[str, Any]:
+        """
+        Get search index statistics.
+
+        Returns:
+            Dictionary containing indexed file counts, index size and the last refresh
+        """
+        return self.index.stats()
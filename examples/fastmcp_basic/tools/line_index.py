@@ -0,0 +1,244 @@
+"""
+Line Index
+
+Sparse line-offset indexes that let FileReaderTool seek to a line number
+without scanning the file from byte 0.
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+import os
+import mmap
+import struct
+import hashlib
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Newlines are counted a block at a time when seeking to a line number
+SCAN_BLOCK_SIZE = 1024 * 1024
+
+# Sidecar file layout: magic, stride, line count, then the key fields
+_HEADER = struct.Struct("<8s7Q")
+_MAGIC = b"LNIDX001"
+
+IndexKey = Tuple[int, int, int, int]
+
+
+def skip_lines(mm: mmap.mmap, offset: int, count: int) -> Optional[int]:
+    """
+    Return the byte offset `count` lines after `offset`.
+
+    Whole blocks are skipped with a C-level newline count, so only the
+    final block is searched line by line. Returns None when the file has
+    fewer lines than requested.
+    """
+    size = len(mm)
+    while count > 0 and offset < size:
+        end = min(offset + SCAN_BLOCK_SIZE, size)
+        newlines = mm[offset:end].count(b"\n")
+        if newlines < count:
+            count -= newlines
+            offset = end
+            continue
+        while count > 0:
+            offset = mm.find(b"\n", offset, end) + 1
+            count -= 1
+    if count > 0:
+        return None
+    return offset
+
+
+def index_key(stat: os.stat_result) -> IndexKey:
+    """Identity of a file version: (device, inode, size, mtime_ns)"""
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class LineIndex:
+    """Byte offsets of every `stride`-th line of one version of a file"""
+
+    def __init__(self, key: IndexKey, stride: int, offsets: array, line_count: int):
+        self.key = key
+        self.stride = stride
+        self.offsets = offsets
+        self.line_count = line_count
+
+    @classmethod
+    def build(cls, key: IndexKey, mm: mmap.mmap, stride: int) -> "LineIndex":
+        """Scan a mapped file once, recording the start of every stride-th line"""
+        offsets = array("Q", [0])
+        size = len(mm)
+        offset = 0
+        lines = 0
+        while offset < size:
+            end = min(offset + SCAN_BLOCK_SIZE, size)
+            newlines = mm[offset:end].count(b"\n")
+            # Distance (in lines) from `offset` to the next checkpoint
+            to_next = stride - lines % stride
+            if newlines < to_next:
+                lines += newlines
+                offset = end
+                continue
+            position = offset
+            while position < end:
+                newline = mm.find(b"\n", position, end)
+                if newline == -1:
+                    break
+                position = newline + 1
+                lines += 1
+                if lines % stride == 0:
+                    offsets.append(position)
+            offset = end
+        if size and mm[size - 1:size] != b"\n":
+            lines += 1
+        # A checkpoint at EOF would point past the last line
+        if len(offsets) > 1 and offsets[-1] >= size:
+            offsets.pop()
+        return cls(key, stride, offsets, lines)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint of the index"""
+        return len(self.offsets) * self.offsets.itemsize + 128
+
+    def seek(self, line: int) -> Tuple[int, int]:
+        """
+        Find the nearest checkpoint at or before a line.
+
+        Returns:
+            (byte offset of the checkpoint, line number of the checkpoint)
+        """
+        slot = min(line // self.stride, len(self.offsets) - 1)
+        return self.offsets[slot], slot * self.stride
+
+
+class LineIndexCache:
+    """LRU of line indexes bounded by total memory, optionally persisted to disk"""
+
+    def __init__(
+        self,
+        stride: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        cache_dir: Optional[str] = None
+    ):
+        self.stride = stride
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[IndexKey, LineIndex]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    def get(self, stat: os.stat_result, mm: mmap.mmap) -> LineIndex:
+        """Return the index for a file version, loading or building it on a miss"""
+        key = index_key(stat)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = self._load(key)
+        loaded = index is not None
+        if index is None:
+            index = LineIndex.build(key, mm, self.stride)
+            self._save(index)
+
+        with self._lock:
+            if loaded:
+                self.disk_hits += 1
+            else:
+                self.builds += 1
+            if key not in self._entries:
+                self._entries[key] = index
+                self._memory_bytes += index.nbytes
+                self._evict()
+        return index
+
+    def _evict(self) -> None:
+        """Drop least recently used indexes until under the memory budget"""
+        while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._memory_bytes -= old.nbytes
+            self.evictions += 1
+
+    def _sidecar(self, key: IndexKey) -> Optional[Path]:
+        """
+        Sidecar path of a file, named by (device, inode) only: a new version
+        of a growing file overwrites its old index instead of adding one
+        """
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(repr((key[:2], self.stride)).encode("ascii")).hexdigest()
+        return self.cache_dir / f"{digest}.idx"
+
+    def _load(self, key: IndexKey) -> Optional[LineIndex]:
+        """Read a persisted index, ignoring missing or mismatching sidecars"""
+        sidecar = self._sidecar(key)
+        if sidecar is None or not sidecar.exists():
+            return None
+        try:
+            with open(sidecar, "rb") as f:
+                magic, stride, line_count, *stored_key = _HEADER.unpack(
+                    f.read(_HEADER.size)
+                )
+                if magic != _MAGIC or stride != self.stride or tuple(stored_key[:4]) != key:
+                    return None
+                offsets = array("Q")
+                offsets.frombytes(f.read(stored_key[4] * offsets.itemsize))
+            if len(offsets) != stored_key[4]:
+                raise ValueError(f"{len(offsets)} of {stored_key[4]} offsets present")
+            return LineIndex(key, stride, offsets, line_count)
+        except (OSError, struct.error, ValueError) as e:
+            logger.warning("LineIndex: Ignoring unreadable sidecar %s: %s", sidecar, e)
+            return None
+
+    def _save(self, index: LineIndex) -> None:
+        """Persist an index atomically next to the other sidecars"""
+        sidecar = self._sidecar(index.key)
+        if sidecar is None:
+            return
+        tmp = None
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file per writer, so threads or workers indexing the same
+            # file never publish each other's half-written sidecar
+            fd, tmp = tempfile.mkstemp(dir=sidecar.parent, prefix=sidecar.stem, suffix=".tmp")
+            with open(fd, "wb") as f:
+                f.write(_HEADER.pack(
+                    _MAGIC, index.stride, index.line_count, *index.key, len(index.offsets)
+                ))
+                index.offsets.tofile(f)
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            logger.warning("LineIndex: Could not persist index to %s: %s", sidecar, e)
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage for tuning the budget"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "stride": self.stride,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "builds": self.builds,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "cache_dir": str(self.cache_dir) if self.cache_dir else None
+            }
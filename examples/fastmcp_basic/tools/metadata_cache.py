@@ -0,0 +1,145 @@
+"""
+Metadata Cache
+
+Shared stat and directory-listing cache for FileReaderTool, so repeated
+calls on the same paths do not repeat the same syscalls.
+"""
+
+from typing import Dict, Any, Callable, Tuple, Union
+from collections import OrderedDict
+from pathlib import Path
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# (name, "file" | "directory" | "other", is_symlink); types follow symlinks
+ListingEntry = Tuple[str, str, bool]
+
+
+class MetadataCache:
+    """
+    Bounded LRU of stat results and directory listings.
+
+    Stat results are trusted for `stat_ttl_seconds`. A directory listing is
+    stored with the directory's (inode, mtime_ns) and reused for as long as
+    a stat of the directory still reports them, since adding, removing or
+    renaming an entry updates the directory mtime. Changes inside files do
+    not, so sizes are never taken from a listing.
+    """
+
+    def __init__(
+        self,
+        stat_ttl_seconds: float = 1.0,
+        max_stats: int = 8192,
+        max_listings: int = 256,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.stat_ttl_seconds = stat_ttl_seconds
+        self.max_stats = max_stats
+        self.max_listings = max_listings
+        self._clock = clock
+        self._stats: "OrderedDict[str, Tuple[float, os.stat_result]]" = OrderedDict()
+        self._listings: "OrderedDict[str, Tuple[Tuple[int, int], Tuple[ListingEntry, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stat_hits = 0
+        self.stat_misses = 0
+        self.listing_hits = 0
+        self.listing_misses = 0
+        self.entries_reused = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.abspath(path)
+
+    def stat(self, path: Union[str, Path]) -> os.stat_result:
+        """
+        Return os.stat() of a path, at most `stat_ttl_seconds` old.
+
+        Raises:
+            OSError: As os.stat does, e.g. FileNotFoundError. Failures are
+                not cached.
+        """
+        key = self._key(path)
+        now = self._clock()
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is not None and now - entry[0] < self.stat_ttl_seconds:
+                self._stats.move_to_end(key)
+                self.stat_hits += 1
+                return entry[1]
+            self.stat_misses += 1
+
+        result = os.stat(key)
+        with self._lock:
+            self._stats[key] = (now, result)
+            self._stats.move_to_end(key)
+            while len(self._stats) > self.max_stats:
+                self._stats.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def listing(self, path: Union[str, Path]) -> Tuple[ListingEntry, ...]:
+        """
+        Return the entries of a directory in os.scandir order.
+
+        A cached listing is revalidated with one stat of the directory
+        instead of being rescanned.
+
+        Raises:
+            OSError: If the directory cannot be stat'ed or scanned
+        """
+        key = self._key(path)
+        stat = self.stat(key)
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached[0] == version:
+                self._listings.move_to_end(key)
+                self.listing_hits += 1
+                self.entries_reused += len(cached[1])
+                return cached[1]
+            self.listing_misses += 1
+
+        entries = []
+        with os.scandir(key) as iterator:
+            for entry in iterator:
+                if entry.is_file():
+                    kind = "file"
+                elif entry.is_dir():
+                    kind = "directory"
+                else:
+                    kind = "other"
+                entries.append((entry.name, kind, entry.is_symlink()))
+        listing = tuple(entries)
+
+        with self._lock:
+            self._listings[key] = (version, listing)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.max_listings:
+                self._listings.popitem(last=False)
+                self.evictions += 1
+        logger.debug("MetadataCache: Scanned %d entries in %s", len(listing), key)
+        return listing
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratios and the stat calls and directory scans avoided"""
+        with self._lock:
+            lookups = self.stat_hits + self.stat_misses + self.listing_hits + self.listing_misses
+            return {
+                "stat_entries": len(self._stats),
+                "listing_entries": len(self._listings),
+                "stat_ttl_seconds": self.stat_ttl_seconds,
+                "stat_hits": self.stat_hits,
+                "stat_misses": self.stat_misses,
+                "listing_hits": self.listing_hits,
+                "listing_misses": self.listing_misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.stat_hits + self.listing_hits) / lookups if lookups else 0.0,
+                "saved_stat_calls": self.stat_hits,
+                "saved_directory_scans": self.listing_hits,
+                "saved_entry_reads": self.entries_reused
+            }
@@ -0,0 +1,86 @@
+"""
+Path Guard
+
+Authorizes file paths against a set of allowed root directories for
+FileReaderTool. Roots are resolved once into a path-component trie, so a
+check costs one resolve of the requested path plus a walk over its
+components, however many roots are configured.
+"""
+
+from typing import Any, Dict, Iterable, Union
+from collections import OrderedDict
+from pathlib import Path
+import os
+import threading
+
+# Marks a trie node that is itself an allowed root
+_ROOT = None
+
+
+def _components(resolved: str) -> list:
+    """Split an absolute, resolved path into comparable components"""
+    return [part for part in os.path.normcase(resolved).split(os.sep) if part]
+
+
+class AllowedRoots:
+    """Prefix trie of resolved allowed roots with an LRU of recent decisions"""
+
+    def __init__(self, roots: Iterable[Union[str, Path]], cache_size: int = 1024):
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self.update(roots)
+
+    def update(self, roots: Iterable[Union[str, Path]]) -> None:
+        """
+        Replace the allowed roots, e.g. after the configuration changed.
+
+        Roots are resolved here, once, and cached decisions are dropped.
+        """
+        trie: Dict[Any, Any] = {}
+        resolved = []
+        for root in roots:
+            path = os.path.realpath(root)
+            resolved.append(path)
+            node = trie
+            for part in _components(path):
+                node = node.setdefault(part, {})
+            node[_ROOT] = True
+        with self._lock:
+            self.roots = resolved
+            self._trie = trie
+            self._decisions: "OrderedDict[str, bool]" = OrderedDict()
+
+    def _match(self, resolved: str) -> bool:
+        node = self._trie
+        if _ROOT in node:
+            return True
+        for part in _components(resolved):
+            node = node.get(part)
+            if node is None:
+                return False
+            if _ROOT in node:
+                return True
+        return False
+
+    def is_allowed(self, path: Union[str, Path]) -> bool:
+        """
+        Check whether a path resolves to somewhere inside an allowed root.
+
+        Decisions are cached by the resolved path rather than the requested
+        one, so a symlink retargeted after a check cannot reuse a stale
+        decision.
+        """
+        try:
+            resolved = os.path.realpath(path)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            decision = self._decisions.get(resolved)
+            if decision is not None:
+                self._decisions.move_to_end(resolved)
+                return decision
+            decision = self._match(resolved)
+            self._decisions[resolved] = decision
+            if len(self._decisions) > self.cache_size:
+                self._decisions.popitem(last=False)
+        return decision
@@ -0,0 +1,345 @@
+"""
+Search Index
+
+On-disk full-text index of the text files under FileReaderTool's allowed
+roots, stored in an SQLite FTS5 table. Refreshes only re-read files whose
+mtime or size changed, in a background thread that writes them in
+batches, so searches keep using the current index while it refreshes.
+"""
+
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTENSIONS = [
+    ".py", ".md", ".txt", ".rst", ".json", ".toml", ".yaml", ".yml",
+    ".cfg", ".ini", ".js", ".ts", ".html", ".css", ".sh"
+]
+
+# Directory names never descended into
+SKIP_DIRECTORIES = {"__pycache__", "node_modules", "venv", "site-packages"}
+
+# Below this many changed files, reading inline beats handing them to reader threads
+PARALLEL_MIN_FILES = 32
+
+# Changed files read and written per transaction, so a refresh holds at most
+# this many texts in memory and searches run between batches
+REFRESH_BATCH_SIZE = 256
+
+# Files with a NUL byte in their first block are treated as binary
+_SNIFF_SIZE = 8192
+
+# Bare terms, optionally with a trailing * for prefix search, and "quoted phrases"
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|([^\s"]+)')
+_WORD = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(content, tokenize = 'unicode61');
+"""
+
+
+def read_text(path: str) -> Optional[str]:
+    """Read a file as UTF-8 text for indexing; None for binary or unreadable files"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if b"\0" in data[:_SNIFF_SIZE]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+def build_match(query: str) -> str:
+    """
+    Translate a user query into an FTS5 MATCH expression.
+
+    Every term is quoted, so FTS5 operators in user input are matched as
+    text instead of being interpreted. Terms are ANDed together.
+
+    Args:
+        query: Words, "quoted phrases" and prefix terms ending in *
+
+    Raises:
+        ValueError: If the query contains no searchable words
+    """
+    parts = []
+    for phrase, term in _QUERY_TOKEN.findall(query):
+        words = _WORD.findall(phrase if phrase else term)
+        if not words:
+            continue
+        expression = '"' + " ".join(words) + '"'
+        if term.endswith("*"):
+            expression += " *"
+        parts.append(expression)
+    if not parts:
+        raise ValueError("Query contains no searchable words")
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of text files, refreshed incrementally by mtime"""
+
+    def __init__(
+        self,
+        index_path: str,
+        extensions: Optional[List[str]] = None,
+        max_file_size: int = 1024 * 1024,
+        workers: Optional[int] = None,
+        refresh_interval_seconds: float = 30.0
+    ):
+        self.index_path = str(index_path)
+        self.extensions = tuple(extension.lower() for extension in (extensions or DEFAULT_EXTENSIONS))
+        self.max_file_size = max_file_size
+        self.workers = workers or os.cpu_count() or 1
+        self.refresh_interval_seconds = refresh_interval_seconds
+        # Guards the database connection and the refresh state
+        self._lock = threading.Lock()
+        # Held for a whole refresh, so two refreshes never walk the tree at once
+        self._refresh_lock = threading.RLock()
+        self._refresher: Optional[threading.Thread] = None
+        Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._roots: Tuple[str, ...] = ()
+        self._refreshed_at: Optional[float] = None
+        self.last_refresh: Dict[str, Any] = {}
+        self.queries = 0
+
+    def _walk(self, roots: Iterable[str]) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield indexable files under the roots; symlinks and hidden directories are skipped"""
+        index_file = os.path.realpath(self.index_path)
+        stack = list(roots)
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_symlink():
+                            continue
+                        if entry.is_dir():
+                            if not entry.name.startswith(".") and entry.name not in SKIP_DIRECTORIES:
+                                stack.append(entry.path)
+                        elif entry.name.lower().endswith(self.extensions) and entry.path != index_file:
+                            stat = entry.stat()
+                            if stat.st_size <= self.max_file_size:
+                                yield entry.path, stat
+            except OSError as e:
+                logger.warning("SearchIndex: Skipping %s: %s", directory, e)
+
+    def refresh(self, roots: Iterable[str]) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the files under the roots.
+
+        Nested roots are walked once. New and modified files are re-read,
+        files that disappeared (or whose root was removed) are dropped.
+
+        Returns:
+            Counts of scanned, updated and removed files and the time taken
+        """
+        started = time.perf_counter()
+        ordered = sorted(set(roots))
+        top_level = [
+            root for root in ordered
+            if not any(root != other and root.startswith(other.rstrip(os.sep) + os.sep) for other in ordered)
+        ]
+
+        with self._refresh_lock:
+            with self._lock:
+                known = {
+                    path: (file_id, mtime_ns, size)
+                    for file_id, path, mtime_ns, size in self._db.execute(
+                        "SELECT id, path, mtime_ns, size FROM files"
+                    )
+                }
+            seen = set()
+            changed: List[Tuple[str, os.stat_result]] = []
+            for path, stat in self._walk(top_level):
+                seen.add(path)
+                previous = known.get(path)
+                if previous is None or previous[1:] != (stat.st_mtime_ns, stat.st_size):
+                    changed.append((path, stat))
+            removed = [known[path][0] for path in known.keys() - seen]
+
+            with self._lock, self._db:
+                self._db.executemany("DELETE FROM documents WHERE rowid = ?", ((i,) for i in removed))
+                self._db.executemany("DELETE FROM files WHERE id = ?", ((i,) for i in removed))
+
+            # read_text spends its time in file reads, which release the GIL
+            parallel = len(changed) >= PARALLEL_MIN_FILES and self.workers > 1
+            pool = ThreadPoolExecutor(self.workers, thread_name_prefix="search-index") if parallel else None
+            try:
+                for start in range(0, len(changed), REFRESH_BATCH_SIZE):
+                    batch = changed[start:start + REFRESH_BATCH_SIZE]
+                    paths = [path for path, _ in batch]
+                    texts = list(pool.map(read_text, paths)) if pool is not None else list(map(read_text, paths))
+                    with self._lock, self._db:
+                        self._store(batch, texts)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+            with self._lock:
+                self._roots = tuple(ordered)
+                self._refreshed_at = time.monotonic()
+                self.last_refresh = {
+                    "scanned_files": len(seen),
+                    "updated_files": len(changed),
+                    "removed_files": len(removed),
+                    "parallel": parallel,
+                    "seconds": time.perf_counter() - started
+                }
+        logger.info("SearchIndex: Refreshed %d files (%d updated, %d removed) in %.3fs",
+                    len(seen), len(changed), len(removed), self.last_refresh["seconds"])
+        return self.last_refresh
+
+    def _store(self, batch: List[Tuple[str, os.stat_result]], texts: List[Optional[str]]) -> None:
+        """Write a batch of re-read files (lock and transaction held)"""
+        for (path, stat), text in zip(batch, texts):
+            # Binary files keep a row so they are not re-read until they change
+            file_id = self._db.execute(
+                "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size "
+                "RETURNING id",
+                (path, stat.st_mtime_ns, stat.st_size)
+            ).fetchone()[0]
+            # Delete by id rather than by what this refresh saw: another
+            # HTTP worker sharing the index may have stored the file meanwhile
+            self._db.execute("DELETE FROM documents WHERE rowid = ?", (file_id,))
+            if text is not None:
+                self._db.execute(
+                    "INSERT INTO documents (rowid, content) VALUES (?, ?)", (file_id, text)
+                )
+
+    def _is_stale(self, roots: Tuple[str, ...]) -> bool:
+        return (
+            self._refreshed_at is None
+            or roots != self._roots
+            or time.monotonic() - self._refreshed_at >= self.refresh_interval_seconds
+        )
+
+    def _refresh_stale(self, roots: Tuple[str, ...]) -> None:
+        with self._refresh_lock:
+            # Another refresh may have brought the index up to date meanwhile
+            if not self._is_stale(roots):
+                return
+            try:
+                self.refresh(roots)
+            except Exception as e:
+                logger.error("SearchIndex: Refresh failed: %s", e)
+
+    def refresh_if_stale(self, roots: Iterable[str]) -> bool:
+        """
+        Start a background refresh when the roots changed or the refresh
+        interval has passed. Searches use the current index meanwhile.
+
+        Returns:
+            True if a refresh is running
+        """
+        roots = tuple(sorted(set(roots)))
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return True
+            if not self._is_stale(roots):
+                return False
+            self._refresher = threading.Thread(
+                target=self._refresh_stale, args=(roots,), name="search-index-refresh", daemon=True
+            )
+            self._refresher.start()
+        return True
+
+    @property
+    def refreshing(self) -> bool:
+        refresher = self._refresher
+        return refresher is not None and refresher.is_alive()
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background refresh started by refresh_if_stale"""
+        refresher = self._refresher
+        if refresher is not None:
+            refresher.join(timeout)
+
+    def search(
+        self,
+        query: str,
+        directory: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank indexed files by BM25 relevance to a query.
+
+        Args:
+            query: Words, "quoted phrases" and prefix terms ending in *
+            directory: Only return files under this resolved directory
+            limit: Maximum number of results
+
+        Returns:
+            List of {"path", "score", "snippet"}, best match first; matched
+            terms in snippets are wrapped in [ ]
+
+        Raises:
+            ValueError: If the query contains no searchable words
+        """
+        match = build_match(query)
+        sql = (
+            "SELECT files.path, bm25(documents), "
+            "snippet(documents, 0, '[', ']', '...', 16) "
+            "FROM documents JOIN files ON files.id = documents.rowid "
+            "WHERE documents MATCH ?"
+        )
+        params: List[Any] = [match]
+        if directory is not None:
+            prefix = directory.rstrip(os.sep) + os.sep
+            sql += " AND substr(files.path, 1, ?) = ?"
+            params += [len(prefix), prefix]
+        sql += " ORDER BY bm25(documents) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            self.queries += 1
+            rows = self._db.execute(sql, params).fetchall()
+        # bm25() is lower-is-better; report higher-is-better scores
+        return [
+            {"path": path, "score": round(-score, 4), "snippet": snippet}
+            for path, score, snippet in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed file counts, index size and the last refresh"""
+        with self._lock:
+            files = self._db.execute("SELECT count(*) FROM files").fetchone()[0]
+            documents = self._db.execute("SELECT count(*) FROM documents").fetchone()[0]
+        return {
+            "index_path": self.index_path,
+            "index_bytes": sum(
+                os.path.getsize(path) for path in (self.index_path, self.index_path + "-wal")
+                if os.path.exists(path)
+            ),
+            "files": files,
+            "text_documents": documents,
+            "roots": list(self._roots),
+            "refreshing": self.refreshing,
+            "queries": self.queries,
+            "refresh_interval_seconds": self.refresh_interval_seconds,
+            "last_refresh": self.last_refresh
+        }
+
+    def close(self) -> None:
+        self.wait_for_refresh()
+        with self._lock:
+            self._db.close()
@@ -5,12 +5,29 @@ Provides various text manipulation and processing utilities.
 """
 
 from fastmcp import tool
-from typing import Dict, Any
+from typing import Dict, Any, List, Iterator, Tuple, Callable, Union
+from collections import Counter
+from operator import itemgetter
 import re
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Same word definition as before: runs of word characters
+WORD_PATTERN = re.compile(r'\b\w+\b')
+NON_WORD_PATTERN = re.compile(r'\W')
+
+# Characters matched per regex pass in count_words
+CHUNK_SIZE = 64 * 1024
+
+# String-to-string steps available to process_batch
+TRANSFORMS: Dict[str, Callable[[str], str]] = {
+    "uppercase": str.upper,
+    "lowercase": str.lower,
+    "reverse": lambda text: text[::-1],
+}
+
 class TextProcessorTool:
     """Text processor tool for string manipulation"""
     
@@ -30,7 +47,7 @@ class TextProcessorTool:
             "converted": text.upper(),
             "operation": "to_uppercase"
         }
-        logger.info(f"TextProcessor: Converted text to uppercase (length: {len(text)})")
+        logger.info("TextProcessor: Converted text to uppercase (length: %d)", len(text))
         return result
     
     @tool
@@ -49,7 +66,7 @@ class TextProcessorTool:
             "converted": text.lower(),
             "operation": "to_lowercase"
         }
-        logger.info(f"TextProcessor: Converted text to lowercase (length: {len(text)})")
+        logger.info("TextProcessor: Converted text to lowercase (length: %d)", len(text))
         return result
     
     @tool
@@ -68,34 +85,168 @@ class TextProcessorTool:
             "converted": text[::-1],
             "operation": "reverse_text"
         }
-        logger.info(f"TextProcessor: Reversed text (length: {len(text)})")
+        logger.info("TextProcessor: Reversed text (length: %d)", len(text))
         return result
     
     @tool
-    def count_words(self, text: str) -> Dict[str, Any]:
+    def count_words(
+        self,
+        text: str,
+        include_text: bool = True,
+        include_words: bool = True,
+        top_k: int = 0
+    ) -> Dict[str, Any]:
         """
         Count words, characters, and lines in text.
         
+        Character, space and line counts are single C-level scans of the
+        input; words are matched one chunk at a time so no full-size copies
+        of the text are made. Skip the echo and word list for large inputs.
+        
         Args:
             text: Text to analyze
+            include_text: Echo the input text in the result (default: True)
+            include_words: Return the list of words (default: True)
+            top_k: Return the k most frequent words, case-insensitive (default: 0)
             
         Returns:
             Dictionary containing text statistics
         """
-        lines = text.split('\n')
-        words = re.findall(r'\b\w+\b', text)
         characters = len(text)
-        characters_no_spaces = len(text.replace(' ', ''))
+        characters_no_spaces = characters - text.count(' ')
+        line_count = text.count('\n') + 1
         
-        result = {
-            "text": text,
-            "word_count": len(words),
+        word_count = 0
+        words: List[str] = []
+        frequencies: Counter = Counter()
+        for start, end in self._word_spans(text):
+            chunk_words = WORD_PATTERN.findall(text, start, end)
+            word_count += len(chunk_words)
+            if include_words:
+                words.extend(chunk_words)
+            if top_k > 0:
+                frequencies.update(map(str.lower, chunk_words))
+        
+        result: Dict[str, Any] = {}
+        if include_text:
+            result["text"] = text
+        result.update({
+            "word_count": word_count,
             "character_count": characters,
             "character_count_no_spaces": characters_no_spaces,
-            "line_count": len(lines),
-            "words": words,
-            "operation": "count_words"
+            "line_count": line_count
+        })
+        if include_words:
+            result["words"] = words
+        if top_k > 0:
+            result["unique_word_count"] = len(frequencies)
+            result["top_words"] = [
+                {"word": word, "count": count}
+                for word, count in heapq.nlargest(top_k, frequencies.items(), key=itemgetter(1))
+            ]
+        result["operation"] = "count_words"
+        
+        logger.info("TextProcessor: Analyzed text - %d words, %d chars, %d lines",
+                    word_count, characters, line_count)
+        return result
+    
+    @staticmethod
+    def _count(text: str) -> Dict[str, int]:
+        """Compact statistics used as the terminal "count" step of a pipeline"""
+        return {
+            "word_count": len(WORD_PATTERN.findall(text)),
+            "character_count": len(text),
+            "line_count": text.count('\n') + 1
         }
+    
+    def compile_pipeline(self, operations: List[str]) -> Callable[[str], Union[str, Dict[str, int]]]:
+        """
+        Build one function applying an ordered chain of operations.
+        
+        Args:
+            operations: Steps from uppercase, lowercase, reverse; "count" may
+                only appear as the last step
+            
+        Returns:
+            Function mapping a text to its final string or count statistics
+            
+        Raises:
+            ValueError: If an operation is unknown or "count" is not last
+        """
+        steps: List[Callable[[str], str]] = []
+        for position, operation in enumerate(operations):
+            if operation == "count":
+                if position != len(operations) - 1:
+                    raise ValueError("'count' must be the last operation")
+                break
+            if operation not in TRANSFORMS:
+                raise ValueError(
+                    f"Unknown operation '{operation}' "
+                    f"(available: {', '.join(TRANSFORMS)}, count)"
+                )
+            steps.append(TRANSFORMS[operation])
+        counts = bool(operations) and operations[-1] == "count"
         
-        logger.info(f"TextProcessor: Analyzed text - {len(words)} words, {characters} chars, {len(lines)} lines")
-        return result
\ No newline at end of file
+        def run(text: str) -> Union[str, Dict[str, int]]:
+            for step in steps:
+                text = step(text)
+            return self._count(text) if counts else text
+        return run
+    
+    def iter_batch(self, texts: List[str], operations: List[str]) -> Iterator[Union[str, Dict[str, int]]]:
+        """Yield pipeline results one text at a time, in input order"""
+        pipeline = self.compile_pipeline(operations)
+        for text in texts:
+            yield pipeline(text)
+    
+    @tool
+    def process_batch(self, texts: List[str], operations: List[str]) -> Dict[str, Any]:
+        """
+        Apply an ordered chain of operations to many texts in one call.
+        
+        Results are returned in input order without echoing the originals:
+        the final string for each text, or its word/character/line counts
+        when the chain ends with "count".
+        
+        Args:
+            texts: Texts to process
+            operations: Ordered steps (uppercase, lowercase, reverse, count)
+            
+        Returns:
+            Dictionary containing one result per text
+        """
+        try:
+            results = list(self.iter_batch(texts, operations))
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "operations": operations
+            }
+        
+        logger.info("TextProcessor: Processed batch of %d texts with %s",
+                    len(texts), " -> ".join(operations))
+        return {
+            "operations": operations,
+            "count": len(results),
+            "results": results
+        }
+    
+    @staticmethod
+    def _word_spans(text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Split text into (start, end) spans of about CHUNK_SIZE characters.
+        
+        Each cut is extended to the next non-word character so that no
+        word is split across two spans.
+        """
+        start = 0
+        length = len(text)
+        while start < length:
+            end = start + CHUNK_SIZE
+            if end < length:
+                boundary = NON_WORD_PATTERN.search(text, end)
+                end = boundary.start() if boundary else length
+            else:
+                end = length
+            yield start, end
+            start = end
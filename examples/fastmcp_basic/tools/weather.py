@@ -1,87 +1,194 @@
 """
 Weather Tool
 
-Provides weather information using mock data for demonstration purposes.
+Provides weather information from a pluggable provider (mock data by
+default) behind a per-city TTL cache. City names are resolved through a
+CityCatalog, so "New York City", "Seoul, KR" and small typos all work.
 """
 
 from fastmcp import tool
-from typing import Dict, Any
-import random
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
-from datetime import datetime
+from .city_catalog import City, CityCatalog
+from .weather_providers import (
+    WeatherProvider, WeatherProviderError, MockWeatherProvider, WeatherCache
+)
 
 logger = logging.getLogger(__name__)
 
+# Suggestions returned with a "not found" error
+SUGGESTION_COUNT = 5
+
 class WeatherTool:
-    """Weather tool providing mock weather data"""
+    """Weather tool backed by a city catalog and a cached weather provider"""
+    
+    def __init__(
+        self,
+        provider: Optional[WeatherProvider] = None,
+        cache: Optional[WeatherCache] = None,
+        catalog: Optional[CityCatalog] = None,
+        max_batch_cities: int = 100,
+        batch_concurrency: int = 16
+    ):
+        """
+        Args:
+            provider: Weather source (mock data by default)
+            cache: Per-city cache in front of the provider
+            catalog: Cities that can be looked up (data/cities.tsv by default)
+            max_batch_cities: Most cities one get_weather_many call may ask for
+            batch_concurrency: Upstream fetches one get_weather_many call runs at once
+        """
+        self.provider = provider or MockWeatherProvider()
+        self.cache = cache or WeatherCache()
+        self.catalog = catalog or CityCatalog()
+        self.max_batch_cities = max_batch_cities
+        self.batch_concurrency = batch_concurrency
     
-    # Mock weather data for different cities
-    WEATHER_DATA = {
-        "seoul": {
-            "city": "Seoul",
-            "country": "South Korea",
-            "conditions": ["Sunny", "Cloudy", "Rainy", "Snow"],
-            "temp_range": (-10, 35)
-        },
-        "tokyo": {
-            "city": "Tokyo", 
-            "country": "Japan",
-            "conditions": ["Sunny", "Cloudy", "Rainy"],
-            "temp_range": (0, 40)
-        },
-        "newyork": {
-            "city": "New York",
-            "country": "United States", 
-            "conditions": ["Sunny", "Cloudy", "Rainy", "Snow"],
-            "temp_range": (-20, 40)
-        },
-        "london": {
-            "city": "London",
-            "country": "United Kingdom",
-            "conditions": ["Cloudy", "Rainy", "Sunny"],
-            "temp_range": (-5, 30)
+    def _not_found(self, city: str) -> Dict[str, Any]:
+        logger.warning("Weather: City '%s' not found", city)
+        return {
+            "error": f"City '{city}' not found",
+            "suggestions": [
+                f"{match.name}, {match.country_code}"
+                for match in self.catalog.search(city[:3], SUGGESTION_COUNT)
+            ]
+        }
+    
+    async def _weather_for(self, city: City, matched_by: str) -> Dict[str, Any]:
+        """Fetch (or reuse cached) weather for a resolved city"""
+        try:
+            weather, cache_status = await self.cache.get(
+                city.key, lambda: self.provider.fetch(city.weather_data())
+            )
+        except WeatherProviderError as e:
+            logger.error("Weather: %s provider failed for %s: %s",
+                         self.provider.name, city.name, e)
+            return {
+                "error": f"Failed to fetch weather: {e}",
+                "city": city.name
+            }
+        
+        logger.info("Weather: Retrieved data for %s (%s)", city.name, cache_status)
+        return {
+            "city": city.name,
+            "country": city.country,
+            "country_code": city.country_code,
+            **weather,
+            "provider": self.provider.name,
+            "cache_status": cache_status,
+            "matched_by": matched_by
         }
-    }
     
     @tool
-    def get_weather(self, city: str) -> Dict[str, Any]:
+    async def get_weather(self, city: str) -> Dict[str, Any]:
         """
         Get current weather information for a city.
         
+        Results are cached per city; concurrent requests for the same city
+        share a single upstream fetch.
+        
         Args:
-            city: Name of the city (seoul, tokyo, newyork, london)
+            city: City name or alias, optionally with a country ("Seoul, KR");
+                a prefix or a name with one typo also matches
             
         Returns:
-            Dictionary containing weather information
+            Dictionary containing weather information and how the name matched
         """
-        city_key = city.lower().replace(" ", "")
+        match = self.catalog.resolve(city)
+        if match is None:
+            return self._not_found(city)
+        return await self._weather_for(*match)
+    
+    @tool
+    async def get_weather_many(self, cities: List[str]) -> Dict[str, Any]:
+        """
+        Get current weather for many cities in one call.
         
-        if city_key not in self.WEATHER_DATA:
-            available_cities = ", ".join(self.WEATHER_DATA.keys())
-            error_result = {
-                "error": f"City '{city}' not found",
-                "available_cities": available_cities
-            }
-            logger.warning(f"Weather: City '{city}' not found")
-            return error_result
+        Names are resolved first, then the distinct cities are fetched
+        concurrently; repeated cities share one fetch through the cache.
+        
+        Args:
+            cities: City names, as accepted by get_weather
+            
+        Returns:
+            Dictionary with one result per requested name, in order
+        """
+        if len(cities) > self.max_batch_cities:
+            return {"error": f"At most {self.max_batch_cities} cities per call, got {len(cities)}"}
+        
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
         
-        city_data = self.WEATHER_DATA[city_key]
+        async def fetch(city: City, matched_by: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._weather_for(city, matched_by)
         
-        # Generate random weather data
-        condition = random.choice(city_data["conditions"])
-        temp_min, temp_max = city_data["temp_range"]
-        temperature = random.randint(temp_min, temp_max)
-        humidity = random.randint(30, 90)
+        pending: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        # Per requested name: a "not found" result, or its fetch and how it matched
+        slots: List[Any] = []
+        for name in cities:
+            match = self.catalog.resolve(name)
+            if match is None:
+                slots.append(self._not_found(name))
+                continue
+            city, matched_by = match
+            if city.key not in pending:
+                pending[city.key] = asyncio.ensure_future(fetch(city, matched_by))
+            slots.append((pending[city.key], matched_by))
         
-        weather_result = {
-            "city": city_data["city"],
-            "country": city_data["country"],
-            "temperature": f"{temperature}°C",
-            "condition": condition,
-            "humidity": f"{humidity}%",
-            "timestamp": datetime.now().isoformat(),
-            "note": "This is mock data for demonstration purposes"
+        if pending:
+            await asyncio.gather(*pending.values())
+        results = []
+        for slot in slots:
+            if isinstance(slot, dict):
+                results.append(slot)
+            elif "error" in slot[0].result():
+                results.append(slot[0].result())
+            else:
+                results.append({**slot[0].result(), "matched_by": slot[1]})
+        failed = sum(1 for result in results if "error" in result)
+        return {
+            "results": results,
+            "count": len(results),
+            "distinct_cities": len(pending),
+            "failed": failed
         }
+    
+    @tool
+    def search_cities(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Find catalog cities whose name starts with a query.
+        
+        Args:
+            query: Start of a city name, optionally with a country ("san, US")
+            limit: Maximum number of cities, most populous first
+            
+        Returns:
+            Dictionary containing the matching cities
+        """
+        matches = self.catalog.search(query, limit)
+        return {
+            "query": query,
+            "matches": [match.to_dict() for match in matches],
+            "count": len(matches)
+        }
+    
+    @tool
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get weather cache statistics.
+        
+        Returns:
+            Dictionary containing hit/miss/coalesced counters and upstream load
+        """
+        return self.cache.stats()
+    
+    @tool
+    def get_catalog_stats(self) -> Dict[str, Any]:
+        """
+        Get city catalog statistics.
         
-        logger.info(f"Weather: Retrieved data for {city_data['city']}")
-        return weather_result
\ No newline at end of file
+        Returns:
+            Dictionary containing city/key counts, memory use and lookup counters
+        """
+        return self.catalog.stats()
@@ -0,0 +1,241 @@
+"""
+Weather Providers
+
+Pluggable weather backends for WeatherTool and a per-city TTL cache that
+coalesces concurrent upstream fetches.
+"""
+
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+import time
+import random
+import asyncio
+import logging
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherProviderError(Exception):
+    """Raised when a provider cannot return weather for a city"""
+
+
+class WeatherProvider(ABC):
+    """Source of current weather for a city from WeatherTool's city catalog"""
+
+    name = "base"
+
+    @abstractmethod
+    async def fetch(self, city_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch current weather for a city.
+
+        Args:
+            city_data: City.weather_data() of a catalog city
+
+        Returns:
+            Dictionary with temperature, condition, humidity and timestamp
+        """
+
+
+class MockWeatherProvider(WeatherProvider):
+    """Random weather within each city's configured conditions and range"""
+
+    name = "mock"
+
+    async def fetch(self, city_data: Dict[str, Any]) -> Dict[str, Any]:
+        temp_min, temp_max = city_data["temp_range"]
+        return {
+            "temperature": f"{random.randint(temp_min, temp_max)}°C",
+            "condition": random.choice(city_data["conditions"]),
+            "humidity": f"{random.randint(30, 90)}%",
+            "timestamp": datetime.now().isoformat(),
+            "note": "This is mock data for demonstration purposes"
+        }
+
+
+class HttpWeatherProvider(WeatherProvider):
+    """
+    Weather from an HTTP backend.
+
+    Sends GET {base_url}/weather?city=<name>&country=<country> and expects a
+    JSON object with temperature (Celsius), condition and humidity (percent).
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str, timeout_seconds: float = 5.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the client binds to the server's event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout_seconds
+            )
+        return self._client
+
+    async def fetch(self, city_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            response = await self._get_client().get(
+                "/weather",
+                params={"city": city_data["city"], "country": city_data["country"]}
+            )
+            response.raise_for_status()
+            payload = response.json()
+            return {
+                "temperature": f"{payload['temperature']}°C",
+                "condition": payload["condition"],
+                "humidity": f"{payload['humidity']}%",
+                "timestamp": payload.get("timestamp", datetime.now().isoformat())
+            }
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            raise WeatherProviderError(f"{type(e).__name__}: {e}") from e
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_provider(settings: Dict[str, Any]) -> WeatherProvider:
+    """
+    Build the provider selected by the "weather" tool section of config.json.
+
+    Args:
+        settings: config["tools"]["weather"]
+
+    Returns:
+        The configured WeatherProvider (mock by default)
+    """
+    provider = settings.get("provider", "mock")
+    if provider == "mock":
+        return MockWeatherProvider()
+    if provider == "http":
+        http = settings.get("http", {})
+        return HttpWeatherProvider(http["base_url"], http.get("timeout_seconds", 5.0))
+    raise ValueError(f"Unknown weather provider '{provider}'")
+
+
+class WeatherCache:
+    """
+    Per-city TTL cache with single-flight upstream fetches.
+
+    Concurrent misses for the same city await one shared fetch. With a
+    stale window configured, expired entries are still served for up to
+    `stale_seconds` while one background fetch refreshes them. At most
+    `max_entries` cities are kept; the least recently used is evicted.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        stale_seconds: float = 0.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.upstream_fetches = 0
+        self.upstream_errors = 0
+        self.evictions = 0
+
+    async def get(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Return the cached value for a key, fetching it at most once at a time.
+
+        Returns:
+            (value, cache status: "hit", "stale", "coalesced" or "miss")
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = self._clock() - entry[0]
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return entry[1], "hit"
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_served += 1
+                if key not in self._inflight:
+                    self._start_fetch(key, fetch).add_done_callback(self._log_refresh_error)
+                return entry[1], "stale"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            status = "coalesced"
+        else:
+            self.misses += 1
+            task = self._start_fetch(key, fetch)
+            status = "miss"
+        # shield: a cancelled caller must not cancel the fetch others await
+        return await asyncio.shield(task), status
+
+    def _start_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> "asyncio.Task[Dict[str, Any]]":
+        task = asyncio.ensure_future(self._fetch(key, fetch))
+        self._inflight[key] = task
+        return task
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            self.upstream_fetches += 1
+            value = await fetch()
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+        except Exception:
+            self.upstream_errors += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_refresh_error(task: "asyncio.Task[Dict[str, Any]]") -> None:
+        """Background refreshes have no awaiting caller, so log their failures"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("WeatherCache: Background refresh failed: %s", task.exception())
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/coalesced counters and upstream load"""
+        requests = self.hits + self.misses + self.coalesced + self.stale_served
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "upstream_fetches": self.upstream_fetches,
+            "upstream_errors": self.upstream_errors,
+            "hit_ratio": (requests - self.misses) / requests if requests else 0.0
+        }
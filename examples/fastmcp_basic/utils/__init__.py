@@ -0,0 +1 @@
+# Utilities package for FastMCP Basic Example
\ No newline at end of file
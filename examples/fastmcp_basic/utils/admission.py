@@ -0,0 +1,323 @@
+"""
+Admission Control
+
+Every tool belongs to a cost class ("cheap", "standard", "heavy", ...).
+Each class has a token bucket per client, a concurrency limit and a
+bounded wait queue. A call that finds the queue of its class full is
+rejected at once with a retry-after hint instead of waiting until the
+client times out, so a burst of heavy calls cannot take the capacity
+cheap calls need.
+
+Async handlers wait in the queue; sync handlers cannot wait without
+blocking a thread, so they are rejected as soon as their class is at its
+concurrency limit.
+"""
+
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+import time
+import asyncio
+import logging
+import threading
+try:
+    # Reported to the client as is, without a traceback in the server log
+    from fastmcp.exceptions import ToolError as _ToolError
+except ImportError:  # fastmcp without ToolError
+    class _ToolError(Exception):  # type: ignore[no-redef]
+        """Plain exception standing in for fastmcp's ToolError"""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST_CLASSES: Dict[str, Dict[str, float]] = {
+    "cheap": {"max_concurrent": 64, "max_queue": 256, "rate_per_second": 100, "burst": 200},
+    "standard": {"max_concurrent": 16, "max_queue": 64, "rate_per_second": 20, "burst": 40},
+    "heavy": {"max_concurrent": 4, "max_queue": 8, "rate_per_second": 2, "burst": 5},
+}
+
+# Token buckets kept, least recently used clients are dropped first
+MAX_CLIENTS = 10000
+
+# Weight of the latest call in the per-class average duration
+_DURATION_SMOOTHING = 0.1
+# Retry-after hint when a class has no completed calls yet, and the minimum hint
+_MIN_RETRY_AFTER_SECONDS = 0.1
+# Bytes counted for a number, boolean or null, as in utils.metrics.payload_size
+_SCALAR_SIZE = 8
+
+
+def exceeds_size(value: Any, limit: int) -> bool:
+    """
+    Whether a request is larger than `limit` bytes.
+
+    Unlike the sampling estimate used for metrics, every string, key and
+    list element is counted, so one huge element in a long list cannot
+    slip through; counting stops as soon as the limit is passed, so the
+    cost is bounded by the limit rather than by the request.
+    """
+    total = 0
+    stack: List[Iterator[Any]] = [iter((value,))]
+    while stack:
+        for item in stack[-1]:
+            kind = type(item)
+            if kind is str or kind is bytes:
+                total += len(item)
+            elif kind is dict:
+                # (key, value) pairs are measured like tuples
+                stack.append(iter(item.items()))
+                break
+            elif kind is list or kind is tuple:
+                stack.append(iter(item))
+                break
+            else:
+                total += _SCALAR_SIZE
+            if total > limit:
+                return True
+        else:
+            stack.pop()
+    return False
+
+
+class Overloaded(_ToolError):
+    """A call was shed; retry_after_seconds says when trying again makes sense"""
+
+    def __init__(self, message: str, retry_after_seconds: float):
+        self.retry_after_seconds = round(retry_after_seconds, 2)
+        super().__init__(f"{message}; retry after {self.retry_after_seconds}s")
+        self.log_level = logging.WARNING
+
+
+@dataclass(frozen=True)
+class CostClass:
+    """Limits of one cost class"""
+
+    name: str
+    max_concurrent: int
+    max_queue: int
+    rate_per_second: float
+    burst: float
+
+    @classmethod
+    def from_config(cls, name: str, section: Mapping[str, Any]) -> "CostClass":
+        """
+        Raises:
+            ValueError: If a limit is missing or out of range
+        """
+        defaults = DEFAULT_COST_CLASSES.get(name, DEFAULT_COST_CLASSES["standard"])
+        values = {key: section.get(key, default) for key, default in defaults.items()}
+        if values["max_concurrent"] < 1 or values["max_queue"] < 0:
+            raise ValueError(f"Cost class '{name}': max_concurrent must be >= 1 and max_queue >= 0")
+        if values["rate_per_second"] <= 0 or values["burst"] < 1:
+            raise ValueError(f"Cost class '{name}': rate_per_second must be > 0 and burst >= 1")
+        return cls(
+            name=name,
+            max_concurrent=int(values["max_concurrent"]),
+            max_queue=int(values["max_queue"]),
+            rate_per_second=float(values["rate_per_second"]),
+            burst=float(values["burst"])
+        )
+
+
+class _ClassState:
+    """Running calls, waiters and counters of one cost class"""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self.avg_seconds = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.rate_limited = 0
+        self.shed = 0
+
+
+class AdmissionController:
+    """
+    Token buckets, concurrency limits and wait queues for tool calls.
+
+    State is guarded by one lock so that sync handlers running on worker
+    threads and async handlers on the event loop share the same limits.
+    """
+
+    def __init__(
+        self,
+        classes: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        tools: Optional[Mapping[str, str]] = None,
+        default_class: str = "cheap",
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            classes: Limits per cost class name (see DEFAULT_COST_CLASSES)
+            tools: Cost class per tool name; other tools use default_class
+            default_class: Class of tools not listed in `tools`
+            enabled: Whether handlers should call acquire()/try_acquire() at all
+
+        Raises:
+            ValueError: If a limit is invalid or a tool names an unknown class
+        """
+        self.classes = {
+            name: CostClass.from_config(name, section)
+            for name, section in (classes or DEFAULT_COST_CLASSES).items()
+        }
+        self.tools = dict(tools or {})
+        self.default_class = default_class
+        self.enabled = enabled
+        for tool, name in [*self.tools.items(), ("default_class", default_class)]:
+            if name not in self.classes:
+                raise ValueError(f"'{tool}' uses unknown cost class '{name}'")
+        self._clock = clock
+        self._states = {name: _ClassState() for name in self.classes}
+        self._buckets: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cost_class(self, tool: str) -> str:
+        return self.tools.get(tool, self.default_class)
+
+    def _take_token(self, client: str, limits: CostClass) -> float:
+        """
+        Take a token from the client's bucket for a class (lock held).
+
+        Returns:
+            0.0 if a token was taken, else seconds until one is available
+        """
+        now = self._clock()
+        key = (client, limits.name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [limits.burst, now]
+            if len(self._buckets) > MAX_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        tokens = min(limits.burst, bucket[0] + (now - bucket[1]) * limits.rate_per_second)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / limits.rate_per_second
+
+    def _retry_after(self, limits: CostClass, state: _ClassState) -> float:
+        """Rough time until the queue ahead of a new call has drained"""
+        waiting = len(state.waiters) + 1
+        return max(_MIN_RETRY_AFTER_SECONDS, state.avg_seconds * waiting / limits.max_concurrent)
+
+    def _admit(self, tool: str, client: str, max_queue: int) -> Tuple[str, Optional[asyncio.Future]]:
+        """
+        Admit a call or queue it (lock held).
+
+        Returns:
+            (class name, None if admitted or the future to wait on)
+
+        Raises:
+            Overloaded: If the client is over its rate or the queue is full
+        """
+        limits = self.classes[self.cost_class(tool)]
+        state = self._states[limits.name]
+        # Shed before taking a token, so a shed call does not also use up
+        # the client's rate and fail its retry with a rate-limit error
+        can_run = state.running < limits.max_concurrent
+        if not can_run and len(state.waiters) >= max_queue:
+            state.shed += 1
+            raise Overloaded(f"Server overloaded ({limits.name} tools)", self._retry_after(limits, state))
+        wait = self._take_token(client, limits)
+        if wait:
+            state.rate_limited += 1
+            raise Overloaded(f"Rate limit for {limits.name} tools exceeded", wait)
+        if can_run:
+            state.running += 1
+            state.admitted += 1
+            return limits.name, None
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        state.waiters.append((loop, future))
+        state.queued += 1
+        return limits.name, future
+
+    async def acquire(self, tool: str, client: str) -> str:
+        """
+        Wait for a slot in the tool's cost class; pair with release().
+
+        Returns:
+            The cost class name to pass to release()
+
+        Raises:
+            Overloaded: If the client is over its rate or the queue is full
+        """
+        with self._lock:
+            name, future = self._admit(tool, client, self.classes[self.cost_class(tool)].max_queue)
+        if future is None:
+            return name
+
+        state = self._states[name]
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    state.waiters.remove((asyncio.get_running_loop(), future))
+                except ValueError:
+                    # The slot was handed over just before the cancellation
+                    if future.done() and not future.cancelled():
+                        self._release_slot(state)
+            raise
+        with self._lock:
+            state.admitted += 1
+        return name
+
+    def try_acquire(self, tool: str, client: str) -> str:
+        """
+        Take a slot without waiting, for sync handlers; pair with release().
+
+        Raises:
+            Overloaded: If the client is over its rate or the class is busy
+        """
+        with self._lock:
+            name, _ = self._admit(tool, client, 0)
+        return name
+
+    def _release_slot(self, state: _ClassState) -> None:
+        """Hand a finished call's slot to the next waiter, or free it (lock held)"""
+        while state.waiters:
+            loop, future = state.waiters.popleft()
+            if not future.done():
+                loop.call_soon_threadsafe(self._grant, state, future)
+                return
+        state.running -= 1
+
+    def _grant(self, state: _ClassState, future: asyncio.Future) -> None:
+        if future.done():
+            # Cancelled while the slot was on its way; pass it on
+            with self._lock:
+                self._release_slot(state)
+        else:
+            future.set_result(None)
+
+    def release(self, name: str, elapsed_seconds: float) -> None:
+        """Finish a call admitted by acquire() or try_acquire()"""
+        state = self._states[name]
+        with self._lock:
+            state.avg_seconds += (elapsed_seconds - state.avg_seconds) * _DURATION_SMOOTHING
+            self._release_slot(state)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limits, running and queued calls, and rejections per cost class"""
+        with self._lock:
+            return {
+                name: {
+                    "max_concurrent": limits.max_concurrent,
+                    "max_queue": limits.max_queue,
+                    "rate_per_second": limits.rate_per_second,
+                    "burst": limits.burst,
+                    "running": self._states[name].running,
+                    "waiting": len(self._states[name].waiters),
+                    "admitted": self._states[name].admitted,
+                    "queued": self._states[name].queued,
+                    "rate_limited": self._states[name].rate_limited,
+                    "shed": self._states[name].shed,
+                    "avg_call_ms": round(self._states[name].avg_seconds * 1000, 3)
+                }
+                for name, limits in self.classes.items()
+            }
@@ -0,0 +1,34 @@
+"""
+Config Loader
+
+Loads the server configuration from config.json.
+"""
+
+from typing import Dict, Any, Optional
+from pathlib import Path
+import json
+
+# config.json lives next to server.py
+BASE_DIR = Path(__file__).parent.parent
+CONFIG_PATH = BASE_DIR / "config.json"
+
+
+def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load the server configuration.
+    
+    Args:
+        path: Path to a config file (default: config.json next to server.py)
+        
+    Returns:
+        Parsed configuration dictionary
+    """
+    with open(path or CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config: Dict[str, Any] = json.load(f)
+    return config
+
+
+def resolve_path(value: str) -> Path:
+    """Resolve a path from the config relative to the config file's directory"""
+    path = Path(value)
+    return path if path.is_absolute() else BASE_DIR / path
@@ -0,0 +1,77 @@
+"""
+Blocking Executor
+
+Runs blocking tool work (disk I/O, large text processing) on a dedicated
+thread pool so the server's event loop keeps serving other clients.
+Each category of work has its own concurrency limit, so a burst of slow
+file reads cannot take every worker thread.
+"""
+
+from typing import Any, Callable, Dict, Optional, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CATEGORY_LIMITS = {
+    "file_io": 8,
+    "logs": 2,
+    "text_processing": 4,
+    "search": 2,
+}
+
+
+class BlockingExecutor:
+    """Bounded thread pool with per-category concurrency limits"""
+    
+    def __init__(
+        self,
+        max_workers: int = 16,
+        category_limits: Optional[Dict[str, int]] = None
+    ):
+        self.max_workers = max_workers
+        self.category_limits = dict(category_limits or DEFAULT_CATEGORY_LIMITS)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-io")
+        self._semaphores = {
+            category: asyncio.Semaphore(limit)
+            for category, limit in self.category_limits.items()
+        }
+        self._active = {category: 0 for category in self.category_limits}
+    
+    async def run(self, category: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call in the pool once its category has a free slot.
+        
+        Args:
+            category: Work category, one of the configured category limits
+            func: Blocking callable
+            *args, **kwargs: Arguments for func
+            
+        Returns:
+            The callable's return value
+        """
+        semaphore = self._semaphores[category]
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            self._active[category] += 1
+            try:
+                return await loop.run_in_executor(
+                    self._pool, functools.partial(func, *args, **kwargs)
+                )
+            finally:
+                self._active[category] -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Configured limits and calls currently running per category"""
+        return {
+            "max_workers": self.max_workers,
+            "category_limits": self.category_limits,
+            "active": dict(self._active)
+        }
+    
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
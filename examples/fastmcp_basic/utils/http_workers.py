@@ -0,0 +1,187 @@
+"""
+HTTP Worker Supervisor
+
+Pre-fork supervisor for the HTTP transport. The parent binds the
+listening socket once and starts N copies of the server, each inheriting
+that socket, so incoming connections are spread across processes and CPU
+cores. Workers that exit unexpectedly are restarted.
+
+Shutdown drains instead of dropping requests: on SIGTERM/SIGINT the
+workers first get SIGUSR1 and report "draining" on the health endpoint,
+so load balancers stop routing to them; after the drain notice period
+they get SIGTERM, stop accepting connections and finish the requests in
+flight before exiting.
+"""
+
+from typing import Callable, List, Optional
+import os
+import time
+import signal
+import socket
+import logging
+import threading
+import subprocess
+from .log_setup import FORWARD_FD_ENV
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for exited workers
+POLL_INTERVAL_SECONDS = 0.5
+
+# Restart delay after a crash, doubled for each crash in a row up to the maximum
+RESTART_DELAY_SECONDS = 0.5
+MAX_RESTART_DELAY_SECONDS = 30.0
+
+# Signal that tells a worker to start failing health checks
+DRAIN_SIGNAL = getattr(signal, "SIGUSR1", None)
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """
+    Bind the listening socket the workers share.
+
+    Raises:
+        OSError: If the address is in use or cannot be bound
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerSupervisor:
+    """Runs and restarts HTTP worker processes sharing one listening socket"""
+
+    def __init__(
+        self,
+        command: Callable[[int, int], List[str]],
+        sock: socket.socket,
+        workers: int,
+        drain_notice_seconds: float = 1.0,
+        drain_seconds: float = 10.0,
+        forward_logs: Optional[Callable[[socket.socket], None]] = None
+    ):
+        """
+        Args:
+            command: Builds a worker's argv from (worker index, socket fd)
+            sock: Bound, listening socket inherited by every worker
+            workers: Number of worker processes
+            drain_notice_seconds: How long workers report "draining" before they stop
+            drain_seconds: How long workers may take to finish requests in flight
+            forward_logs: Called with the supervisor's end of a socket pair
+                per worker; the worker's log records arrive on it
+        """
+        self.command = command
+        self.sock = sock
+        self.workers = workers
+        self.drain_notice_seconds = drain_notice_seconds
+        self.drain_seconds = drain_seconds
+        self.forward_logs = forward_logs
+        self._processes: List[Optional[subprocess.Popen]] = [None] * workers
+        self._crashes = [0] * workers
+        self._restart_at = [0.0] * workers
+        self._stopping = threading.Event()
+        self.restarts = 0
+
+    def _start(self, index: int) -> None:
+        fd = self.sock.fileno()
+        if self.forward_logs is None:
+            process = subprocess.Popen(self.command(index, fd), pass_fds=(fd,))
+        else:
+            ours, theirs = socket.socketpair()
+            try:
+                process = subprocess.Popen(
+                    self.command(index, fd),
+                    pass_fds=(fd, theirs.fileno()),
+                    env={**os.environ, FORWARD_FD_ENV: str(theirs.fileno())}
+                )
+            except BaseException:
+                ours.close()
+                raise
+            finally:
+                theirs.close()
+            self.forward_logs(ours)
+        self._processes[index] = process
+        logger.info("Supervisor: Started worker %d (pid %d)", index, process.pid)
+
+    def _check_workers(self) -> None:
+        """Restart workers that exited, backing off if they keep crashing"""
+        now = time.monotonic()
+        for index, process in enumerate(self._processes):
+            if process is not None:
+                code = process.poll()
+                if code is None:
+                    # Running long enough to count as healthy again
+                    if now - self._restart_at[index] > MAX_RESTART_DELAY_SECONDS:
+                        self._crashes[index] = 0
+                    continue
+                self._crashes[index] += 1
+                delay = min(
+                    RESTART_DELAY_SECONDS * 2 ** (self._crashes[index] - 1),
+                    MAX_RESTART_DELAY_SECONDS
+                )
+                logger.error(
+                    "Supervisor: Worker %d (pid %d) exited with %s, restarting in %.1fs",
+                    index, process.pid, code, delay
+                )
+                self._processes[index] = None
+                self._restart_at[index] = now + delay
+            elif now >= self._restart_at[index]:
+                if self._crashes[index]:
+                    self.restarts += 1
+                self._start(index)
+
+    def _signal_workers(self, signum: int) -> None:
+        for process in self._processes:
+            if process is not None and process.poll() is None:
+                process.send_signal(signum)
+
+    def _drain(self) -> None:
+        """Ask every worker to drain, then wait for them to exit"""
+        running = [p for p in self._processes if p is not None and p.poll() is None]
+        logger.info("Supervisor: Draining %d workers", len(running))
+        if DRAIN_SIGNAL is not None and self.drain_notice_seconds > 0:
+            self._signal_workers(DRAIN_SIGNAL)
+            time.sleep(self.drain_notice_seconds)
+        self._signal_workers(signal.SIGTERM)
+
+        deadline = time.monotonic() + self.drain_seconds + 5
+        for process in running:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning("Supervisor: Worker pid %d did not drain in time, killing it", process.pid)
+                process.kill()
+                process.wait()
+
+    def stop(self) -> None:
+        """Begin a graceful shutdown; safe to call from a signal handler"""
+        self._stopping.set()
+
+    def run(self) -> int:
+        """
+        Start the workers and supervise them until SIGTERM or SIGINT.
+
+        SIGHUP is forwarded to the workers so they reload config.json.
+
+        Returns:
+            Process exit code
+        """
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, lambda signum, frame: self._signal_workers(signal.SIGHUP))
+
+        logger.info("Supervisor: Serving on %s with %d workers", self.sock.getsockname(), self.workers)
+        try:
+            while not self._stopping.is_set():
+                self._check_workers()
+                self._stopping.wait(POLL_INTERVAL_SECONDS)
+        finally:
+            self._drain()
+            self.sock.close()
+        logger.info("Supervisor: All workers stopped")
+        return 0
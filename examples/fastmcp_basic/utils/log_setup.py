@@ -0,0 +1,218 @@
+"""
+Logging Setup
+
+Non-blocking logging pipeline configured from config.json["logging"].
+
+Tool and resource methods only put records on a bounded queue; a
+background QueueListener thread formats them and writes them to the
+rotating log file (and stderr), so log I/O stays off the request path.
+
+HTTP worker processes do not open the log file: their listener sends
+records over a socket inherited from the supervisor, which writes them
+with its own handlers, so exactly one process rotates the file.
+"""
+
+from typing import Dict, Any, List, Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, SocketHandler
+import os
+import sys
+import queue
+import pickle
+import socket
+import struct
+import atexit
+import logging
+import itertools
+import threading
+
+from .config_loader import resolve_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Format fields that need a stack walk (logging's findCaller) per record
+_CALLER_FIELDS = ("%(pathname)", "%(filename)", "%(module)", "%(funcName)", "%(lineno)")
+
+# logging's own source file marker, restored when a format needs caller info
+_SRCFILE = getattr(logging, "_srcfile", None)
+
+# Set by the supervisor in a worker's environment: fd of the socket its records go to
+FORWARD_FD_ENV = "FASTMCP_LOG_FD"
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves %-formatting to the listener thread.
+    
+    Records are enqueued as-is, so log arguments must not be mutated after
+    the call. When the queue is full the record is dropped and counted
+    instead of blocking the caller.
+    """
+    
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every N records below WARNING for chatty loggers.
+    
+    Rates are configured per logger name (e.g. {"tools.calculator": 0.1})
+    and apply to child loggers too. A rate of 0 drops every record below
+    WARNING; warnings and errors are never sampled.
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.every = {
+            name: (max(1, round(1 / rate)) if rate > 0 else None)
+            for name, rate in rates.items()
+            if rate < 1
+        }
+        self._counters: Dict[str, "itertools.count[int]"] = {
+            name: itertools.count() for name in self.every
+        }
+        self._resolved: Dict[str, Optional[str]] = {}
+    
+    def _rule_for(self, name: str) -> Optional[str]:
+        """Find the closest configured ancestor of a logger name"""
+        if name not in self._resolved:
+            candidate: Optional[str] = name
+            while candidate and candidate not in self.every:
+                candidate = candidate.rpartition(".")[0] or None
+            self._resolved[name] = candidate
+        return self._resolved[name]
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rule = self._rule_for(record.name)
+        if rule is None:
+            return True
+        every = self.every[rule]
+        return every is not None and next(self._counters[rule]) % every == 0
+
+
+class ForwardingHandler(SocketHandler):
+    """
+    Sends records to the supervisor over an inherited socket.
+    
+    Messages are formatted with their arguments before pickling (see
+    SocketHandler.makePickle), so the supervisor needs no worker state.
+    """
+    
+    def __init__(self, fd: int):
+        # The address is only used by makeSocket, which is overridden
+        super().__init__(f"fd {fd}", None)
+        self.fd = fd
+    
+    def makeSocket(self, timeout: float = 1) -> socket.socket:
+        return socket.socket(fileno=self.fd)
+
+
+def _receive(sock: socket.socket, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+    with sock, sock.makefile("rb") as stream:
+        while True:
+            header = stream.read(4)
+            if len(header) < 4:
+                return
+            data = stream.read(struct.unpack(">L", header)[0])
+            record = logging.makeLogRecord(pickle.loads(data))
+            try:
+                log_queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+
+def receive_forwarded(sock: socket.socket, listener: QueueListener) -> threading.Thread:
+    """
+    Write the records a worker sends over `sock` with this process's handlers.
+    
+    Records skip this process's level and sampling checks; the worker
+    already applied them. The thread ends when the worker closes its end.
+    """
+    thread = threading.Thread(target=_receive, args=(sock, listener.queue), name="log-receiver", daemon=True)
+    thread.start()
+    return thread
+
+
+def setup_logging(settings: Dict[str, Any]) -> QueueListener:
+    """
+    Install the queued logging pipeline on the root logger.
+    
+    In a worker started with FORWARD_FD_ENV set, records are sent to the
+    supervisor instead of the log file and stderr.
+    
+    Args:
+        settings: The "logging" section of config.json
+        
+    Returns:
+        The started QueueListener (stopped automatically at exit)
+    """
+    log_format = settings.get("format", DEFAULT_FORMAT)
+    formatter = logging.Formatter(log_format)
+    
+    # Skip per-record lookups the configured format never prints
+    # (see "Optimization" in the logging HOWTO)
+    logging.logThreads = "%(thread" in log_format
+    logging.logProcesses = "%(process)" in log_format
+    logging.logMultiprocessing = "%(processName)" in log_format
+    # Setting _srcfile to None turns off findCaller for every logger in the
+    # process, so only do it while the configured format has no caller field
+    caller_info = any(field in log_format for field in _CALLER_FIELDS)
+    logging._srcfile = _SRCFILE if caller_info else None  # type: ignore[attr-defined]
+    
+    handlers: List[logging.Handler] = []
+    forward_fd = os.environ.pop(FORWARD_FD_ENV, None)
+    if forward_fd is not None:
+        handlers.append(ForwardingHandler(int(forward_fd)))
+    elif settings.get("file"):
+        handlers.append(RotatingFileHandler(
+            resolve_path(settings["file"]),
+            maxBytes=settings.get("max_bytes", 10 * 1024 * 1024),
+            backupCount=settings.get("backup_count", 5),
+            encoding="utf-8"
+        ))
+    if settings.get("console", True) and forward_fd is None:
+        # stdout carries the MCP stdio transport, so console logs go to stderr
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(settings.get("queue_size", 10000))
+    queue_handler = DeferredQueueHandler(log_queue)
+    if settings.get("sampling"):
+        queue_handler.addFilter(SamplingFilter(settings["sampling"]))
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, str(settings.get("level", "INFO")).upper(), logging.INFO))
+    
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    if not caller_info:
+        logger.info(
+            "Logging: Caller info (funcName, lineno, pathname) is not collected; "
+            "logging.format does not use it"
+        )
+    return listener
+
+
+def shutdown_logging(listener: QueueListener) -> None:
+    """Flush queued records and stop the listener before exit"""
+    atexit.unregister(listener.stop)
+    listener.stop()
@@ -0,0 +1,317 @@
+"""
+Request Metrics
+
+Call counts, errors, latency histograms and payload sizes for every tool
+and resource handler. Recording is cheap enough to leave on: each thread
+writes to its own shard without taking a lock, and latencies go into
+HDR-style log buckets (8 linear sub-buckets per power of two, so any
+recorded value is within 12.5% of its bucket bounds). Payload sizes are
+sampled on one call in SIZE_SAMPLE_INTERVAL. Readers merge the shards
+when a snapshot is requested.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Sub-buckets per power of two = 2 ** SUB_BUCKET_BITS
+SUB_BUCKET_BITS = 3
+_EXACT_LIMIT = 1 << (SUB_BUCKET_BITS + 1)
+# Enough buckets for latencies up to 2**40 microseconds (~12 days)
+BUCKET_COUNT = (40 - SUB_BUCKET_BITS) << SUB_BUCKET_BITS
+
+# Prometheus histogram bounds, in microseconds: powers of two from 16us to ~67s.
+# Each one is a bucket edge, so the exported counts are exact.
+PROMETHEUS_BOUNDS_US = [1 << exponent for exponent in range(4, 27)]
+
+# Payload sizes are estimated on one call in this many (a power of two)
+SIZE_SAMPLE_INTERVAL = 16
+
+# Per-series slots: calls, errors, total latency (us), max latency (us),
+# size samples, sampled request bytes, sampled response bytes, sampled bytes
+# saved by response shaping, then the latency buckets
+(_CALLS, _ERRORS, _SUM_US, _MAX_US, _SIZE_SAMPLES,
+ _REQUEST_BYTES, _RESPONSE_BYTES, _SAVED_BYTES) = range(8)
+_BUCKETS = 8
+
+# Estimated size of numbers, booleans and None
+_SCALAR_SIZE = 8
+_SCALAR_TYPES = frozenset({int, float, bool, type(None)})
+
+
+def bucket_index(value_us: int) -> int:
+    """Histogram bucket for a latency in microseconds"""
+    if value_us < _EXACT_LIMIT:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return min((shift << SUB_BUCKET_BITS) + (value_us >> shift), BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Exclusive upper bound, in microseconds, of a histogram bucket"""
+    if index < _EXACT_LIMIT:
+        return index + 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return (mantissa + 1) << shift
+
+
+def payload_size(value: Any) -> int:
+    """
+    Estimate the serialized size of a request or response in bytes.
+
+    Strings and bytes are measured exactly; lists are estimated from their
+    first element so that large batches cost the same as small ones.
+    """
+    kind = type(value)
+    if kind is str or kind is bytes:
+        return len(value)
+    if kind is dict:
+        total = 0
+        for key, item in value.items():
+            total += len(key)
+            item_kind = type(item)
+            if item_kind is str or item_kind is bytes:
+                total += len(item)
+            elif item_kind in _SCALAR_TYPES:
+                total += _SCALAR_SIZE
+            else:
+                total += payload_size(item)
+        return total
+    if kind is list or kind is tuple:
+        return len(value) * payload_size(value[0]) if value else 0
+    return _SCALAR_SIZE
+
+
+class RequestMetrics:
+    """
+    Metrics per (kind, name) series, e.g. ("tool", "read_file").
+
+    `record()` runs on the request path; `snapshot()` and `prometheus()`
+    merge the per-thread shards and may run on any thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[str, str], List[int]]] = []
+        self._shards_lock = threading.Lock()
+        self.started = time.time()
+
+    def _series(self, key: Tuple[str, str]) -> List[int]:
+        """This thread's series for key, creating the shard and series on first use"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = [0] * (_BUCKETS + BUCKET_COUNT)
+        return series
+
+    def record(self, key: Tuple[str, str], elapsed_ns: int, error: bool) -> None:
+        """
+        Add one call to the (kind, name) series; only the calling thread
+        writes its shard. bucket_index() is inlined, this runs on every call.
+        """
+        try:
+            series = self._local.shard[key]
+        except (AttributeError, KeyError):
+            series = self._series(key)
+        elapsed_us = elapsed_ns // 1000
+        series[_CALLS] += 1
+        if error:
+            series[_ERRORS] += 1
+        series[_SUM_US] += elapsed_us
+        if elapsed_us > series[_MAX_US]:
+            series[_MAX_US] = elapsed_us
+        if elapsed_us < _EXACT_LIMIT:
+            series[_BUCKETS + elapsed_us] += 1
+        else:
+            shift = elapsed_us.bit_length() - SUB_BUCKET_BITS - 1
+            series[_BUCKETS + min((shift << SUB_BUCKET_BITS) + (elapsed_us >> shift), BUCKET_COUNT - 1)] += 1
+
+    def record_sizes(
+        self,
+        key: Tuple[str, str],
+        request_bytes: int,
+        response_bytes: int,
+        saved_bytes: int = 0
+    ) -> None:
+        """
+        Add one payload size sample; callers sample one call in SIZE_SAMPLE_INTERVAL.
+        `saved_bytes` is how much smaller response shaping made the response.
+        """
+        series = self._series(key)
+        series[_SIZE_SAMPLES] += 1
+        series[_REQUEST_BYTES] += request_bytes
+        series[_RESPONSE_BYTES] += response_bytes
+        series[_SAVED_BYTES] += saved_bytes
+
+    def _merged(self) -> Dict[Tuple[str, str], List[int]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: Dict[Tuple[str, str], List[int]] = {}
+        for shard in shards:
+            # Copy before iterating; the owning thread may add a series meanwhile
+            for key, series in list(shard.items()):
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = list(series)
+                    continue
+                for slot, value in enumerate(series):
+                    total[slot] += value
+                total[_MAX_US] = max(total[_MAX_US], series[_MAX_US])
+        return merged
+
+    @staticmethod
+    def _percentile_us(series: List[int], quantile: float) -> int:
+        """Upper bound of the bucket holding the quantile, capped at the max seen"""
+        target = quantile * series[_CALLS]
+        seen = 0
+        for index in range(BUCKET_COUNT):
+            seen += series[_BUCKETS + index]
+            if seen >= target and seen:
+                return min(bucket_upper_bound(index), series[_MAX_US])
+        return series[_MAX_US]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Per-series counters and latency percentiles.
+
+        Returns:
+            Dictionary with "tools" and "resources", each mapping names to their metrics
+        """
+        result: Dict[str, Any] = {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "tools": {},
+            "resources": {}
+        }
+        for (kind, name), series in sorted(self._merged().items()):
+            calls = series[_CALLS]
+            samples = series[_SIZE_SAMPLES]
+            avg_request = series[_REQUEST_BYTES] // samples if samples else 0
+            avg_response = series[_RESPONSE_BYTES] // samples if samples else 0
+            avg_saved = series[_SAVED_BYTES] // samples if samples else 0
+            result[f"{kind}s"][name] = {
+                "calls": calls,
+                "errors": series[_ERRORS],
+                "error_rate": round(series[_ERRORS] / calls, 4) if calls else 0.0,
+                "latency_ms": {
+                    "mean": round(series[_SUM_US] / calls / 1000, 3) if calls else 0.0,
+                    "p50": self._percentile_us(series, 0.50) / 1000,
+                    "p90": self._percentile_us(series, 0.90) / 1000,
+                    "p99": self._percentile_us(series, 0.99) / 1000,
+                    "max": series[_MAX_US] / 1000
+                },
+                "avg_request_bytes": avg_request,
+                "avg_response_bytes": avg_response,
+                "estimated_request_bytes": avg_request * calls,
+                "estimated_response_bytes": avg_response * calls,
+                "avg_bytes_saved": avg_saved,
+                "estimated_bytes_saved": avg_saved * calls,
+                "size_samples": samples
+            }
+        return result
+
+    def prometheus(self, prefix: str = "mcp", labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Render all series in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+            labels: Constant labels added to every series, e.g. {"worker": "0"}
+        """
+        merged = sorted(self._merged().items())
+        constant = "".join(f'{key}="{value}",' for key, value in (labels or {}).items())
+        lines: List[str] = []
+
+        def counter(metric: str, help_text: str, value: Callable[[List[int]], int]) -> None:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for (kind, name), series in merged:
+                lines.append(f'{prefix}_{metric}{{{constant}kind="{kind}",name="{name}"}} {value(series)}')
+
+        def estimated(slot: int) -> Callable[[List[int]], int]:
+            """Sampled bytes scaled up to all calls"""
+            return lambda series: (
+                series[slot] * series[_CALLS] // series[_SIZE_SAMPLES] if series[_SIZE_SAMPLES] else 0
+            )
+
+        counter("requests_total", "Handled tool calls and resource reads.", lambda series: series[_CALLS])
+        counter("request_errors_total", "Calls that raised or returned an error.", lambda series: series[_ERRORS])
+        counter("request_bytes_total", "Estimated request payload bytes.", estimated(_REQUEST_BYTES))
+        counter("response_bytes_total", "Estimated response payload bytes.", estimated(_RESPONSE_BYTES))
+        counter("response_bytes_saved_total", "Estimated bytes removed by fields/compact shaping.",
+                estimated(_SAVED_BYTES))
+
+        metric = f"{prefix}_request_duration_seconds"
+        lines.append(f"# HELP {metric} Handler latency.")
+        lines.append(f"# TYPE {metric} histogram")
+        for (kind, name), series in merged:
+            series_labels = f'{constant}kind="{kind}",name="{name}"'
+            cumulative = 0
+            index = 0
+            for bound in PROMETHEUS_BOUNDS_US:
+                while index < BUCKET_COUNT and bucket_upper_bound(index) <= bound:
+                    cumulative += series[_BUCKETS + index]
+                    index += 1
+                lines.append(f'{metric}_bucket{{{series_labels},le="{bound / 1e6}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{series_labels},le="+Inf"}} {series[_CALLS]}')
+            lines.append(f"{metric}_sum{{{series_labels}}} {series[_SUM_US] / 1e6}")
+            lines.append(f"{metric}_count{{{series_labels}}} {series[_CALLS]}")
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusFileWriter:
+    """
+    Writes RequestMetrics to a Prometheus text file every few seconds,
+    e.g. for node_exporter's textfile collector. The file is replaced
+    atomically, so scrapers never see a partial write.
+    """
+
+    def __init__(
+        self,
+        metrics: RequestMetrics,
+        path: Path,
+        interval_seconds: float = 15.0,
+        labels: Optional[Dict[str, str]] = None
+    ):
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self.labels = labels
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        temp_path = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(self.metrics.prometheus(labels=self.labels), encoding="utf-8")
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error("Metrics: Could not write %s: %s", self.path, e)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval_seconds):
+            self.write()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread and write the final counters"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.write()
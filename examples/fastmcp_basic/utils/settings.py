@@ -0,0 +1,198 @@
+"""
+Settings
+
+Immutable snapshots of config.json and a store that reloads them when the
+file changes or the process receives SIGHUP. Readers take
+`store.current` once per call and keep using that snapshot, so a reload
+never changes limits halfway through a request.
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+import codecs
+import os
+import logging
+import threading
+from .config_loader import CONFIG_PATH, load_config, resolve_path
+from tools.encoding import DEFAULT_FALLBACK_ENCODINGS
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _positive_int(section: Mapping[str, Any], key: str, default: int) -> int:
+    value = section.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"'{key}' must be a positive number, got {value!r}")
+    return int(value)
+
+
+def _encoding_list(section: Mapping[str, Any], key: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+    value = section.get(key, default)
+    if isinstance(value, str) or not isinstance(value, (list, tuple)) or not value:
+        raise ValueError(f"'{key}' must be a non-empty list of encodings, got {value!r}")
+    for name in value:
+        try:
+            codecs.lookup(name)
+        except (LookupError, TypeError):
+            raise ValueError(f"'{key}' contains unknown encoding {name!r}") from None
+    return tuple(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """The parts of config.json the server applies while running"""
+
+    config: Mapping[str, Any]
+    allowed_directories: Tuple[str, ...]
+    max_lines_per_file: int
+    max_request_bytes: int
+    default_max_lines: int
+    max_read_bytes: int
+    fallback_encodings: Tuple[str, ...]
+    logs_default_max_lines: int
+    log_level: str
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Settings":
+        """
+        Validate a parsed config.json and build a snapshot from it.
+
+        Raises:
+            ValueError: If a limit, fallback encoding or the log level is invalid
+        """
+        security = config.get("security", {})
+        tools = config.get("tools", {})
+        resources = config.get("resources", {})
+        file_reader = tools.get("file_reader", {})
+        log_level = str(config.get("logging", {}).get("level", "INFO")).upper()
+        if not isinstance(logging.getLevelName(log_level), int):
+            raise ValueError(f"Unknown log level '{log_level}'")
+        return cls(
+            config=_freeze(config),
+            allowed_directories=tuple(
+                str(resolve_path(directory))
+                for directory in security.get("allowed_directories", ["./"])
+            ),
+            max_lines_per_file=_positive_int(security, "max_lines_per_file", 1000),
+            max_request_bytes=_positive_int(security, "max_request_kb", 10240) * 1024,
+            default_max_lines=_positive_int(file_reader, "default_max_lines", 100),
+            max_read_bytes=_positive_int(file_reader, "max_read_kb", 1024) * 1024,
+            fallback_encodings=_encoding_list(file_reader, "fallback_encodings", DEFAULT_FALLBACK_ENCODINGS),
+            logs_default_max_lines=_positive_int(resources.get("logs", {}), "default_max_lines", 50),
+            log_level=log_level
+        )
+
+    def is_enabled(self, section: str, group: str) -> bool:
+        """Whether a tool or resource group is enabled; groups without an entry are"""
+        return bool(self.config.get(section, {}).get(group, {}).get("enabled", True))
+
+
+class SettingsStore:
+    """
+    Holds the current Settings and swaps in a new snapshot on reload.
+
+    Subscribers are called as callback(old, new) after every successful
+    reload that changed something. A config that fails to parse or
+    validate is logged and the previous snapshot stays in effect.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        path: Optional[Path] = None,
+        poll_interval_seconds: float = 0.0
+    ):
+        self._current = settings or Settings.from_config({})
+        self.path = Path(path or CONFIG_PATH)
+        self.poll_interval_seconds = poll_interval_seconds
+        self._subscribers: List[Callable[[Settings, Settings], None]] = []
+        self._mtime_ns = self._read_mtime()
+        self._reload_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reloads = 0
+        self.failed_reloads = 0
+
+    @property
+    def current(self) -> Settings:
+        """The snapshot in effect; rebinding it is atomic, so no lock is needed"""
+        return self._current
+
+    def subscribe(self, callback: Callable[[Settings, Settings], None]) -> None:
+        """Call `callback(old, new)` whenever a reload changes the settings"""
+        self._subscribers.append(callback)
+
+    def _read_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self) -> bool:
+        """
+        Re-read the config file and swap in the new snapshot.
+
+        Returns:
+            True if the settings changed
+        """
+        with self._reload_lock:
+            self._mtime_ns = self._read_mtime()
+            try:
+                new = Settings.from_config(load_config(self.path))
+            except (OSError, ValueError) as e:
+                # json.JSONDecodeError is a ValueError
+                self.failed_reloads += 1
+                logger.error("Settings: Keeping previous settings, could not reload %s: %s", self.path, e)
+                return False
+            old = self._current
+            if new == old:
+                return False
+            self._current = new
+            self.reloads += 1
+
+        logger.info("Settings: Reloaded %s", self.path)
+        for callback in self._subscribers:
+            try:
+                callback(old, new)
+            except Exception as e:
+                logger.error("Settings: Reload subscriber %r failed: %s", callback, e)
+        return True
+
+    def request_reload(self) -> None:
+        """Ask the watcher thread to reload now; safe to call from a signal handler"""
+        self._mtime_ns = None
+        self._wake.set()
+
+    def _watch(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.poll_interval_seconds or None)
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+            if self._read_mtime() != self._mtime_ns:
+                self.reload()
+
+    def start(self) -> None:
+        """Start the watcher thread (polling only if poll_interval_seconds > 0)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
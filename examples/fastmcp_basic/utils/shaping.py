@@ -0,0 +1,136 @@
+"""
+Response Shaping
+
+Optional `fields` and `compact` parameters shared by every tool that
+returns a dictionary, so high-volume clients only receive the bytes they
+use.
+
+- `fields` keeps only the listed result fields. Dotted paths select inside
+  nested objects and inside every item of a list, e.g.
+  ["files.name", "has_more"]. An "error" field is always kept.
+- `compact` drops fields that repeat the request: any field equal to the
+  argument of the same name, plus the fields a tool declares as echoes.
+  Flags named include_* that the caller did not set default to False,
+  and declared line lists (e.g. read_file content) are joined into one
+  string.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import inspect
+
+# Parameters added to every shaped tool
+SHAPING_PARAMETERS = ("fields", "compact")
+
+
+def _field_tree(fields: Iterable[str]) -> Dict[str, Any]:
+    """["a.b", "a.c", "d"] -> {"a": {"b": {}, "c": {}}, "d": {}}"""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _project(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, dict):
+        return {key: _project(value[key], subtree) for key, subtree in tree.items() if key in value}
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    return value
+
+
+def project(result: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Keep only the (dotted) fields of a result, and its error if it has one"""
+    projected = _project(result, _field_tree(fields))
+    if "error" in result:
+        projected["error"] = result["error"]
+    return projected
+
+
+def returns_dict(func: Any) -> bool:
+    """Whether a tool is annotated to return a dictionary, the only results shaping applies to"""
+    annotation = inspect.signature(func).return_annotation
+    return annotation is dict or getattr(annotation, "__origin__", None) is dict
+
+
+class ResponseShape:
+    """
+    The shaping rules of one tool and the signature it is exposed with.
+
+    Args:
+        func: Tool function; its signature gains keyword-only `fields` and `compact`
+        echoes: Result fields that only repeat the request, dropped in compact mode
+        joined: Result fields holding lists of lines, joined with newlines in compact mode
+    """
+
+    def __init__(self, func: Any, echoes: Iterable[str] = (), joined: Iterable[str] = ()):
+        self.echoes = frozenset(echoes)
+        self.joined = tuple(joined)
+        signature = inspect.signature(func)
+        # include_* flags are exposed as Optional so that "not set" can be
+        # told apart from an explicit value; unset means the original default
+        self.include_flags = {
+            name: parameter.default for name, parameter in signature.parameters.items()
+            if name.startswith("include_") and parameter.annotation is bool
+        }
+        parameters = [
+            parameter.replace(default=None, annotation=Optional[bool])
+            if parameter.name in self.include_flags else parameter
+            for parameter in signature.parameters.values()
+        ]
+        self.signature = signature.replace(parameters=[
+            *parameters,
+            inspect.Parameter("fields", inspect.Parameter.KEYWORD_ONLY,
+                              default=None, annotation=Optional[List[str]]),
+            inspect.Parameter("compact", inspect.Parameter.KEYWORD_ONLY,
+                              default=False, annotation=bool),
+        ])
+        self.annotations = {
+            **getattr(func, "__annotations__", {}),
+            **{name: Optional[bool] for name in self.include_flags},
+            "fields": Optional[List[str]],
+            "compact": bool
+        }
+
+    def split(self, kwargs: Dict[str, Any]) -> Tuple[Optional[List[str]], bool]:
+        """
+        Remove the shaping parameters from a call's keyword arguments.
+
+        include_* flags the caller did not set get their original default,
+        or False in compact mode.
+
+        Returns:
+            (fields, compact)
+        """
+        fields = kwargs.pop("fields", None)
+        compact = bool(kwargs.pop("compact", False))
+        for flag, default in self.include_flags.items():
+            if kwargs.get(flag) is None:
+                kwargs[flag] = False if compact else default
+        return fields, compact
+
+    def apply(
+        self,
+        result: Any,
+        arguments: Dict[str, Any],
+        fields: Optional[List[str]],
+        compact: bool
+    ) -> Any:
+        """Shape a tool result; non-dictionary results are returned unchanged"""
+        if not isinstance(result, dict) or not (fields or compact):
+            return result
+        if compact:
+            result = {
+                key: value for key, value in result.items()
+                if key not in self.echoes
+                and not (key in arguments and (value is arguments[key] or value == arguments[key]))
+            }
+            for key in self.joined:
+                if isinstance(result.get(key), list):
+                    result[key] = "\n".join(result[key])
+        if fields:
+            result = project(result, fields)
+        return result
@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
 """
 Let's Learn MCP - Main entry point
+
+Usage:
+    letslearnmcp                 # greeting
+    letslearnmcp bench [...]     # benchmark suite (see examples/fastmcp_basic/benchmarks/harness.py)
 """
 
-def main():
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+FASTMCP_BASIC_DIR = Path(__file__).parent / "examples" / "fastmcp_basic"
+
+
+def bench(argv: List[str]) -> int:
+    """Run the FastMCP server benchmark harness"""
+    sys.path.insert(0, str(FASTMCP_BASIC_DIR))
+    from benchmarks import harness
+    return harness.main(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "bench":
+        return bench(argv[1:])
     print("Hello, MCP World!")
     print("Let's learn Model Context Protocol together!")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())